@@ -1,11 +1,136 @@
 from pathlib import Path
-from typing import Union
+from types import SimpleNamespace
+from typing import Tuple, Union
+
+import numpy as np
 
 from pypulseq.Sequence.sequence import Sequence
 
+# Simple global SAR models. The coil efficiency (B1 per square root of forward power, in T/sqrt(W)) and the fraction of
+# the forward power absorbed by the patient are rough typical values and should be replaced by calibrated values for a
+# specific system. The exposed mass is given as a fraction of the patient weight. Limits are the IEC 60601-2-33 normal
+# operating mode limits for the 6 minute average (W/kg); any 10 second average may not exceed twice this limit.
+SAR_MODELS = {
+    'body': {'coil_efficiency': 0.11e-6, 'absorbed_fraction': 0.7, 'mass_fraction': 1.0, 'limit': 2.0},
+    'head': {'coil_efficiency': 0.35e-6, 'absorbed_fraction': 0.5, 'mass_fraction': 0.07, 'limit': 3.2},
+}
+
+
+def _window_average(t_end: np.ndarray, cumulative: np.ndarray, window: float) -> Tuple[np.ndarray, float]:
+    """
+    Average power over the sliding window of length `window` ending at each block end time, where `cumulative` is the
+    cumulative energy at the block end times, and the maximum over all window positions. Energy is assumed to be
+    deposited uniformly within each block, and no energy is deposited before the start of the sequence.
+    """
+    if len(t_end) == 0:
+        return np.zeros(0), 0.0
+
+    t = np.concatenate(([0], t_end))
+    c = np.concatenate(([0], cumulative))
+    average = (cumulative - np.interp(t_end - window, t, c, left=0)) / window
+
+    # The window energy is piecewise linear in the window position, so its maximum is attained at a window that ends
+    # or starts at a block boundary
+    average_start = (np.interp(t[:-1] + window, t, c) - c[:-1]) / window
+    return average, float(max(np.max(average), np.max(average_start)))
+
+
+def calc_SAR(
+    file: Union[str, Path, Sequence],
+    model: str = 'body',
+    patient_weight: float = 70.0,
+    coil_efficiency: Union[float, None] = None,
+    absorbed_fraction: Union[float, None] = None,
+    exposed_mass: Union[float, None] = None,
+) -> SimpleNamespace:
+    """
+    Estimate the RF power deposition (SAR) of a sequence using a simple global body or head model.
+
+    The energy of every RF library entry is taken from `Sequence.rf_stats()` (computed once per unique RF shape) and
+    mapped onto the blocks. The forward power is derived from the B1 amplitude via the coil efficiency
+    (B1 = efficiency * sqrt(P)), a fraction of it is absorbed by the exposed mass. Sliding 10 second and 6 minute
+    averages are evaluated at the block end times from the cumulative energy.
+
+    Parameters
+    ----------
+    file : str, Path or Sequence
+        Sequence object or path to a .seq file.
+    model : str, default='body'
+        SAR model, 'body' (global body SAR) or 'head' (head SAR).
+    patient_weight : float, default=70.0
+        Patient weight in kg.
+    coil_efficiency : float, optional
+        B1 per square root of the forward power in T/sqrt(W). Default depends on `model`.
+    absorbed_fraction : float, optional
+        Fraction of the forward power absorbed in the exposed mass. Default depends on `model`.
+    exposed_mass : float, optional
+        Exposed mass in kg. Defaults to the patient weight ('body') or to 7% of the patient weight ('head').
+
+    Returns
+    -------
+    sar : SimpleNamespace
+        With the fields
+            - t : block end times (s)
+            - energy : energy absorbed per block (J)
+            - sar_10s, sar_6min : sliding window SAR (W/kg) for the windows ending at `t`
+            - max_sar_10s, max_sar_6min : maximum sliding window SAR (W/kg)
+            - b1rms : B1 root mean square over the whole sequence (T)
+            - limit : 6 minute SAR limit of the model (W/kg), the 10 second limit is twice this value
+            - ok : True if both sliding window averages are within the limits
+
+    Raises
+    ------
+    ValueError
+        If `model` is not a supported SAR model.
+    """
+    if model not in SAR_MODELS:
+        raise ValueError(f'Invalid SAR model: {model}. Must be one of {list(SAR_MODELS)}.')
+    params = SAR_MODELS[model]
+    if coil_efficiency is None:
+        coil_efficiency = params['coil_efficiency']
+    if absorbed_fraction is None:
+        absorbed_fraction = params['absorbed_fraction']
+    if exposed_mass is None:
+        exposed_mass = params['mass_fraction'] * patient_weight
+
+    if isinstance(file, Sequence):
+        seq = file
+    else:
+        seq = Sequence()
+        seq.read(str(file))
+
+    block_ids = list(seq.block_events)
+    block_durations = np.array([seq.block_durations[b] for b in block_ids], dtype=float)
+    rf_ids = np.array([seq.block_events[b][1] for b in block_ids], dtype=np.int64)
+    t_end = np.cumsum(block_durations)
+
+    # Integral of |B1|^2 (in T^2*s) per block from the cached per RF library entry energies
+    stats = seq.rf_stats()
+    rf_energy = np.zeros(max(stats.id.max(initial=0), rf_ids.max(initial=0)) + 1)
+    rf_energy[stats.id] = stats.energy / seq.system.gamma**2
+    b1_sq_int = rf_energy[rf_ids]
+
+    energy = b1_sq_int * absorbed_fraction / coil_efficiency**2
+    cumulative = np.cumsum(energy)
+
+    power_10s, max_power_10s = _window_average(t_end, cumulative, 10.0)
+    power_6min, max_power_6min = _window_average(t_end, cumulative, 360.0)
+    sar_10s = power_10s / exposed_mass
+    sar_6min = power_6min / exposed_mass
+    max_sar_10s = max_power_10s / exposed_mass
+    max_sar_6min = max_power_6min / exposed_mass
+
+    total_duration = t_end[-1] if len(t_end) > 0 else 0.0
+    b1rms = float(np.sqrt(np.sum(b1_sq_int) / total_duration)) if total_duration > 0 else 0.0
 
-def calc_SAR(file: Union[str, Path, Sequence]) -> None:  # noqa: ARG001
-    """Temporary placeholder for DeprecationError."""
-    raise RuntimeError(
-        'Built-in SAR computation has been removed; use PySar4seq (https://github.com/imr-framework/sar4seq/tree/PySar4seq) instead.'
+    return SimpleNamespace(
+        t=t_end,
+        energy=energy,
+        sar_10s=sar_10s,
+        sar_6min=sar_6min,
+        max_sar_10s=max_sar_10s,
+        max_sar_6min=max_sar_6min,
+        b1rms=b1rms,
+        limit=params['limit'],
+        ok=max_sar_10s <= 2 * params['limit'] and max_sar_6min <= params['limit'],
     )
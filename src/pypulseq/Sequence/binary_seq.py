@@ -0,0 +1,353 @@
+import hashlib
+import json
+import zipfile
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from pypulseq import __version__
+from pypulseq.event_lib import EventLibrary
+
+BINARY_FORMAT_VERSION = 1
+
+LIBRARY_NAMES = (
+    'adc',
+    'delay',
+    'extensions',
+    'grad',
+    'label_inc',
+    'label_set',
+    'rf',
+    'shape',
+    'trigger',
+    'soft_delay',
+    'rotation',
+)
+
+# Element types of the event data tuples, indexed by the `kinds` arrays of the binary format
+_ELEMENT_TYPES = (np.float64, float, int, np.int64, str, bool)
+_CONTAINER_TYPES = (tuple, list)
+
+
+def write_binary(self, file_name: Union[str, Path]) -> None:
+    """
+    Write the sequence to a lossless binary `.seqb` file.
+
+    The file is an uncompressed NumPy `.npz` container holding the block table, every event library and the shape
+    library as typed arrays, plus a JSON header with definitions, signature, extension and soft delay maps. Unlike the
+    text `.seq` format, no values are rounded, so `read_binary()` restores an identical sequence.
+
+    See also `pypulseq.Sequence.binary_seq.read_binary()`.
+
+    Parameters
+    ----------
+    file_name : str or Path
+        File name of `.seqb` file to be written to disk.
+    """
+    file_name = Path(file_name)
+    if file_name.suffix != '.seqb':
+        file_name = file_name.with_suffix(file_name.suffix + '.seqb')
+
+    meta = {
+        'format_version': BINARY_FORMAT_VERSION,
+        'pypulseq_version': __version__,
+        'definitions': {k: _encode_value(v) for k, v in self.definitions.items()},
+        'signature': [self.signature_type, self.signature_file, self.signature_value],
+        'extension_string_idx': list(self.extension_string_idx),
+        'extension_numeric_idx': [int(x) for x in self.extension_numeric_idx],
+        'soft_delay_hints': {k: int(v) for k, v in self.soft_delay_hints.items()},
+        'rf_id_to_name_map': [[int(k), v] for k, v in self.rf_id_to_name_map.items()],
+        'adc_id_to_name_map': [[int(k), v] for k, v in self.adc_id_to_name_map.items()],
+        'grad_id_to_name_map': [[int(k), v] for k, v in self.grad_id_to_name_map.items()],
+        'next_free_ID': {name: int(getattr(self, name + '_library').next_free_ID) for name in LIBRARY_NAMES},
+    }
+
+    arrays = {
+        'blocks': _block_table(self),
+        'block_durations': np.array([self.block_durations[k] for k in self.block_events], dtype=np.float64),
+    }
+
+    # Empty libraries are not stored to keep the number of archive members, and thus the load time, small
+    meta['libraries'] = {}
+    for name in LIBRARY_NAMES:
+        library = getattr(self, name + '_library')
+        if not library.data:
+            continue
+        library_arrays, meta['libraries'][name] = _encode_library(library)
+        for key, value in library_arrays.items():
+            arrays[f'{name}.{key}'] = value
+
+    arrays['meta'] = np.array(json.dumps(meta))
+
+    with open(file_name, 'wb') as output_file:
+        np.savez(output_file, **arrays)
+
+
+def structural_hash(self) -> str:
+    """
+    Compute a hash of the block table, the event and shape libraries and the definitions of the sequence.
+
+    The hash is computed from the same typed arrays as the binary `.seqb` format, which is much cheaper than
+    generating the text of the `.seq` file. As no values are rounded and no duplicates are removed, it changes with
+    any change of the sequence in memory, including changes below the precision of the text format. It is meant for
+    change detection, e.g. as a cache key, and differs from the MD5 signature of the file.
+
+    Returns
+    -------
+    hash : str
+        SHA-256 hash as hexadecimal string.
+    """
+    structure_hash = hashlib.sha256()
+
+    def update(name: str, data: Union[np.ndarray, dict, list]) -> None:
+        # Prefix each part with its name and length, so that parts cannot shift into each other
+        data = data.tobytes() if isinstance(data, np.ndarray) else json.dumps(data, sort_keys=True).encode()
+        structure_hash.update(f'{name}:{len(data)}:'.encode())
+        structure_hash.update(data)
+
+    update('definitions', {k: _encode_value(v) for k, v in self.definitions.items()})
+    update('extensions', [list(self.extension_string_idx), [int(x) for x in self.extension_numeric_idx]])
+    update('blocks', _block_table(self))
+    update('block_durations', np.array([self.block_durations[k] for k in self.block_events], dtype=np.float64))
+    for name in LIBRARY_NAMES:
+        library = getattr(self, name + '_library')
+        if not library.data:
+            continue
+        library_arrays, header = _encode_library(library)
+        update(name, header)
+        for key, value in sorted(library_arrays.items()):
+            update(f'{name}.{key}', value)
+
+    return structure_hash.hexdigest()
+
+
+def read_binary(self, file_name: Union[str, Path], mmap: bool = False) -> None:
+    """
+    Load a sequence from a binary `.seqb` file written by `write_binary()`.
+
+    See also `pypulseq.Sequence.binary_seq.write_binary()`.
+
+    Parameters
+    ----------
+    file_name : str or Path
+        Path of `.seqb` file to be read.
+    mmap : bool, default=False
+        Memory-map the stored arrays read-only instead of loading them into memory. Shape data are then views into
+        the file and are only paged in when accessed, or when the shape library is first searched, e.g. by
+        `add_block()`.
+
+    Raises
+    ------
+    RuntimeError
+        If the file was written with an unsupported binary format version.
+    """
+    arrays = _load_arrays(Path(file_name), mmap)
+
+    meta = json.loads(str(arrays['meta']))
+    if meta['format_version'] != BINARY_FORMAT_VERSION:
+        raise RuntimeError(
+            f'Unsupported binary sequence format version {meta["format_version"]}, only version '
+            f'{BINARY_FORMAT_VERSION} is supported.'
+        )
+
+    for name in LIBRARY_NAMES:
+        library = _decode_library(
+            {key.split('.', 1)[1]: value for key, value in arrays.items() if key.split('.', 1)[0] == name},
+            meta['libraries'].get(name),
+            numpy_data=name == 'shape',
+        )
+        library.next_free_ID = meta['next_free_ID'][name]
+        setattr(self, name + '_library', library)
+
+    # The block table is copied, as blocks are modified in place, e.g. by `remove_duplicates(in_place=True)`
+    blocks = np.array(arrays['blocks'])
+    block_ids = blocks[:, 0].tolist()
+    self.block_events = dict(zip(block_ids, blocks[:, 1:]))
+    self.block_durations = dict(zip(block_ids, np.array(arrays['block_durations'])))
+    self.next_free_block_ID = (max(self.block_events) + 1) if self.block_events else 1
+    self.block_trace = {}
+    self.block_cache = {}
+    self.rf_stats_cache = {}
+
+    self.definitions = {k: _decode_value(v) for k, v in meta['definitions'].items()}
+    self.grad_raster_time = self.definitions.get('GradientRasterTime', self.system.grad_raster_time)
+    self.rf_raster_time = self.definitions.get('RadiofrequencyRasterTime', self.system.rf_raster_time)
+    self.adc_raster_time = self.definitions.get('AdcRasterTime', self.system.adc_raster_time)
+    self.block_duration_raster = self.definitions.get('BlockDurationRaster', self.system.block_duration_raster)
+
+    self.signature_type, self.signature_file, self.signature_value = meta['signature']
+    self.extension_string_idx = meta['extension_string_idx']
+    self.extension_numeric_idx = meta['extension_numeric_idx']
+    self.soft_delay_hints = meta['soft_delay_hints']
+    self.rf_id_to_name_map = dict(meta['rf_id_to_name_map'])
+    self.adc_id_to_name_map = dict(meta['adc_id_to_name_map'])
+    self.grad_id_to_name_map = dict(meta['grad_id_to_name_map'])
+
+
+def convert_sequence_file(source: Union[str, Path], target: Union[str, Path], **kwargs) -> None:
+    """
+    Convert a sequence file between the text `.seq` and the binary `.seqb` format. The direction is determined by the
+    suffix of `source`.
+
+    Parameters
+    ----------
+    source : str or Path
+        Path of the `.seq` or `.seqb` file to be converted.
+    target : str or Path
+        Path of the converted file.
+    kwargs : dict
+        Passed on to `Sequence.read()` when converting from `.seq`, or to `Sequence.write()` when converting to `.seq`.
+
+    Raises
+    ------
+    ValueError
+        If `source` is neither a `.seq` nor a `.seqb` file.
+    """
+    from pypulseq.Sequence.sequence import Sequence
+
+    source = Path(source)
+    seq = Sequence()
+    if source.suffix == '.seq':
+        seq.read(source, **kwargs)
+        seq.write_binary(target)
+    elif source.suffix == '.seqb':
+        seq.read_binary(source)
+        seq.write(target, **kwargs)
+    else:
+        raise ValueError(f'Cannot convert {source}: expected a .seq or .seqb file.')
+
+
+def _block_table(self) -> np.ndarray:
+    """Returns the block table, with one row per block holding the block ID followed by the 7 event IDs."""
+    blocks = np.zeros((len(self.block_events), 8), dtype=np.int64)
+    blocks[:, 0] = list(self.block_events)
+    if self.block_events:
+        blocks[:, 1:] = list(self.block_events.values())
+    return blocks
+
+
+def _encode_library(library: EventLibrary) -> Tuple[Dict[str, np.ndarray], dict]:
+    keys = list(library.data)
+    entries = [library.data[k] for k in keys]
+    header = {'types': [library.type.get(k, '') for k in keys]}
+
+    # One row per event: key, number of elements and container type
+    index = np.zeros((len(keys), 3), dtype=np.int64)
+    index[:, 0] = keys
+    index[:, 1] = [len(d) for d in entries]
+
+    if library.numpy_data:
+        return {'index': index, 'values': np.concatenate(entries).astype(np.float64)}, header
+
+    index[:, 2] = [_CONTAINER_TYPES.index(type(d)) for d in entries]
+    flat = [x for d in entries for x in d]
+    # Strings are stored in the header and referenced by their position in `values`
+    header['strings'] = [x for x in flat if isinstance(x, str)]
+    string_index = iter(range(len(header['strings'])))
+    arrays = {
+        'index': index,
+        'kinds': np.array([_element_kind(x) for x in flat], dtype=np.int8),
+        'values': np.array([next(string_index) if isinstance(x, str) else x for x in flat], dtype=np.float64),
+    }
+    return arrays, header
+
+
+def _decode_library(arrays: Dict[str, np.ndarray], header: dict, numpy_data: bool) -> EventLibrary:
+    library = EventLibrary(numpy_data=numpy_data)
+    if not arrays:
+        return library
+
+    index = np.asarray(arrays['index'])
+    keys = index[:, 0].tolist()
+    types = header['types']
+    offsets = np.concatenate(([0], np.cumsum(index[:, 1]))).tolist()
+    values = arrays['values']
+
+    if numpy_data:
+        # Shapes are slices of `values` and are only read when accessed, so memory-mapped data stays on disk until
+        # the keymap is needed
+        for i, key in enumerate(keys):
+            data = values[offsets[i] : offsets[i + 1]]
+            data.flags.writeable = False
+            library.insert_deferred(key, data, types[i])
+        return library
+
+    strings = header['strings']
+    constructors = [(lambda v: strings[int(v)]) if t is str else t for t in _ELEMENT_TYPES]
+    flat = [constructors[k](v) for k, v in zip(arrays['kinds'].tolist(), values.tolist())]
+    containers = index[:, 2].tolist()
+    for i, key in enumerate(keys):
+        data = _CONTAINER_TYPES[containers[i]](flat[offsets[i] : offsets[i + 1]])
+        library.insert(key, data, types[i])
+    return library
+
+
+def _element_kind(x) -> int:
+    for i, t in enumerate(_ELEMENT_TYPES):
+        if type(x) is t:
+            return i
+    # Other numeric scalars (e.g. float32) are stored as float64
+    return 0
+
+
+def _encode_value(value):
+    if isinstance(value, np.ndarray):
+        return {'ndarray': value.tolist(), 'dtype': value.dtype.str}
+    if isinstance(value, np.generic):
+        return {'scalar': value.item(), 'dtype': value.dtype.str}
+    if isinstance(value, tuple):
+        return {'tuple': [_encode_value(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode_value(v) for v in value]
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'ndarray' in value:
+            return np.array(value['ndarray'], dtype=value['dtype'])
+        if 'scalar' in value:
+            return np.dtype(value['dtype']).type(value['scalar'])
+        return tuple(_decode_value(v) for v in value['tuple'])
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    return value
+
+
+def _load_arrays(file_name: Path, mmap: bool) -> Dict[str, np.ndarray]:
+    if not mmap:
+        with np.load(file_name, allow_pickle=False) as npz:
+            return {key: npz[key] for key in npz.files}
+
+    # `np.load(mmap_mode=...)` ignores memory mapping for `.npz` archives. The archive is stored uncompressed, so
+    # each member can be mapped directly at its offset in the file.
+    arrays = {}
+    with zipfile.ZipFile(file_name) as archive, open(file_name, 'rb') as f:
+        for info in archive.infolist():
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_length = int.from_bytes(local_header[26:28], 'little')
+            extra_length = int.from_bytes(local_header[28:30], 'little')
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            key = info.filename[: -len('.npy')]
+            if dtype.hasobject or info.compress_type != zipfile.ZIP_STORED or 0 in shape or shape == ():
+                # Small or empty arrays are read directly
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+                arrays[key] = np.lib.format.read_array(f, allow_pickle=False)
+            else:
+                arrays[key] = np.memmap(
+                    file_name,
+                    dtype=dtype,
+                    mode='r',
+                    offset=f.tell(),
+                    shape=shape,
+                    order='F' if fortran_order else 'C',
+                )
+    return arrays
@@ -9,6 +9,8 @@
 from pypulseq.compress_shape import compress_shape
 from pypulseq.decompress_shape import decompress_shape
 from pypulseq.event_lib import EventLibrary
+from pypulseq.make_rotation import quaternion_to_matrix
+from pypulseq.Sequence.rf_stats import get_rf_stats
 from pypulseq.supported_labels_rf_use import get_supported_labels
 from pypulseq.utils.tracing import trace_enabled
 
@@ -44,6 +46,7 @@ def set_block(self, block_index: int, *args: Union[SimpleNamespace, float]) -> N
         If multiple soft_delay extensions are used in a block.
         If a soft delay extension is used in a block of zero duration.
         If a soft delay extension is used in a block containing conventional events.
+        If gradients in a block with a rotation extension do not start and end at zero.
     """
     events = block_to_events(*args)
     new_block = np.zeros(7, dtype=np.int32)
@@ -55,6 +58,7 @@ def set_block(self, block_index: int, *args: Union[SimpleNamespace, float]) -> N
         2: SimpleNamespace(idx=4, start=(0, 0), stop=(0, 0)),
     }  # Key-value mapping of index and  pairs of gradients/times
     extensions = []
+    rotation_event = None
 
     for event in events:
         if not isinstance(event, float):  # If event is not a block duration
@@ -154,6 +158,18 @@ def set_block(self, block_index: int, *args: Union[SimpleNamespace, float]) -> N
                     'ref': label_id,
                 }
                 extensions.append(ext)
+            elif event.type == 'rot3D':
+                if rotation_event is not None:
+                    raise ValueError('Multiple rotation events were specified in set_block')
+
+                if hasattr(event, 'id'):
+                    rotation_id = event.id
+                else:
+                    rotation_id = register_rotation_event(self, event)
+
+                rotation_event = event
+                ext = {'type': self.get_extension_type_ID('ROTATIONS'), 'ref': rotation_id}
+                extensions.append(ext)
             elif event.type == 'soft_delay':
                 if hasattr(event, 'id'):
                     event_id = event.id
@@ -219,6 +235,13 @@ def set_block(self, block_index: int, *args: Union[SimpleNamespace, float]) -> N
     # =========
     # PERFORM GRADIENT CHECKS
     # =========
+    if rotation_event is not None:
+        # The checks below compare the stored (unrotated) gradients of neighboring blocks, which is only valid if the
+        # rotated gradients start and end at zero
+        max_step = self.system.max_slew * self.system.grad_raster_time
+        if any(abs(g.start[1]) > max_step or abs(g.stop[1]) > max_step for g in check_g.values()):
+            raise RuntimeError('Gradients in blocks with a rotation extension have to start and end at zero.')
+
     for grad_to_check in check_g.values():
         if abs(grad_to_check.start[1]) > self.system.max_slew * self.system.grad_raster_time:  # noqa: SIM102
             if grad_to_check.start[0] > eps:
@@ -372,7 +395,7 @@ def get_block(self, block_index: int) -> SimpleNamespace:
         return self.block_cache[block_index]
 
     block = SimpleNamespace()
-    attrs = ['block_duration', 'rf', 'gx', 'gy', 'gz', 'adc', 'label', 'soft_delay']
+    attrs = ['block_duration', 'rf', 'gx', 'gy', 'gz', 'adc', 'label', 'soft_delay', 'rotation']
     values = [None] * len(attrs)
     for att, val in zip(attrs, values, strict=False):
         setattr(block, att, val)
@@ -547,6 +570,11 @@ def get_block(self, block_index: int) -> SimpleNamespace:
                     default_duration=self.block_durations[block_index],
                 )
 
+            elif ext_type == 'ROTATIONS':
+                quaternion = np.array(self.rotation_library.data[ext_data[1]])
+                block.rotation = SimpleNamespace(
+                    type='rot3D', rot_quaternion=quaternion, rot_matrix=quaternion_to_matrix(quaternion)
+                )
             else:
                 raise RuntimeError(f'Unknown extension ID {ext_data[0]}')
 
@@ -657,6 +685,48 @@ def register_control_event(self, event: SimpleNamespace) -> int:
     return control_id
 
 
+def register_grad_shapes(self, shape: np.ndarray, tt: np.ndarray) -> Tuple[List[int], bool]:
+    """
+    Register the normalized waveform and the timing of an arbitrary gradient in the shape library.
+
+    Parameters
+    ----------
+    shape : numpy.ndarray
+        Normalized gradient waveform.
+    tt : numpy.ndarray
+        Time points of the waveform samples, relative to the gradient delay.
+
+    Returns
+    -------
+    [int, int]
+        Waveform shape ID and time shape ID (0 for the regular gradient raster, -1 for the half raster).
+    bool
+        If all shapes were found in the shape library.
+    """
+    shape_IDs = [0, 0]
+
+    # Shape for waveform
+    c_shape = compress_shape(shape)
+    s_data = np.concatenate(([c_shape.num_samples], c_shape.data))
+    shape_IDs[0], all_found = self.shape_library.find_or_insert(s_data)
+
+    # Shape for timing
+    c_time = compress_shape(tt / self.grad_raster_time)
+    t_data = np.concatenate(([c_time.num_samples], c_time.data))
+
+    if len(c_time.data) == 4 and np.allclose(c_time.data, [0.5, 1, 1, c_time.num_samples - 3]):
+        # Standard raster → leave shape_IDs[1] as 0
+        pass
+    elif len(c_time.data) == 3 and np.allclose(c_time.data, [0.5, 0.5, c_time.num_samples - 2]):
+        # Half-raster → set to -1 as special flag
+        shape_IDs[1] = -1
+    else:
+        shape_IDs[1], found = self.shape_library.find_or_insert(t_data)
+        all_found = all_found and found
+
+    return shape_IDs, all_found
+
+
 def register_grad_event(self, event: SimpleNamespace) -> Union[int, Tuple[int, List[int]]]:
     """
     Parameters
@@ -684,31 +754,11 @@ def register_grad_event(self, event: SimpleNamespace) -> Union[int, Tuple[int, L
         if hasattr(event, 'shape_IDs'):
             shape_IDs = event.shape_IDs
         else:
-            shape_IDs = [0, 0]
-
-            # Shape for waveform
             g = event.waveform / amplitude if amplitude != 0 else event.waveform
-            c_shape = compress_shape(g)
-            s_data = np.concatenate(([c_shape.num_samples], c_shape.data))
-            shape_IDs[0], found = self.shape_library.find_or_insert(s_data)
+            shape_IDs, found = register_grad_shapes(self, g, event.tt)
             may_exist = may_exist and found
             any_changed = any_changed or found
 
-            # Shape for timing
-            c_time = compress_shape(event.tt / self.grad_raster_time)
-            t_data = np.concatenate(([c_time.num_samples], c_time.data))
-
-            if len(c_time.data) == 4 and np.allclose(c_time.data, [0.5, 1, 1, c_time.num_samples - 3]):
-                # Standard raster → leave shape_IDs[1] as 0
-                pass
-            elif len(c_time.data) == 3 and np.allclose(c_time.data, [0.5, 0.5, c_time.num_samples - 2]):
-                # Half-raster → set to -1 as special flag
-                shape_IDs[1] = -1
-            else:
-                shape_IDs[1], found = self.shape_library.find_or_insert(t_data)
-                may_exist = may_exist and found
-                any_changed = any_changed or found
-
         # Updated data layout to match MATLAB v1.5.0 ordering
         data = (amplitude, event.first, event.last, *shape_IDs, event.delay)
 
@@ -772,6 +822,27 @@ def register_label_event(self, event: SimpleNamespace) -> int:
     return label_id
 
 
+def register_rotation_event(self, event: SimpleNamespace) -> int:
+    """
+    Parameters
+    ----------
+    event : SimpleNamespace
+        Rotation event to be registered.
+
+    Returns
+    -------
+    int
+        ID of registered rotation event.
+    """
+    data = tuple(float(q) for q in event.rot_quaternion)
+    rotation_id, found = self.rotation_library.find_or_insert(new_data=data)
+
+    # Clear block cache because rotation was overwritten
+    if self.use_block_cache and found:
+        self.block_cache.clear()
+    return rotation_id
+
+
 def register_soft_delay_event(self, event: SimpleNamespace) -> int:
     """
     Parameters
@@ -817,53 +888,74 @@ def register_soft_delay_event(self, event: SimpleNamespace) -> int:
     return soft_delay_id
 
 
-def register_rf_event(self, event: SimpleNamespace) -> Tuple[int, List[int]]:
+def register_rf_shapes(self, signal: np.ndarray, t: np.ndarray) -> Tuple[List[int], bool]:
     """
+    Register the magnitude, phase and time shapes of an RF waveform in the shape library.
+
     Parameters
     ----------
-    event : SimpleNamespace
-        RF event to be registered.
+    signal : numpy.ndarray
+        Complex RF waveform.
+    t : numpy.ndarray
+        Time points of the waveform samples.
 
     Returns
     -------
-    int, [int, ...]
-        ID of registered RF event, list of shape IDs
+    [int, int, int]
+        Magnitude, phase and time shape IDs (time shape ID is 0 for the regular RF raster).
+    bool
+        If all shapes were found in the shape library.
     """
-    mag = np.abs(event.signal)
-    amplitude = np.max(mag)
-    mag /= amplitude
+    mag = np.abs(signal)
+    mag /= np.max(mag)
     # Following line of code is a workaround for numpy's divide functions returning NaN when mathematical
     # edge cases are encountered (eg. divide by 0)
     mag[np.isnan(mag)] = 0
-    phase = np.angle(event.signal)
+    phase = np.angle(signal)
     phase[phase < 0] += 2 * np.pi
     phase /= 2 * np.pi
-    may_exist = True
 
-    if hasattr(event, 'shape_IDs'):
-        shape_IDs = event.shape_IDs
-    else:
-        shape_IDs = [0, 0, 0]
+    shape_IDs = [0, 0, 0]
 
-        mag_shape = compress_shape(mag)
-        data = np.concatenate(([mag_shape.num_samples], mag_shape.data))
-        shape_IDs[0], found = self.shape_library.find_or_insert(data)
-        may_exist = may_exist & found
+    mag_shape = compress_shape(mag)
+    data = np.concatenate(([mag_shape.num_samples], mag_shape.data))
+    shape_IDs[0], all_found = self.shape_library.find_or_insert(data)
 
-        phase_shape = compress_shape(phase)
-        data = np.concatenate(([phase_shape.num_samples], phase_shape.data))
-        shape_IDs[1], found = self.shape_library.find_or_insert(data)
-        may_exist = may_exist & found
+    phase_shape = compress_shape(phase)
+    data = np.concatenate(([phase_shape.num_samples], phase_shape.data))
+    shape_IDs[1], found = self.shape_library.find_or_insert(data)
+    all_found = all_found and found
 
-        t_regular = (np.floor(event.t / self.rf_raster_time) == np.arange(len(event.t))).all()
+    t_regular = (np.floor(t / self.rf_raster_time) == np.arange(len(t))).all()
 
-        if t_regular:
-            shape_IDs[2] = 0
-        else:
-            time_shape = compress_shape(event.t / self.rf_raster_time)
-            data = [time_shape.num_samples, *time_shape.data]
-            shape_IDs[2], found = self.shape_library.find_or_insert(data)
-            may_exist = may_exist & found
+    if not t_regular:
+        time_shape = compress_shape(t / self.rf_raster_time)
+        data = [time_shape.num_samples, *time_shape.data]
+        shape_IDs[2], found = self.shape_library.find_or_insert(data)
+        all_found = all_found and found
+
+    return shape_IDs, all_found
+
+
+def register_rf_event(self, event: SimpleNamespace) -> Tuple[int, List[int]]:
+    """
+    Parameters
+    ----------
+    event : SimpleNamespace
+        RF event to be registered.
+
+    Returns
+    -------
+    int, [int, ...]
+        ID of registered RF event, list of shape IDs
+    """
+    amplitude = np.max(np.abs(event.signal))
+    may_exist = True
+
+    if hasattr(event, 'shape_IDs'):
+        shape_IDs = event.shape_IDs
+    else:
+        shape_IDs, may_exist = register_rf_shapes(self, event.signal, event.t)
 
     use = 'u'  # Undefined
     if hasattr(event, 'use'):
@@ -904,4 +996,7 @@ def register_rf_event(self, event: SimpleNamespace) -> Tuple[int, List[int]]:
     if hasattr(event, 'name'):
         self.rf_id_to_name_map[rf_id] = event.name
 
+    # Precompute the derived RF quantities of new shapes
+    get_rf_stats(self, rf_id)
+
     return rf_id, shape_IDs
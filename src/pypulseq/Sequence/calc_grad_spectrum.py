@@ -1,9 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from typing import List, Tuple, Union
 
 import numpy as np
-from matplotlib import pyplot as plt
 from scipy.signal import spectrogram
 
+from pypulseq import eps
+from pypulseq.Sequence.sharding import map_shards, split_range
+from pypulseq.Sequence.timeline import block_grad_points, iter_blocks
+
+
+def _window_spectrogram(x: np.ndarray, dt: float, nwin: int, nfft: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Magnitude spectrogram of `x` with 50% overlapping Hann windows of `nwin` samples."""
+    freq, _, sxx = spectrogram(
+        x,
+        fs=1 / dt,
+        mode='magnitude',
+        nperseg=nwin,
+        noverlap=nwin // 2,
+        nfft=nfft,
+        detrend='constant',
+        window=('tukey', 1),
+    )
+    return freq, sxx
+
+
+def _spectrogram_shard(shared: tuple, start: int, stop: int) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Spectrograms of the windows within the samples `start` to `stop` of all gradient channels."""
+    gw, dt, nwin, nfft, max_frequency = shared
+    spectra = []
+    for g in gw:
+        freq, sxx = _window_spectrogram(g[start:stop], dt, nwin, nfft)
+        mask = freq < max_frequency
+        spectra.append(sxx[mask])
+    return freq[mask], spectra
+
+
+def _streaming_spectrum(
+    obj,
+    nwin: int,
+    nfft: int,
+    max_frequency: float,
+    time_range: Union[List[float], None],
+    combine_mode: str,
+    use_derivative: bool,
+    num_threads: Union[int, None],
+    chunk_windows: int,
+) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Streaming implementation of `calculate_gradient_spectrum()` for combine modes 'max', 'mean' and 'rss'.
+
+    The gradient corner points are collected block by block, and as soon as the gradients of `chunk_windows` windows
+    are complete, the samples of these windows are generated, transformed and reduced into running per-frequency
+    accumulators. Only the corner points that are still needed by the next windows are kept, so memory use does not
+    grow with the sequence duration.
+    """
+    grad_channels = ['gx', 'gy', 'gz']
+    ng = len(grad_channels)
+    dt = obj.system.grad_raster_time
+    step = nwin - nwin // 2
+    n_extra = 1 if use_derivative else 0  # Additional gradient sample needed per window for the derivative
+    t0 = 0 if time_range is None else max(time_range[0], 0)
+
+    pieces = [[] for _ in range(ng)]  # Corner points per channel that may still be needed
+    last_time = [None] * ng  # Time of the last corner point per channel
+    max_time = None  # Latest corner point time of all channels
+
+    acc = SimpleNamespace(num_windows=0, frequencies=None, mask=None, channels=[None] * ng, rss=None)
+
+    def reduce(current, sxx):
+        if combine_mode == 'max':
+            value = sxx.max(axis=1)
+            return value if current is None else np.maximum(current, value)
+        value = sxx.sum(axis=1) if combine_mode == 'mean' else (sxx**2).sum(axis=1)
+        return value if current is None else current + value
+
+    def channel_samples(j, t):
+        if len(pieces[j]) == 0:
+            return np.zeros(len(t))
+        points = np.concatenate(pieces[j], axis=1)
+        return np.interp(t, points[0], points[1], left=0, right=0)
+
+    def process(k0, k1, pool):
+        # Sample all channels for windows k0..k1-1 and accumulate their spectra
+        t = t0 + (np.arange(k0 * step, (k1 - 1) * step + nwin + n_extra) + 0.5) * dt
+
+        def channel_spectrum(j):
+            g = channel_samples(j, t)
+            if use_derivative:
+                g = np.diff(g)
+            return _window_spectrogram(g, dt, nwin, nfft)
+
+        results = list(pool.map(channel_spectrum, range(ng))) if pool is not None else map(channel_spectrum, range(ng))
+        sxx_sq_sum = 0
+        for j, (freq, sxx) in enumerate(results):
+            if acc.mask is None:
+                acc.mask = freq < max_frequency
+                acc.frequencies = freq[acc.mask]
+            sxx = sxx[acc.mask]
+            sxx_sq_sum += sxx**2
+            acc.channels[j] = reduce(acc.channels[j], sxx)
+        acc.rss = reduce(acc.rss, np.sqrt(sxx_sq_sum))
+        acc.num_windows += k1 - k0
+
+        # Drop corner points that are not needed by the following windows, keeping the last point before them
+        t_next = t0 + (k1 * step + 0.5) * dt
+        for j in range(ng):
+            if len(pieces[j]) > 0:
+                points = np.concatenate(pieces[j], axis=1)
+                i_keep = max(np.searchsorted(points[0], t_next) - 1, 0)
+                pieces[j] = [points[:, i_keep:]]
+
+    def complete_windows(t_safe):
+        # Number of windows whose samples all lie before t_safe
+        n_samples = int(np.floor((t_safe - t0) / dt - 0.5))
+        return max((n_samples - nwin - n_extra) // step + 1, 0)
+
+    pool = ThreadPoolExecutor(max_workers=num_threads) if num_threads is not None and num_threads > 1 else None
+    try:
+        for _, block_start, block in iter_blocks(obj, time_range):
+            # All following gradient points lie at or after the start of this block
+            if max_time is not None:
+                k_safe = complete_windows(min(block_start, max_time))
+                if k_safe - acc.num_windows >= chunk_windows:
+                    process(acc.num_windows, k_safe, pool)
+
+            for j, piece in enumerate(block_grad_points(block, obj.grad_raster_time, block_start)):
+                if piece is None:
+                    continue
+                # If the first point of the piece has the same time as the last point of the previous piece, drop it
+                if last_time[j] is not None and last_time[j] + eps >= piece[0, 0]:
+                    piece = piece[:, 1:]
+                if piece.shape[1] > 0:
+                    pieces[j].append(piece)
+                    last_time[j] = piece[0, -1]
+                    max_time = piece[0, -1] if max_time is None else max(max_time, piece[0, -1])
+
+        if max_time is None:
+            raise ValueError('Sequence does not contain any gradients in the given time range')
+
+        # Process the remaining windows; the sample count matches the one of `get_gradients()`
+        max_t = max_time + 2e-12
+        if time_range is None:
+            nt = int(np.ceil(max_t / dt))
+        else:
+            nt = int(np.ceil((min(time_range[1], max_t) - t0) / dt))
+        num_windows = max((nt - n_extra - nwin) // step + 1, 0)
+        if num_windows > acc.num_windows:
+            process(acc.num_windows, num_windows, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if acc.num_windows == 0:
+        raise ValueError('Sequence (time range) is shorter than the spectrogram window width')
+
+    def finalize(value):
+        if combine_mode == 'mean':
+            return value / acc.num_windows
+        if combine_mode == 'rss':
+            return np.sqrt(value)
+        return value
+
+    spectrograms = [finalize(value) for value in acc.channels]
+    times = (np.arange(acc.num_windows) * step + nwin / 2) * dt
+    return spectrograms, finalize(acc.rss), acc.frequencies, times
+
+
+def _plot_combined(
+    spectrograms: List[np.ndarray],
+    spectrogram_rss: np.ndarray,
+    frequencies: np.ndarray,
+    acoustic_resonances: List[dict],
+) -> None:
+    """Plot the combined spectra of all gradient channels and the acoustic resonances."""
+    from matplotlib import pyplot as plt
+
+    plt.figure()
+    plt.xlabel('Frequency (Hz)')
+    # According to spectrogram documentation y unit is (Hz/m)^2 / Hz = Hz/m^2, is this meaningful?
+    for s in spectrograms:
+        plt.plot(frequencies, s)
+    plt.plot(frequencies, spectrogram_rss)
+    plt.legend(['x', 'y', 'z', 'rss'])
+
+    for res in acoustic_resonances:
+        plt.axvline(res['frequency'], color='k', linestyle='-')
+        plt.axvline(res['frequency'] - res['bandwidth'] / 2, color='k', linestyle='--')
+        plt.axvline(res['frequency'] + res['bandwidth'] / 2, color='k', linestyle='--')
+
 
 def calculate_gradient_spectrum(
     obj,
@@ -15,6 +200,10 @@ def calculate_gradient_spectrum(
     combine_mode: str = 'max',
     use_derivative: bool = False,
     acoustic_resonances: Union[List[dict], None] = None,
+    streaming: bool = False,
+    num_threads: Union[int, None] = None,
+    chunk_windows: int = 256,
+    num_processes: Union[int, None] = None,
 ) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
     """
     Calculates the gradient spectrum of the sequence. Returns a spectrogram
@@ -52,6 +241,22 @@ def calculate_gradient_spectrum(
     acoustic_resonances : List[dict], optional
         Acoustic resonances as a list of dictionaries with 'frequency' and
         'bandwidth' elements. Only used when plot==True. The default is [].
+    streaming : bool, optional
+        Calculate the combined spectra in chunks of windows generated directly
+        from the sequence blocks, without sampling the full waveforms or holding
+        the full spectrograms in memory. Only supported for combine modes 'max',
+        'mean' and 'rss'. The default is False.
+    num_threads : int, optional
+        Number of threads used to calculate the spectra of the gradient channels
+        in parallel in streaming mode. The default is None (no threads).
+    chunk_windows : int, optional
+        Number of windows processed at once in streaming mode. The default is 256.
+    num_processes : int, optional
+        Number of worker processes. If larger than 1, the gradient waveforms
+        are decompressed in time-contiguous shards of blocks, and the windows
+        are transformed in time-contiguous shards, all in parallel. The results
+        are identical to the ones of a single process. Not used in streaming
+        mode. The default is None (no processes).
 
     Returns
     -------
@@ -72,8 +277,26 @@ def calculate_gradient_spectrum(
     nwin = round(window_width / dt)
     nfft = round(frequency_oversampling * nwin)
 
+    if streaming:
+        if combine_mode not in ['max', 'mean', 'rss']:
+            raise ValueError(f'Streaming mode requires combine_mode to be one of [max, mean, rss], got: {combine_mode}')
+        spectrograms, spectrogram_rss, frequencies, times = _streaming_spectrum(
+            obj,
+            nwin,
+            nfft,
+            max_frequency,
+            time_range,
+            combine_mode,
+            use_derivative,
+            num_threads,
+            chunk_windows,
+        )
+        if plot:
+            _plot_combined(spectrograms, spectrogram_rss, frequencies, acoustic_resonances)
+        return spectrograms, spectrogram_rss, frequencies, times
+
     # Get gradients as piecewise-polynomials
-    gw_pp = obj.get_gradients(time_range=time_range)
+    gw_pp = obj.get_gradients(time_range=time_range, num_processes=num_processes)
     ng = len(gw_pp)
     max_t = max(g.x[-1] for g in gw_pp if g is not None)
 
@@ -96,39 +319,55 @@ def calculate_gradient_spectrum(
         gw = np.diff(gw, axis=1)
 
     # Calculate spectrogram for each gradient channel
+    step = nwin - nwin // 2
+    num_windows = (gw.shape[1] - nwin) // step + 1
+    if num_processes is not None and num_processes > 1 and num_windows > 1:
+        # Split the windows into shards, each with the samples of its windows (overlapping with the next shard)
+        tasks = [
+            (k0 * step, (k1 - 1) * step + nwin) for k0, k1 in split_range(num_windows, min(num_processes, num_windows))
+        ]
+        results = map_shards(_spectrogram_shard, (gw, dt, nwin, nfft, max_frequency), tasks, num_processes)
+        frequencies = results[0][0]
+        spectra = [np.concatenate([sxx[i] for _, sxx in results], axis=1) for i in range(ng)]
+        # Window centers, calculated as in `scipy.signal.spectrogram()`
+        times = np.arange(nwin / 2, gw.shape[1] - nwin / 2 + 1, step) / float(1 / dt)
+    else:
+        spectra = []
+        for i in range(ng):
+            # Use scipy to calculate the spectrograms
+            freq, times, sxx = spectrogram(
+                gw[i],
+                fs=1 / dt,
+                mode='magnitude',
+                nperseg=nwin,
+                noverlap=nwin // 2,
+                nfft=nfft,
+                detrend='constant',
+                window=('tukey', 1),
+            )
+            mask = freq < max_frequency
+            frequencies = freq[mask]
+            spectra.append(sxx[mask])
+
     spectrograms: List[np.ndarray] = []
     spectrogram_rss = 0
 
-    for i in range(ng):
-        # Use scipy to calculate the spectrograms
-        freq, times, sxx = spectrogram(
-            gw[i],
-            fs=1 / dt,
-            mode='magnitude',
-            nperseg=nwin,
-            noverlap=nwin // 2,
-            nfft=nfft,
-            detrend='constant',
-            window=('tukey', 1),
-        )
-        mask = freq < max_frequency
-
+    for sxx in spectra:
         # Accumulate spectrum for all gradient channels
-        spectrogram_rss += sxx[mask] ** 2
+        spectrogram_rss += sxx**2
 
         # Combine spectrogram over time axis
         if combine_mode == 'max':
-            s = sxx[mask].max(axis=1)
+            s = sxx.max(axis=1)
         elif combine_mode == 'mean':
-            s = sxx[mask].mean(axis=1)
+            s = sxx.mean(axis=1)
         elif combine_mode == 'rss':
-            s = np.sqrt((sxx[mask] ** 2).sum(axis=1))
+            s = np.sqrt((sxx**2).sum(axis=1))
         elif combine_mode == 'none':
-            s = sxx[mask]
+            s = sxx
         else:
             raise ValueError(f'Unknown value for combine_mode: {combine_mode}, must be one of [max, mean, rss, none]')
 
-        frequencies = freq[mask]
         spectrograms.append(s)
 
     # Root-sum-of-squares combined spectrogram for all gradient channels
@@ -142,19 +381,10 @@ def calculate_gradient_spectrum(
 
     # Plot spectrograms and acoustic resonances if specified
     if plot:
-        if combine_mode != 'none':
-            plt.figure()
-            plt.xlabel('Frequency (Hz)')
-            # According to spectrogram documentation y unit is (Hz/m)^2 / Hz = Hz/m^2, is this meaningful?
-            for s in spectrograms:
-                plt.plot(frequencies, s)
-            plt.plot(frequencies, spectrogram_rss)
-            plt.legend(['x', 'y', 'z', 'rss'])
+        from matplotlib import pyplot as plt
 
-            for res in acoustic_resonances:
-                plt.axvline(res['frequency'], color='k', linestyle='-')
-                plt.axvline(res['frequency'] - res['bandwidth'] / 2, color='k', linestyle='--')
-                plt.axvline(res['frequency'] + res['bandwidth'] / 2, color='k', linestyle='--')
+        if combine_mode != 'none':
+            _plot_combined(spectrograms, spectrogram_rss, frequencies, acoustic_resonances)
         else:
             for s, c in zip(spectrograms, ['X', 'Y', 'Z'], strict=False):
                 plt.figure()
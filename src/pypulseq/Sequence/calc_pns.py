@@ -1,17 +1,27 @@
 from types import SimpleNamespace
 from typing import List, Tuple, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from pypulseq import Sequence
-from pypulseq.utils.safe_pns_prediction import safe_gwf_to_pns, safe_plot
+from pypulseq.Sequence.sharding import map_shards, split_range
+from pypulseq.utils.safe_pns_prediction import (
+    safe_gwf_to_dgdt,
+    safe_gwf_to_pns,
+    safe_plot,
+    safe_pns_model,
+    safe_tau_lowpass_length,
+)
 from pypulseq.utils.siemens.asc_to_hw import asc_to_hw
 from pypulseq.utils.siemens.readasc import readasc
 
 
 def calc_pns(
-    obj: Sequence, hardware: SimpleNamespace, time_range: Union[List[float], None] = None, do_plots: bool = True
+    obj: Sequence,
+    hardware: SimpleNamespace,
+    time_range: Union[List[float], None] = None,
+    do_plots: bool = True,
+    num_processes: Union[int, None] = None,
 ) -> Tuple[bool, np.ndarray, np.ndarray, np.ndarray]:
     """
     Calculate PNS using safe model implementation by Szczepankiewicz and Witzel
@@ -30,6 +40,11 @@ def calc_pns(
         can be acquired from)
     do_plots : bool, optional
         Plot the results from the PNS calculations. The default is True.
+    num_processes : int, optional
+        Number of worker processes. If larger than 1, the gradient waveforms are decompressed in time-contiguous
+        shards of blocks, and the PNS model is evaluated in time-contiguous shards of samples, all in parallel. Each
+        shard of samples is preceded by the length of the PNS lowpass filters, so the results are identical to the
+        ones of a single process. The default is None (no processes).
 
     Returns
     -------
@@ -44,7 +59,7 @@ def calc_pns(
     """
     dt = obj.grad_raster_time
     # Get gradients as piecewise-polynomials
-    gw_pp = obj.get_gradients(time_range=time_range)
+    gw_pp = obj.get_gradients(time_range=time_range, num_processes=num_processes)
     ng = len(gw_pp)
     max_t = max(g.x[-1] for g in gw_pp if g is not None) - 1e-10
 
@@ -64,6 +79,8 @@ def calc_pns(
             gw[:, i] = gw_pp[i](t)
 
     if do_plots:
+        import matplotlib.pyplot as plt
+
         plt.figure()
         for i in range(ng):
             if gw_pp[i] is not None:
@@ -76,12 +93,28 @@ def calc_pns(
         hardware = asc_to_hw(asc)
 
     # use the Szczepankiewicz' and Witzel's implementation
-    [pns_comp, res] = safe_gwf_to_pns(
-        gw / obj.system.gamma, np.nan * np.ones(t.shape[0]), obj.grad_raster_time, hardware
-    )  # the RF vector is unused in the code inside but it is zeropaded and exported ...
+    if num_processes is not None and num_processes > 1:
+        _, rf, dgdt = safe_gwf_to_dgdt(gw / obj.system.gamma, np.nan * np.ones(t.shape[0]), dt, hardware)
+
+        # Each PNS sample depends on the preceding samples within the length of the longest lowpass filter
+        axes = [hardware.x, hardware.y, hardware.z]
+        preroll = max(
+            safe_tau_lowpass_length(tau, dt * 1000, dgdt.shape[0]) - 1
+            for axis in axes
+            for tau in (axis.tau1, axis.tau2, axis.tau3)
+        )
+        # Shards are at least as long as the filters, so they are convolved like the full waveform
+        num_shards = min(num_processes, max(dgdt.shape[0] // (preroll + 1), 1))
+        tasks = [(max(start - preroll, 0), start, stop) for start, stop in split_range(dgdt.shape[0], num_shards)]
+        pns_comp = np.concatenate(map_shards(_pns_shard, (dgdt, dt, axes), tasks, num_processes))
+    else:
+        [pns_comp, res] = safe_gwf_to_pns(
+            gw / obj.system.gamma, np.nan * np.ones(t.shape[0]), obj.grad_raster_time, hardware
+        )  # the RF vector is unused in the code inside but it is zeropaded and exported ...
+        rf = res.rf
 
     # use the exported RF vector to detect and undo zero-padding
-    pns_comp = 0.01 * pns_comp[~np.isfinite(res.rf[1:]), :]
+    pns_comp = 0.01 * pns_comp[~np.isfinite(rf[1:]), :]
 
     # calc pns_norm and the final ok/not_ok
     pns_norm = np.sqrt((pns_comp**2).sum(axis=1))
@@ -94,3 +127,16 @@ def calc_pns(
         safe_plot(pns_comp * 100, obj.grad_raster_time)
 
     return ok, pns_norm, pns_comp, t
+
+
+def _pns_shard(shared: tuple, first: int, start: int, stop: int) -> np.ndarray:
+    """
+    Evaluates the PNS model for the samples `start` to `stop` of the slew rate, using the preceding samples from
+    `first` on as pre-roll of the lowpass filters.
+    """
+    dgdt, dt, axes = shared
+    pns = np.zeros((stop - start, len(axes)))
+    for i, axis in enumerate(axes):
+        # The filter length is limited by the length of the full waveform, as in `safe_gwf_to_pns()`
+        pns[:, i] = safe_pns_model(dgdt[first:stop, i], dt, axis, n_max=dgdt.shape[0])[start - first :]
+    return pns
@@ -0,0 +1,143 @@
+import gzip
+import io
+from pathlib import Path
+from typing import TextIO, Union
+
+# Magic bytes at the start of compressed files
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# File name extensions appended to `.seq` for compressed files
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def detect_compression(path: Union[str, Path]) -> Union[str, None]:
+    """
+    Detects the compression of a sequence file from its first bytes.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the sequence file.
+
+    Returns
+    -------
+    compression : str or None
+        'gzip', 'zstd' or None for uncompressed files.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if magic.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+
+def open_seq_file(path: Union[str, Path], mode: str = 'r', compression: Union[str, None] = None) -> TextIO:
+    """
+    Opens a text sequence file, (de)compressing it on the fly.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the sequence file.
+    mode : str, default='r'
+        'r' for reading or 'w' for writing. When reading, the compression is detected from the file contents.
+    compression : str, optional
+        Compression of the written file, 'gzip', 'zstd' or None for uncompressed files.
+
+    Returns
+    -------
+    file : TextIO
+        Text stream of the (uncompressed) file contents.
+
+    Raises
+    ------
+    ValueError
+        If `compression` is not supported.
+    ModuleNotFoundError
+        If `compression` is 'zstd' and neither `compression.zstd` (Python 3.14+) nor `zstandard` is installed.
+    """
+    if mode == 'r':
+        compression = detect_compression(path)
+        if compression is not None:
+            return _LineReader(_open(path, 'rt', compression))
+    return _open(path, mode, compression)
+
+
+def _open(path: Union[str, Path], mode: str, compression: Union[str, None]) -> TextIO:
+    if compression is None:
+        return open(path, mode)
+    if compression == 'gzip':
+        # The default level of the gzip tool, level 9 is about three times slower for a few percent smaller files
+        return gzip.open(path, mode + 't', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            from compression import zstd
+
+            return zstd.open(path, mode + 't')
+        except ModuleNotFoundError:
+            pass
+        try:
+            import zstandard
+        except ModuleNotFoundError as err:
+            raise ModuleNotFoundError(
+                "zstandard is not installed. Install it using 'pip install zstandard' or 'pip install pypulseq[zstd]'."
+            ) from err
+        return zstandard.open(path, mode + 't')
+    raise ValueError(f"Unsupported compression '{compression}', expected one of {list(COMPRESSION_EXTENSIONS)}.")
+
+
+class _LineReader(io.TextIOBase):
+    """
+    Line-by-line reader of a decompressed text stream. Decompressing streams cannot seek backwards (or only by
+    decompressing the file again from the start), but the sequence file reader only ever seeks back to the start of
+    the last line it has read, which is supported by keeping that line.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._line = None
+        self._unread = False
+        self._num_lines = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readline(self, _size: int = -1) -> str:
+        # Lines are always read whole, as seeking back works per line. The size limit is not supported.
+        if self._unread:
+            self._unread = False
+        else:
+            self._line = self._stream.readline()
+        self._num_lines += 1
+        return self._line
+
+    def tell(self) -> int:
+        return self._num_lines
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence != io.SEEK_SET or offset != self._num_lines - 1 or self._unread or self._line is None:
+            raise io.UnsupportedOperation('Compressed sequence files can only seek back to the start of the last line')
+        self._unread = True
+        self._num_lines = offset
+        return offset
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
+
+def seq_file_name(file_name: Union[str, Path], compression: Union[str, None] = None) -> Path:
+    """
+    Appends the `.seq` suffix, and the extension of the compression (e.g. `.seq.gz`), to a file name if missing.
+    """
+    file_name = Path(file_name)
+    extension = COMPRESSION_EXTENSIONS.get(compression, '')
+    if extension and file_name.suffix == extension:
+        file_name = file_name.with_suffix('')
+    if file_name.suffix != '.seq':
+        # Append .seq suffix
+        file_name = file_name.with_suffix(file_name.suffix + '.seq')
+    return file_name.with_name(file_name.name + extension)
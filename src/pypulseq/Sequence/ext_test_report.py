@@ -1,7 +1,11 @@
+from types import SimpleNamespace
+
 import numpy as np
 
 from pypulseq import eps
+from pypulseq.calc_rf_center import calc_rf_center
 from pypulseq.convert import convert
+from pypulseq.Sequence.timeline import block_grad_points, iter_blocks
 
 
 def ext_test_report(self) -> str:
@@ -14,28 +18,25 @@ def ext_test_report(self) -> str:
 
     """
     # Find RF pulses and list flip angles
-    flip_angles_deg = []
-    for k in self.rf_library.data:
-        lib_data = self.rf_library.data[k]
-        if len(self.rf_library.type) >= k:
-            rf = self.rf_from_lib_data(lib_data, self.rf_library.type[k])
-        else:
-            rf = self.rf_from_lib_data(lib_data)
-        flip_angles_deg.append(np.abs(np.sum(rf.signal[:-1] * (rf.t[1:] - rf.t[:-1]))) * 360)
-
-    flip_angles_deg = np.unique(flip_angles_deg)
+    rf_stats = self.rf_stats()
+    flip_angles_deg = np.unique(rf_stats.flip_angle)
 
     # Calculate TE, TR
     duration, num_blocks, event_count = self.duration()
 
-    k_traj_adc, _, t_excitation, _, t_adc = self.calculate_kspace()
-    t_excitation = np.asarray(t_excitation)
+    timeline = _scan_timeline(self)
+    k_traj_adc = timeline.k_traj_adc
+    t_excitation = timeline.t_excitation
+    t_adc = timeline.t_adc
 
     # remove all ADC events that come before the first RF event (noise scans or alike)
-    t_adc = t_adc[t_adc > t_excitation[0]]
+    if len(t_excitation) > 0:
+        t_adc = t_adc[t_adc > t_excitation[0]]
 
     k_abs_adc = np.sqrt(np.sum(np.square(k_traj_adc), axis=0))
-    k_abs_echo, index_echo = np.min(k_abs_adc), np.argmin(k_abs_adc)
+    # Round off numerical noise of the trajectory, so argmin picks the first of the samples closest to the center
+    index_echo = np.argmin(np.round(k_abs_adc, 6))
+    k_abs_echo = k_abs_adc[index_echo]
     t_echo = t_adc[index_echo]
     if k_abs_echo > eps:
         i2check = []
@@ -83,99 +84,34 @@ def ext_test_report(self) -> str:
             k_extent = np.delete(k_extent, np.where(k_extent < k_threshold), axis=0)
 
         # Bin the k-space trajectory to detect repetitions / slices
-        k_len = k_traj_adc.shape[1]
-        k_repeat = np.zeros(k_len)
-        k_storage = np.zeros(k_len)
-        k_storage_next = 0
-        k_map = {}
         keys = np.round(k_traj_adc / k_threshold).astype(np.int32)
-        for i in range(k_len):
-            key_string = tuple(keys[:, i])
-            k_storage_ind = k_map.get(key_string)
-            if k_storage_ind is None:
-                k_storage_ind = k_storage_next
-                k_map[key_string] = k_storage_ind
-                k_storage_next += 1
-            k_storage[k_storage_ind] = k_storage[k_storage_ind] + 1
-            k_repeat[i] = k_storage[k_storage_ind]
-
-        repeats_max = np.max(k_storage[:k_storage_next])
-        repeats_min = np.min(k_storage[:k_storage_next])
-        repeats_median = np.median(k_storage[:k_storage_next])
-        repeats_unique = np.unique(k_storage[:k_storage_next])
-        counts_unique = np.zeros_like(repeats_unique)
-        for i in range(len(repeats_unique)):
-            counts_unique[i] = np.sum(repeats_unique[i] == k_storage[: k_storage_next - 1])
-
-        k_traj_rep1 = k_traj_adc[:, k_repeat == 1]
-
-        k_counters = np.zeros_like(k_traj_rep1)
-        dims = k_traj_rep1.shape[0]
-
-        keys = keys[:, k_repeat == 1]
-        for j in range(dims):
-            k_map = {}
-            k_storage = np.zeros(k_len)
-            k_storage_next = 0
-
-            for i in range(k_traj_rep1.shape[1]):
-                key = keys[j, i]
-                k_storage_ind = k_map.get(key)
-                if k_storage_ind is None:
-                    k_storage_ind = k_map.get(key + 1)
-                if k_storage_ind is None:
-                    k_storage_ind = k_map.get(key - 1)
-                if k_storage_ind is None:
-                    k_storage_ind = k_storage_next
-                    k_map[key] = k_storage_ind
-                    k_storage_next += 1
-                    k_storage[k_storage_ind] = k_traj_rep1[j, i]
-                k_counters[j, i] = k_storage_ind
-
-        unique_k_positions = np.max(k_counters, axis=1) + 1
-        is_cartesian = np.prod(unique_k_positions) == k_traj_rep1.shape[1]
+        _, first_index, k_storage = np.unique(keys, axis=1, return_index=True, return_counts=True)
+        k_storage = k_storage.astype(float)
+
+        repeats_max = np.max(k_storage)
+        repeats_min = np.min(k_storage)
+        repeats_median = np.median(k_storage)
+
+        # Count unique positions per dimension. In order of appearance, a key is a new position unless it or one of
+        # its neighbours (+-1) has already been counted. Only the first occurrence of each key can be a new position.
+        keys = keys[:, np.sort(first_index)]
+        unique_k_positions = np.zeros(keys.shape[0])
+        for j in range(keys.shape[0]):
+            unique_keys, first_key_index = np.unique(keys[j], return_index=True)
+            counted = set()
+            for key in unique_keys[np.argsort(first_key_index)].tolist():
+                if key not in counted and key + 1 not in counted and key - 1 not in counted:
+                    counted.add(key)
+            unique_k_positions[j] = len(counted)
+
+        is_cartesian = np.prod(unique_k_positions) == keys.shape[1]
     else:
         unique_k_positions = np.ones(1)
 
-    gw_data = self.waveforms()
-    gws = [np.zeros_like(x) for x in gw_data]
-    ga = np.zeros(len(gw_data))
-    gs = np.zeros(len(gw_data))
-
-    common_time = np.unique(np.concatenate(gw_data, axis=1)[0])
-
-    # catch case where no gradients are present (e.g. FID)
-    if all(x.size == 0 for x in gw_data):
-        gw_ct = np.zeros(0)
-        gs_ct = np.zeros(0)
-    else:
-        gw_ct = np.zeros((len(gw_data), len(common_time)))
-        gs_ct = np.zeros((len(gw_data), len(common_time) - 1))
-
-    for gc in range(len(gw_data)):
-        if gw_data[gc].shape[1] > 0:
-            # Slew
-            gws[gc] = (gw_data[gc][1, 1:] - gw_data[gc][1, :-1]) / (gw_data[gc][0, 1:] - gw_data[gc][0, :-1])
-
-            # Interpolate to common time
-            gw_ct[gc] = np.interp(
-                x=common_time,
-                xp=gw_data[gc][0, :],
-                fp=gw_data[gc][1, :],
-                left=0,
-                right=0,
-            )
-
-            # Sometimes there are very small steps in common_time:
-            #   add 1e-10 to resolve instability (adding eps is too small)
-            gs_ct[gc] = (gw_ct[gc][1:] - gw_ct[gc][:-1]) / (common_time[1:] - common_time[:-1] + 1e-10)
-
-            # Max grad/slew per channel
-            ga[gc] = np.max(np.abs(gw_data[gc][1:]))
-            gs[gc] = np.max(np.abs(gws[gc]))
-
-    ga_abs = np.max(np.sqrt(np.sum(np.square(gw_ct), axis=0)))
-    gs_abs = np.max(np.sqrt(np.sum(np.square(gs_ct), axis=0)))
+    ga = timeline.ga
+    gs = timeline.gs
+    ga_abs = timeline.ga_abs
+    gs_abs = timeline.gs_abs
 
     timing_ok, timing_error_report = self.check_timing()
 
@@ -193,6 +129,10 @@ def ext_test_report(self) -> str:
         f'TR: {TR:.6f} s\n'
     )
     report += 'Flip angle: ' + ('{:.02f} ' * len(flip_angles_deg)).format(*flip_angles_deg) + 'deg\n'
+    report += (
+        f'B1rms: {rf_stats.b1rms / self.system.gamma * 1e6:.03f} uT, '
+        f'RF duty cycle: {rf_stats.duty_cycle * 100:.02f} %\n'
+    )
     report += (
         'Unique k-space positions (aka cols, rows, etc.): '
         + ('{:.0f} ' * len(unique_k_positions)).format(*unique_k_positions)
@@ -243,3 +183,170 @@ def ext_test_report(self) -> str:
             report += '\n...'
 
     return report
+
+
+def _moment(points: np.ndarray, area: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Integral of the piecewise-linear waveform `points` from its first point up to times `t`, given the cumulative
+    `area` at the corner points. The waveform is zero before its first point and constant after its last point.
+    """
+    tp, vp = points
+    dt = np.append(tp[1:] - tp[:-1], 0)
+    slope = np.divide(np.append(vp[1:] - vp[:-1], 0), dt, out=np.zeros_like(dt), where=dt > 0)
+
+    idx = np.maximum(np.searchsorted(tp, t, side='right') - 1, 0)
+    u = np.clip(t - tp[idx], 0, dt[idx])
+    return np.where(t < tp[0], 0, area[idx] + vp[idx] * u + 0.5 * slope[idx] * u**2)
+
+
+def _scan_timeline(self, chunk_size: int = 1000) -> SimpleNamespace:
+    """
+    Collect the k-space trajectory at the ADC samples, the excitation times and the gradient statistics of the
+    sequence in a single pass over the blocks.
+
+    Blocks are processed in chunks of `chunk_size` blocks: the gradient corner points of a chunk are concatenated
+    and evaluated with array operations, and only the last corner point, gradient moment and k-space offset of each
+    channel are carried over to the next chunk, so memory use is bounded by the chunk size (plus the ADC
+    trajectory). Excitations reset and refocusings invert the gradient moment as in `Sequence.calculate_kspace()`.
+    """
+    grad_channels = ['gx', 'gy', 'gz']
+    ng = len(grad_channels)
+
+    state = SimpleNamespace(
+        ga=np.zeros(ng),
+        gs=np.zeros(ng),
+        ga_abs=0.0,
+        gs_abs=0.0,
+        last_point=[None] * ng,  # Last corner point (time, amplitude) per channel
+        last_moment=np.zeros(ng),  # Gradient moment at the last corner point per channel
+        last_common=None,  # Last common timepoint and gradient vector
+        dk=np.zeros(ng),
+        t_excitation=[],
+        t_adc=[],
+        k_traj_adc=[],
+    )
+
+    def process_chunk(pieces, rf_events, t_adc):
+        # Concatenate the gradient pieces of each channel, starting from the last point of the previous chunk
+        channel_points = [None] * ng
+        for j in range(ng):
+            if len(pieces[j]) == 0:
+                continue
+
+            series = [] if state.last_point[j] is None else [state.last_point[j][:, None]]
+            prev_end = None if state.last_point[j] is None else state.last_point[j][0]
+            for piece in pieces[j]:
+                # If the first element of the next piece has the same time as the last element of the previous
+                # piece, drop the first element of the next piece
+                if prev_end is not None and prev_end + eps >= piece[0, 0]:
+                    piece = piece[:, 1:]
+                series.append(piece)
+                prev_end = piece[0, -1]
+            points = np.concatenate(series, axis=1)
+            channel_points[j] = points
+
+            # Max grad/slew per channel
+            start = 0 if state.last_point[j] is None else 1
+            state.ga[j] = max(state.ga[j], np.max(np.abs(points[1, start:])))
+            if points.shape[1] > 1:
+                slew = (points[1, 1:] - points[1, :-1]) / (points[0, 1:] - points[0, :-1])
+                state.gs[j] = max(state.gs[j], np.max(np.abs(slew)))
+
+        # Combined gradient amplitude and slew rate on the common timepoints of all channels
+        active = [p for p in channel_points if p is not None]
+        if active:
+            common_time = np.unique(np.concatenate([p[0] for p in active]))
+            if state.last_common is not None:
+                common_time = common_time[common_time > state.last_common[0]]
+            gw_ct = np.zeros((ng, len(common_time)))
+            for j in range(ng):
+                points = channel_points[j]
+                if points is None and state.last_point[j] is not None:
+                    points = state.last_point[j][:, None]
+                if points is not None:
+                    gw_ct[j] = np.interp(common_time, points[0], points[1], left=0, right=points[1, -1])
+            if state.last_common is not None:
+                common_time = np.concatenate(([state.last_common[0]], common_time))
+                gw_ct = np.hstack((state.last_common[1][:, None], gw_ct))
+
+            if gw_ct.shape[1] > 0:
+                state.ga_abs = max(state.ga_abs, np.max(np.sqrt(np.sum(np.square(gw_ct), axis=0))))
+                state.last_common = (common_time[-1], gw_ct[:, -1])
+            if gw_ct.shape[1] > 1:
+                # Sometimes there are very small steps in common_time:
+                #   add 1e-10 to resolve instability (adding eps is too small)
+                gs_ct = np.diff(gw_ct, axis=1) / (np.diff(common_time) + 1e-10)
+                state.gs_abs = max(state.gs_abs, np.max(np.sqrt(np.sum(np.square(gs_ct), axis=0))))
+
+        # Gradient moments at the RF centers and the ADC samples
+        t_rf = np.array([e[0] for e in rf_events], dtype=float)
+        t_adc = np.concatenate(t_adc) if t_adc else np.zeros(0)
+        t_events = np.concatenate((t_rf, t_adc))
+        moments = np.zeros((ng, len(t_events)))
+        for j in range(ng):
+            points = channel_points[j]
+            if points is None:
+                moments[j] = state.last_moment[j]
+                continue
+            tp, vp = points
+            area = np.concatenate(([0], np.cumsum(0.5 * (vp[1:] + vp[:-1]) * (tp[1:] - tp[:-1]))))
+            area += state.last_moment[j]
+            if len(t_events) > 0:
+                moments[j] = _moment(points, area, t_events)
+            state.last_point[j] = points[:, -1]
+            state.last_moment[j] = area[-1]
+
+        # Excitations reset the gradient moment, refocusings invert it
+        dk = np.zeros((ng, len(rf_events) + 1))
+        dk[:, 0] = state.dk
+        for i, (t, is_excitation) in enumerate(rf_events):
+            if is_excitation:
+                state.t_excitation.append(t)
+                dk[:, i + 1] = -moments[:, i]
+            else:
+                dk[:, i + 1] = -2 * moments[:, i] - dk[:, i]
+        state.dk = dk[:, -1]
+
+        if len(t_adc) > 0:
+            i_period = np.searchsorted(t_rf, t_adc, side='right')
+            state.t_adc.append(t_adc)
+            state.k_traj_adc.append(moments[:, len(t_rf) :] + dk[:, i_period])
+
+    pieces = [[] for _ in range(ng)]
+    rf_events = []
+    t_adc = []
+    num_blocks = 0
+    for _, block_start, block in iter_blocks(self):
+        for j, piece in enumerate(block_grad_points(block, self.grad_raster_time, block_start)):
+            if piece is not None:
+                pieces[j].append(piece)
+
+        if block.rf is not None:
+            rf = block.rf
+            use = rf.use if hasattr(rf, 'use') else 'excitation'
+            if use in ['excitation', 'undefined', 'refocusing']:
+                rf_events.append((block_start + rf.delay + calc_rf_center(rf)[0], use != 'refocusing'))
+
+        if block.adc is not None:
+            adc = block.adc
+            t_adc.append((np.arange(adc.num_samples) + 0.5) * adc.dwell + adc.delay + block_start)
+
+        num_blocks += 1
+        if num_blocks == chunk_size:
+            process_chunk(pieces, rf_events, t_adc)
+            pieces = [[] for _ in range(ng)]
+            rf_events = []
+            t_adc = []
+            num_blocks = 0
+
+    process_chunk(pieces, rf_events, t_adc)
+
+    return SimpleNamespace(
+        k_traj_adc=np.concatenate(state.k_traj_adc, axis=1) if state.k_traj_adc else np.zeros((ng, 0)),
+        t_adc=np.concatenate(state.t_adc) if state.t_adc else np.zeros(0),
+        t_excitation=np.asarray(state.t_excitation, dtype=float),
+        ga=state.ga,
+        gs=state.gs,
+        ga_abs=state.ga_abs,
+        gs_abs=state.gs_abs,
+    )
@@ -0,0 +1,210 @@
+from typing import TYPE_CHECKING, List, Union
+
+import numpy as np
+
+from pypulseq import eps
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+
+class KSpacePlan:
+    """
+    Precomputed k-space trajectory plan of a sequence for repeated evaluation of the ADC k-space trajectory with
+    different trajectory delays and gradient offsets (e.g. for gradient delay calibration).
+
+    The plan stores the gradient moment of every channel as a piecewise polynomial, the ADC sample times and the
+    excitation/refocusing boundaries. ADC sample offsets and RF center times are computed once per ADC/RF library
+    entry and placed at the start times of the blocks that use them, so no block is decoded for the timing.
+    Evaluating the trajectory for a new delay/offset vector only evaluates the moments at shifted sample and
+    boundary times and applies the (linear) excitation/refocusing resets.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to create the plan for. The plan is not updated if the sequence is modified afterwards.
+
+    Attributes
+    ----------
+    t_adc : np.ndarray
+        Sampling timepoints.
+    t_excitation : np.ndarray
+        Excitation timepoints.
+    t_refocusing : np.ndarray
+        Refocusing timepoints.
+
+    See Also
+    --------
+    - `pypulseq.Sequence.sequence.Sequence.calculate_kspace()`
+    """
+
+    def __init__(self, seq: 'Sequence'):
+        self.total_duration = sum(seq.block_durations.values())
+
+        # Block start times in block order
+        block_ids = list(seq.block_events)
+        block_durations = np.array([seq.block_durations[b] for b in block_ids], dtype=float)
+        block_starts = np.concatenate(([0.0], np.cumsum(block_durations)[:-1]))
+        events = np.array([seq.block_events[b] for b in block_ids], dtype=np.int64).reshape(-1, 7)
+
+        # ADC sample offsets, computed once per ADC library entry
+        adc_blocks = np.flatnonzero(events[:, 5])
+        adc_offsets = {}
+        for adc_id in np.unique(events[adc_blocks, 5]):
+            lib_data = seq.adc_library.data[adc_id]
+            adc_offsets[adc_id] = (np.arange(int(lib_data[0])) + 0.5) * lib_data[1] + lib_data[2]
+        if len(adc_blocks) > 0:
+            self.t_adc = np.concatenate([block_starts[i] + adc_offsets[events[i, 5]] for i in adc_blocks])
+        else:
+            self.t_adc = np.zeros(0)
+
+        # RF center times and uses, computed once per RF library entry
+        rf_blocks = np.flatnonzero(events[:, 1])
+        rf_center = {}
+        rf_use = {}
+        for rf_id in np.unique(events[rf_blocks, 1]):
+            lib_data = seq.rf_library.data[rf_id]
+            rf_center[rf_id] = lib_data[5] + lib_data[4]  # delay + center
+            rf_use[rf_id] = seq.rf_library.type.get(rf_id, 'u')
+
+        t_rf = np.array([block_starts[i] + rf_center[events[i, 1]] for i in rf_blocks], dtype=float)
+        use = np.array([rf_use[events[i, 1]] for i in rf_blocks], dtype='<U1')
+        is_excitation = np.isin(use, ['e', 'u'])
+        is_refocusing = use == 'r'
+        self.t_excitation = t_rf[is_excitation]
+        self.t_refocusing = t_rf[is_refocusing]
+
+        # Excitation/refocusing boundaries in temporal order
+        keep = is_excitation | is_refocusing
+        self._t_boundary = t_rf[keep]
+        self._is_refocusing = is_refocusing[keep]
+
+        # Number of ADC samples before the first boundary and after each boundary (ADC samples are sorted in time, so
+        # the per-boundary corrections can be expanded with np.repeat)
+        i_period = np.searchsorted(self._t_boundary, self.t_adc, side='right')
+        self._period_counts = np.bincount(i_period, minlength=len(self._t_boundary) + 1)
+
+        # Segments start at each excitation; the refocusing parity counts refocusings within a segment
+        is_reset = ~self._is_refocusing
+        segment = np.cumsum(is_reset)
+        ref_count = np.cumsum(self._is_refocusing)
+        segment_start_count = np.zeros(segment.max() + 1 if len(segment) > 0 else 1, dtype=np.int64)
+        segment_start_count[segment[is_reset]] = ref_count[is_reset]
+        self._parity = np.where((ref_count - segment_start_count[segment]) % 2 == 0, 1.0, -1.0)
+        self._segment = segment
+
+        # Gradient moments (undelayed, without offset) as piecewise polynomials
+        gw_pp = seq.get_gradients()
+        self.num_channels = len(gw_pp)
+        self._gm_pp = []
+        self._support = []
+        teps = 1e-12
+        for pp in gw_pp:
+            if pp is None:
+                self._gm_pp.append(None)
+                self._support.append((-2 * teps, self.total_duration + 2 * teps))
+            else:
+                gm_pp = pp.antiderivative()
+                self._gm_pp.append(gm_pp)
+                self._support.append((gm_pp.x[0], gm_pp.x[-1]))
+
+    def _raw_moments(self, t: np.ndarray, gradient_delays: np.ndarray, gradient_offset: np.ndarray) -> np.ndarray:
+        """Gradient moments of each channel at times `t`, integrated from the start of the waveform."""
+        moments = np.zeros((self.num_channels, len(t)))
+        for j in range(self.num_channels):
+            start, end = self._support[j]
+            ts = np.clip(t + gradient_delays[j], start, end)
+            if self._gm_pp[j] is not None:
+                moments[j] = self._gm_pp[j](ts)
+            if np.abs(gradient_offset[j]) > eps:
+                moments[j] += gradient_offset[j] * (ts - start)
+        return moments
+
+    def _channel_values(self, value: Union[float, List[float], np.ndarray], name: str) -> np.ndarray:
+        if isinstance(value, (int, float)):
+            return np.full(self.num_channels, float(value))
+
+        value = np.asarray(value, dtype=float)
+        if value.shape != (self.num_channels,):
+            raise ValueError(f'{name} must be a scalar or have one value per gradient channel ({self.num_channels})')
+        return value
+
+    def evaluate(
+        self,
+        trajectory_delay: Union[float, List[float], np.ndarray] = 0.0,
+        gradient_offset: Union[float, List[float], np.ndarray] = 0.0,
+    ) -> np.ndarray:
+        """
+        Evaluate the k-space trajectory at the ADC sampling points.
+
+        Parameters
+        ----------
+        trajectory_delay : float or list or numpy.ndarray, default=0
+            Compensation factor in seconds (s) to align ADC and gradients in the reconstruction, either a single
+            value for all gradient channels or one value per channel.
+        gradient_offset : float or list or numpy.ndarray, default=0
+            Simulates background gradients (specified in Hz/m), either a single value for all gradient channels or
+            one value per channel.
+
+        Returns
+        -------
+        k_traj_adc : numpy.ndarray
+            K-space trajectory sampled at `t_adc` timepoints, identical to the first output of
+            `Sequence.calculate_kspace()` up to its temporal rounding accuracy.
+        """
+        if np.any(np.abs(trajectory_delay) > 100e-6):
+            raise Warning(f'Trajectory delay of {np.asarray(trajectory_delay) * 1e6} us is suspiciously high')
+
+        gradient_delays = self._channel_values(trajectory_delay, 'trajectory_delay')
+        gradient_offset = self._channel_values(gradient_offset, 'gradient_offset')
+
+        k_adc = self._raw_moments(self.t_adc, gradient_delays, gradient_offset)
+        if len(self._t_boundary) == 0:
+            return k_adc
+
+        # Moment correction after each boundary: an excitation resets the moment (dk = -k), a refocusing inverts it
+        # (dk = -2k - dk_prev). Multiplying by the refocusing parity turns this recursion into a cumulative sum per
+        # excitation segment.
+        k_boundary = self._raw_moments(self._t_boundary, gradient_delays, gradient_offset)
+        contribution = np.where(self._is_refocusing, -2 * k_boundary * self._parity, -k_boundary)
+        csum = np.cumsum(contribution, axis=1)
+        is_reset = ~self._is_refocusing
+        segment_offset = np.zeros((self.num_channels, self._segment.max() + 1))
+        segment_offset[:, self._segment[is_reset]] = (csum - contribution)[:, is_reset]
+        dk = (csum - segment_offset[:, self._segment]) * self._parity
+
+        dk = np.concatenate((np.zeros((self.num_channels, 1)), dk), axis=1)
+        k_adc += np.repeat(dk, self._period_counts, axis=1)
+        return k_adc
+
+    def evaluate_grid(
+        self,
+        trajectory_delays: np.ndarray,
+        gradient_offsets: Union[float, List[float], np.ndarray] = 0.0,
+    ) -> np.ndarray:
+        """
+        Evaluate the ADC k-space trajectory for a set of trajectory delays (and gradient offsets).
+
+        Parameters
+        ----------
+        trajectory_delays : numpy.ndarray
+            Array of shape [N] (same delay for all channels) or [N, num_channels].
+        gradient_offsets : float or list or numpy.ndarray, default=0
+            Single value, one value per channel, or array of shape [N, num_channels].
+
+        Returns
+        -------
+        k_traj_adc : numpy.ndarray [N, num_channels, num_samples]
+            K-space trajectories sampled at `t_adc` timepoints for each grid point.
+        """
+        trajectory_delays = np.asarray(trajectory_delays, dtype=float)
+        gradient_offsets = np.asarray(gradient_offsets, dtype=float)
+        n = trajectory_delays.shape[0]
+        if gradient_offsets.ndim < 2:
+            gradient_offsets = np.broadcast_to(gradient_offsets, (n, self.num_channels))
+
+        k_traj_adc = np.zeros((n, self.num_channels, len(self.t_adc)))
+        for i in range(n):
+            delay = trajectory_delays[i] if trajectory_delays.ndim > 1 else float(trajectory_delays[i])
+            k_traj_adc[i] = self.evaluate(delay, gradient_offsets[i])
+        return k_traj_adc
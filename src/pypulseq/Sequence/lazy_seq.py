@@ -0,0 +1,247 @@
+import io
+import json
+import mmap
+import re
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from pypulseq.event_lib import EventLibrary
+from pypulseq.Sequence.binary_seq import _load_arrays
+from pypulseq.Sequence.compression import detect_compression
+from pypulseq.Sequence.read_seq import read
+
+INDEX_FORMAT_VERSION = 1
+
+
+class LazyBlockEvents(Mapping):
+    """
+    Read-only mapping of block IDs to block event IDs, backed by the compact block table of a lazily read sequence.
+    Rows are only converted to the event arrays used by `Sequence.block_events` when they are accessed.
+    """
+
+    def __init__(self, table: np.ndarray):
+        self._table = table
+        self._ids = table[:, 0]
+        # Block IDs are normally consecutive, so the row of a block can be computed instead of looked up
+        self._first_id = int(self._ids[0]) if len(self._ids) else 0
+        self._consecutive = len(self._ids) == 0 or bool(np.all(np.diff(self._ids) == 1))
+        self._positions = None
+
+    def _position(self, block_id: int) -> int:
+        if self._consecutive:
+            pos = int(block_id) - self._first_id
+            if 0 <= pos < len(self._ids):
+                return pos
+            raise KeyError(block_id)
+        if self._positions is None:
+            self._positions = {block_id: pos for pos, block_id in enumerate(self._ids.tolist())}
+        return self._positions[block_id]
+
+    def __getitem__(self, block_id: int) -> np.ndarray:
+        events = np.array(self._table[self._position(block_id), 1:])
+        events[0] = 0  # The duration column holds the (unused) delay ID in the event array
+        return events
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids.tolist())
+
+    def __reversed__(self) -> Iterator[int]:
+        return iter(self._ids[::-1].tolist())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class LazyBlockDurations(LazyBlockEvents):
+    """
+    Read-only mapping of block IDs to block durations in seconds, backed by the block table of a lazily read sequence.
+    """
+
+    def __init__(self, table: np.ndarray, block_duration_raster: float):
+        super().__init__(table)
+        self._durations = table[:, 1] * block_duration_raster
+
+    def __getitem__(self, block_id: int) -> np.float64:
+        return self._durations[self._position(block_id)]
+
+    def values(self) -> np.ndarray:
+        # Avoid a Python-level lookup per block in `sum(block_durations.values())` and friends
+        return self._durations
+
+
+class LazyShapeData(Mapping):
+    """
+    Read-only mapping of shape IDs to (compressed) shape data, parsed from the `[SHAPES]` section of a memory-mapped
+    sequence file the first time a shape is accessed.
+    """
+
+    def __init__(self, file: mmap.mmap, index: np.ndarray):
+        self._file = file
+        self._spans = {shape_id: (start, stop) for shape_id, start, stop in index.tolist()}
+        self._cache = {}
+
+    def __getitem__(self, shape_id: int) -> np.ndarray:
+        data = self._cache.get(shape_id)
+        if data is None:
+            start, stop = self._spans[shape_id]
+            # Skip the shape_id line, the remainder is the num_samples line followed by the samples
+            lines = self._file[start:stop].split(b'\n', 2)
+            num_samples = int(lines[1].split()[1])
+            samples = np.fromstring(lines[2], sep=' ') if len(lines) > 2 else np.zeros(0)
+            data = np.concatenate(([num_samples], samples))
+            data.flags.writeable = False
+            self._cache[shape_id] = data
+        return data
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+def read_lazy(self, path: Union[str, Path], detect_rf_use: Union[bool, None] = None, cache_index: bool = True) -> None:
+    """
+    Load a sequence from file for read-only analysis, materializing blocks and shapes only when they are accessed.
+
+    The event libraries are parsed as in `read()`. The `[BLOCKS]` section is parsed into a compact block table and
+    the `[SHAPES]` section is only indexed by the byte offsets of its entries, which are parsed on first access. Both
+    are stored in an index file next to the sequence file (`<file>.idx`), so subsequent reads only parse the
+    libraries. No duplicates are removed.
+
+    See also `pypulseq.Sequence.read_seq.read()`.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of sequence file to be read.
+    detect_rf_use : bool, default=None
+        See `pypulseq.Sequence.read_seq.read()`.
+    cache_index : bool, default=True
+        Store the block table and shape index next to the file, and reuse it if the file is unchanged.
+
+    Raises
+    ------
+    RuntimeError
+        If the sequence file format version is below 1.5.0. Older files are converted while reading, which needs
+        all blocks and shapes.
+    ValueError
+        If the sequence file is compressed.
+    """
+    path = Path(path)
+    if detect_compression(path) is not None:
+        raise ValueError('Lazy reading requires an uncompressed sequence file.')
+
+    with open(path, 'rb') as f:
+        file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    version = re.search(rb'\[VERSION\]\s+major\s+(\d+)\s+minor\s+(\d+)', file)
+    if version is None or (int(version[1]), int(version[2])) < (1, 5):
+        raise RuntimeError('Lazy reading requires a sequence file with format version 1.5.0 or above.')
+
+    index_path = path.with_name(path.name + '.idx')
+    stat = path.stat()
+    index = _load_index(index_path, stat) if cache_index else None
+    if index is None:
+        index = _build_index(file)
+        if cache_index:
+            _save_index(index_path, index, stat)
+
+    library_text = b''.join(file[start:stop] for start, stop in index['library_spans'].tolist())
+    read(self, io.StringIO(library_text.decode()), detect_rf_use=detect_rf_use, remove_duplicates=False)
+
+    self.block_events = LazyBlockEvents(index['blocks'])
+    self.block_durations = LazyBlockDurations(index['blocks'], self.block_duration_raster)
+    self.shape_library = EventLibrary(numpy_data=True)
+    self.shape_library.data = LazyShapeData(file, index['shapes'])
+    self.shape_library.next_free_ID = max(self.shape_library.data, default=0) + 1
+
+
+def _build_index(file: mmap.mmap) -> Dict[str, np.ndarray]:
+    library_spans = []
+    blocks = np.zeros((0, 8), dtype=np.int64)
+    shapes = []
+    for section, start, body_start, stop in _find_sections(file):
+        if section == b'[BLOCKS]':
+            body_end = _block_rows_end(file, body_start, stop)
+            blocks = np.fromstring(file[body_start:body_end], dtype=np.int64, sep=' ')
+            if blocks.size % 8 != 0:
+                raise ValueError('Unexpected number of entries in [BLOCKS] section')
+            blocks = blocks.reshape(-1, 8)
+        elif section == b'[SHAPES]':
+            starts = []
+            pos = file.find(b'shape_id ', body_start, stop)
+            while pos != -1:
+                starts.append(pos)
+                pos = file.find(b'\nshape_id ', pos, stop)
+                pos = pos if pos == -1 else pos + 1
+            for shape_start, shape_stop in zip(starts, [*starts[1:], stop]):
+                shape_id = int(file[shape_start : file.find(b'\n', shape_start, shape_stop)].split()[1])
+                shapes.append((shape_id, shape_start, shape_stop))
+        else:
+            library_spans.append((start, stop))
+
+    return {
+        'blocks': blocks,
+        'shapes': np.array(shapes, dtype=np.int64).reshape(-1, 3),
+        'library_spans': np.array(library_spans, dtype=np.int64).reshape(-1, 2),
+    }
+
+
+def _find_sections(file: mmap.mmap) -> List[Tuple[bytes, int, int, int]]:
+    """
+    Returns the name, start offset, body start offset and end offset of each section of a sequence file. Text before
+    the first section (e.g. the header comments) is returned as a section with an empty name.
+    """
+    # Section headers are the only lines starting with '['
+    headers = [0] if file[:1] == b'[' else []
+    pos = file.find(b'\n[')
+    while pos != -1:
+        headers.append(pos + 1)
+        pos = file.find(b'\n[', pos + 1)
+    bounds = [*headers, len(file)]
+
+    sections = [(b'', 0, 0, bounds[0])]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        header_end = file.find(b'\n', start, stop)
+        header_end = stop if header_end == -1 else header_end + 1
+        sections.append((file[start:header_end].strip(), start, header_end, stop))
+    return sections
+
+
+def _block_rows_end(file: mmap.mmap, start: int, stop: int) -> int:
+    # Block rows end at the first empty line or comment
+    return min(_find(file, b'\n\n', start, stop), _find(file, b'\n#', start, stop))
+
+
+def _find(file: mmap.mmap, sub: bytes, start: int, stop: int) -> int:
+    pos = file.find(sub, start, stop)
+    return stop if pos == -1 else pos
+
+
+def _load_index(index_path: Path, stat) -> Union[Dict[str, np.ndarray], None]:
+    try:
+        arrays = _load_arrays(index_path, mmap=True)
+        meta = json.loads(str(arrays.pop('meta')))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    if meta != _index_meta(stat):
+        return None
+    return arrays
+
+
+def _save_index(index_path: Path, index: Dict[str, np.ndarray], stat) -> None:
+    try:
+        with open(index_path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(_index_meta(stat))), **index)
+    except OSError:
+        # The index is only a cache, e.g. the directory of the sequence file may be read-only
+        pass
+
+
+def _index_meta(stat) -> Dict[str, int]:
+    return {'format_version': INDEX_FORMAT_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
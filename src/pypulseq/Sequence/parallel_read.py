@@ -0,0 +1,159 @@
+import io
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from pypulseq.event_lib import EventLibrary
+from pypulseq.Sequence.compression import detect_compression
+from pypulseq.Sequence.lazy_seq import _block_rows_end, _find_sections
+from pypulseq.Sequence.read_seq import read
+
+
+def read_parallel(
+    self,
+    path: Union[str, Path],
+    detect_rf_use: Union[bool, None] = None,
+    remove_duplicates: bool = True,
+    num_processes: Union[int, None] = None,
+) -> None:
+    """
+    Load a sequence from file, parsing the `[BLOCKS]` and `[SHAPES]` sections in parallel.
+
+    The section offsets are found in a single pass over the memory-mapped file. The `[BLOCKS]` and `[SHAPES]`
+    sections are then split into chunks at line and shape boundaries, which are parsed with NumPy in a process pool.
+    The workers map the file themselves, so only the parsed arrays are sent back. Meanwhile, the event libraries are
+    parsed by `read()`. The result is the same as that of `read()`.
+
+    Files with a format version below 1.5.0 are converted while reading, which needs all blocks and shapes, so they
+    are read with `read()`, like compressed files.
+
+    See also `pypulseq.Sequence.read_seq.read()`.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of sequence file to be read.
+    detect_rf_use : bool, default=None
+        See `pypulseq.Sequence.read_seq.read()`.
+    remove_duplicates : bool, default=True
+        Remove duplicate events from the sequence after reading.
+    num_processes : int, default=None
+        Number of worker processes. With 1, the sections are parsed in the calling process, which is still faster
+        than `read()` for large files. The default is the number of CPUs.
+    """
+    path = Path(path)
+    if detect_compression(path) is not None:
+        read(self, path=path, detect_rf_use=detect_rf_use, remove_duplicates=remove_duplicates)
+        return
+
+    if num_processes is None:
+        num_processes = os.cpu_count() or 1
+
+    library_spans = []
+    block_chunks = []
+    shape_chunks = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file:
+        version = re.search(rb'\[VERSION\]\s+major\s+(\d+)\s+minor\s+(\d+)', file)
+        is_supported = version is not None and (int(version[1]), int(version[2])) >= (1, 5)
+        if is_supported:
+            for section, start, body_start, stop in _find_sections(file):
+                if section == b'[BLOCKS]':
+                    block_rows_end = _block_rows_end(file, body_start, stop)
+                    block_chunks = _split(file, body_start, block_rows_end, b'\n', num_processes)
+                elif section == b'[SHAPES]':
+                    # Smaller chunks than processes balance the load of shapes with very different lengths
+                    shape_chunks = _split(file, body_start, stop, b'\nshape_id ', 4 * num_processes)
+                else:
+                    library_spans.append((start, stop))
+            library_text = b''.join(file[start:stop] for start, stop in library_spans).decode()
+
+    if not is_supported:
+        read(self, path=path, detect_rf_use=detect_rf_use, remove_duplicates=remove_duplicates)
+        return
+
+    if num_processes > 1:
+        with ProcessPoolExecutor(max_workers=num_processes) as pool:
+            block_jobs = [pool.submit(_parse_blocks, path, start, stop) for start, stop in block_chunks]
+            shape_jobs = [pool.submit(_parse_shapes, path, start, stop) for start, stop in shape_chunks]
+
+            # Parse the event libraries while the workers parse the blocks and shapes
+            read(self, io.StringIO(library_text), detect_rf_use=detect_rf_use, remove_duplicates=False)
+
+            blocks = [job.result() for job in block_jobs]
+            shapes = [job.result() for job in shape_jobs]
+    else:
+        # Vectorized parsing in the calling process
+        read(self, io.StringIO(library_text), detect_rf_use=detect_rf_use, remove_duplicates=False)
+        blocks = [_parse_blocks(path, start, stop) for start, stop in block_chunks]
+        shapes = [_parse_shapes(path, start, stop) for start, stop in shape_chunks]
+
+    blocks = np.concatenate([np.zeros((0, 8), dtype=np.int64), *blocks])
+
+    block_ids = blocks[:, 0].tolist()
+    events = blocks[:, 1:].copy()
+    events[:, 0] = 0  # The duration column holds the (unused) delay ID in the event array
+    self.block_events = dict(zip(block_ids, events))
+    self.block_durations = dict(zip(block_ids, blocks[:, 1] * self.block_duration_raster))
+
+    self.shape_library = EventLibrary(numpy_data=True)
+    for shape_ids, lengths, values in shapes:
+        for shape_id, data in zip(shape_ids.tolist(), np.split(values, np.cumsum(lengths)[:-1])):
+            self.shape_library.insert(key_id=shape_id, new_data=data)
+
+    if remove_duplicates:
+        self.remove_duplicates(in_place=True)
+
+
+def _split(file: mmap.mmap, start: int, stop: int, separator: bytes, num_chunks: int) -> List[Tuple[int, int]]:
+    """Splits `file[start:stop]` into up to `num_chunks` spans of similar size, each starting after a `separator`."""
+    bounds = [start]
+    for target in np.linspace(start, stop, num_chunks + 1)[1:-1].astype(int).tolist():
+        if target <= bounds[-1]:
+            continue
+        pos = file.find(separator, target, stop)
+        if pos == -1:
+            break
+        bounds.append(pos + 1)
+    bounds.append(stop)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if a < b]
+
+
+def _read_span(path: Path, start: int, stop: int) -> bytes:
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file:
+        text = file[start:stop]
+    if b'#' in text:
+        text = b'\n'.join(line for line in text.split(b'\n') if not line.lstrip().startswith(b'#'))
+    return text
+
+
+def _parse_blocks(path: Path, start: int, stop: int) -> np.ndarray:
+    """Parses a chunk of `[BLOCKS]` rows into an array of shape (n, 8)."""
+    blocks = np.fromstring(_read_span(path, start, stop), dtype=np.int64, sep=' ')
+    if blocks.size % 8 != 0:
+        raise ValueError('Unexpected number of entries in [BLOCKS] section')
+    return blocks.reshape(-1, 8)
+
+
+def _parse_shapes(path: Path, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parses a chunk of `[SHAPES]` entries. The shapes are returned as their IDs, the lengths of their data
+    (`num_samples` followed by the samples) and the concatenated data, to keep the transfer to the main process small.
+    """
+    shape_ids = []
+    lengths = []
+    values = []
+    for entry in _read_span(path, start, stop).split(b'shape_id ')[1:]:
+        lines = entry.split(b'\n', 2)
+        num_samples = int(lines[1].split()[1])
+        samples = np.fromstring(lines[2], sep=' ') if len(lines) > 2 else np.zeros(0)
+        shape_ids.append(int(lines[0]))
+        lengths.append(len(samples) + 1)
+        values.append([num_samples])
+        values.append(samples)
+    values = np.concatenate(values) if values else np.zeros(0)
+    return np.array(shape_ids, dtype=np.int64), np.array(lengths, dtype=np.int64), values
@@ -1,3 +1,4 @@
+import io
 import re
 import warnings
 from types import SimpleNamespace
@@ -10,6 +11,7 @@
 from pypulseq.compress_shape import compress_shape
 from pypulseq.decompress_shape import decompress_shape
 from pypulseq.event_lib import EventLibrary
+from pypulseq.Sequence.compression import open_seq_file
 from pypulseq.supported_labels_rf_use import get_supported_labels
 
 
@@ -21,8 +23,9 @@ def read(self, path: str, detect_rf_use: Union[bool, None] = None, remove_duplic
 
     Parameters
     ----------
-    path : Path
-        Path of sequence file to be read.
+    path : Path or file object
+        Path of sequence file to be read (optionally compressed with gzip or zstd), or an open text stream of its
+        contents.
     detect_rf_use : bool, default=None
         Boolean flag to let the function infer the currently missing flags concerning the intended use of the RF pulses
         (excitation, refocusing, etc). These are important for the k-space trajectory calculation.
@@ -39,10 +42,14 @@ def read(self, path: str, detect_rf_use: Union[bool, None] = None, remove_duplic
     ValueError
         If unexpected sections are encountered when loading a sequence file.
     """
-    try:
-        input_file = open(path, 'r')
-    except FileNotFoundError as e:
-        raise FileNotFoundError(e) from e
+    if isinstance(path, io.TextIOBase):
+        input_file = path
+    else:
+        try:
+            # Compressed files are detected by their first bytes and decompressed while reading
+            input_file = open_seq_file(path)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(e) from e
 
     # Event libraries
     self.adc_library = EventLibrary()
@@ -52,6 +59,7 @@ def read(self, path: str, detect_rf_use: Union[bool, None] = None, remove_duplic
     self.rf_library = EventLibrary()
     self.shape_library = EventLibrary()
     self.trigger_library = EventLibrary()
+    self.rotation_library = EventLibrary()
 
     # Raster times
     self.grad_raster_time = self.system.grad_raster_time
@@ -214,6 +222,10 @@ def l2(s):
                     return get_supported_labels().index(s) + 1
 
                 self.label_inc_library = __read_and_parse_events(input_file, l1, l2)
+            elif section[:19] == 'extension ROTATIONS':
+                extension_id = int(section[19:])
+                self.set_extension_string_ID('ROTATIONS', extension_id)
+                self.rotation_library = __read_events(input_file, (1, 1, 1, 1), event_library=self.rotation_library)
             elif section[:16] == 'extension DELAYS':
                 extension_id = int(section[16:])
                 self.set_extension_string_ID('DELAYS', extension_id)
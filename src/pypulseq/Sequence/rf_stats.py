@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from pypulseq.calc_rf_center import calc_rf_center
+
+
+def _shape_stats(self, mag_id: int, phase_id: int, time_id: int) -> SimpleNamespace:
+    """
+    Return the (cached) RF statistics of the unit amplitude pulse defined by the given shape IDs.
+
+    Cache entries hold references to the shape data they were computed from and are recomputed if the shape library
+    entries have been replaced (e.g. by `Sequence.read()` or `Sequence.remove_duplicates()`).
+    """
+    key = (mag_id, phase_id, time_id)
+    shapes = tuple(self.shape_library.data[i] if i > 0 else None for i in key)
+
+    cached = self.rf_stats_cache.get(key)
+    if cached is not None and all(a is b for a, b in zip(cached.shapes, shapes)):
+        return cached
+
+    rf = self.rf_from_lib_data((1, *key, 0, 0, 0, 0, 0, 0))
+    power = np.abs(rf.signal) ** 2
+    if time_id == 0:  # Default time raster: one sample per raster interval
+        energy = np.sum(power) * self.rf_raster_time
+    else:
+        energy = np.sum(0.5 * (power[1:] + power[:-1]) * np.diff(rf.t))
+
+    stats = SimpleNamespace(
+        shapes=shapes,
+        t=rf.t,
+        energy=float(energy),
+        integral=complex(np.sum(rf.signal[:-1] * (rf.t[1:] - rf.t[:-1]))),
+        peak=float(np.max(np.abs(rf.signal))) if len(rf.signal) > 0 else 0.0,
+        duration=rf.shape_dur,
+    )
+    self.rf_stats_cache[key] = stats
+    return stats
+
+
+def get_rf_stats(self, rf_id: int) -> SimpleNamespace:
+    """
+    Return derived quantities of the RF library entry `rf_id`.
+
+    The shape-dependent quantities are computed once per unique combination of magnitude, phase and time shapes and
+    scaled with the amplitude of the library entry, so they are always consistent with the current library data.
+
+    Parameters
+    ----------
+    rf_id : int
+        RF library ID.
+
+    Returns
+    -------
+    stats : SimpleNamespace
+        With the fields
+            - energy : integral of |B1|^2 over the pulse (Hz^2*s)
+            - integral : integral of B1 over the pulse (complex, in Hz*s = turns)
+            - peak : peak |B1| (Hz)
+            - center : time of the pulse center (s), see `calc_rf_center()`
+            - id_center : index of the pulse center in the pulse envelope
+            - duration : shape duration of the pulse (s)
+    """
+    lib_data = self.rf_library.data[rf_id]
+    amplitude = lib_data[0]
+    shape_stats = _shape_stats(self, int(lib_data[1]), int(lib_data[2]), int(lib_data[3]))
+
+    time_center, id_center = calc_rf_center(SimpleNamespace(center=lib_data[4], t=shape_stats.t))
+
+    return SimpleNamespace(
+        energy=shape_stats.energy * amplitude**2,
+        integral=shape_stats.integral * amplitude,
+        peak=shape_stats.peak * abs(amplitude),
+        center=time_center,
+        id_center=id_center,
+        duration=shape_stats.duration,
+    )
+
+
+def rf_stats(self) -> SimpleNamespace:
+    """
+    Tabulate the derived quantities of all RF library entries, together with the number of blocks using each entry,
+    and compute the sequence-wide B1rms and RF duty cycle from them.
+
+    Returns
+    -------
+    table : SimpleNamespace
+        With the fields
+            - id : RF library IDs
+            - use : RF use character per ID ('e', 'r', 'i', 's', 'p' or 'u')
+            - count : number of blocks using each ID
+            - energy, integral, peak, center, duration : see `Sequence.get_rf_stats()`
+            - flip_angle : flip angle (deg)
+            - b1rms : B1 root mean square over the whole sequence (Hz)
+            - duty_cycle : fraction of the sequence duration with RF pulses
+    """
+    ids = np.array(sorted(self.rf_library.data), dtype=np.int64)
+    stats = [get_rf_stats(self, rf_id) for rf_id in ids]
+
+    rf_ids = np.array([event[1] for event in self.block_events.values()], dtype=np.int64)
+    count = np.bincount(rf_ids, minlength=ids.max() + 1 if len(ids) > 0 else 1)[ids]
+
+    energy = np.array([s.energy for s in stats], dtype=float)
+    integral = np.array([s.integral for s in stats], dtype=complex)
+    duration = np.array([s.duration for s in stats], dtype=float)
+
+    total_duration = sum(self.block_durations.values())
+    if total_duration > 0:
+        b1rms = float(np.sqrt(np.dot(count, energy) / total_duration))
+        duty_cycle = float(np.dot(count, duration) / total_duration)
+    else:
+        b1rms = 0.0
+        duty_cycle = 0.0
+
+    return SimpleNamespace(
+        id=ids,
+        use=[self.rf_library.type.get(rf_id, 'u') for rf_id in ids],
+        count=count,
+        energy=energy,
+        integral=integral,
+        peak=np.array([s.peak for s in stats], dtype=float),
+        center=np.array([s.center for s in stats], dtype=float),
+        duration=duration,
+        flip_angle=np.abs(integral) * 360,
+        b1rms=b1rms,
+        duty_cycle=duty_cycle,
+    )
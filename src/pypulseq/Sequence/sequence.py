@@ -1,8 +1,8 @@
 import math
 from collections import OrderedDict
-from copy import deepcopy
+from copy import copy, deepcopy
 from types import SimpleNamespace
-from typing import Any, List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
 from warnings import warn
 
 try:
@@ -13,7 +13,6 @@
     Self = TypeVar('Self', bound='Sequence')
 
 import numpy as np
-from scipy.interpolate import PPoly
 
 from pypulseq import __version__, eps
 from pypulseq.calc_rf_center import calc_rf_center
@@ -22,19 +21,29 @@
 from pypulseq.decompress_shape import decompress_shape
 from pypulseq.event_lib import EventLibrary
 from pypulseq.opts import Opts
+from pypulseq.rotated_gradient_table import RotatedGradientTable
 from pypulseq.Sequence import block
-from pypulseq.Sequence.calc_grad_spectrum import calculate_gradient_spectrum
-from pypulseq.Sequence.calc_pns import calc_pns
+from pypulseq.Sequence.binary_seq import read_binary, structural_hash, write_binary
 from pypulseq.Sequence.ext_test_report import ext_test_report
 from pypulseq.Sequence.install import detect_scanner
-from pypulseq.Sequence.read_seq import read
+from pypulseq.Sequence.kspace_plan import KSpacePlan
+from pypulseq.Sequence.lazy_seq import read_lazy
+from pypulseq.Sequence.rf_stats import get_rf_stats, rf_stats
+from pypulseq.Sequence.sharding import map_shards, shard_blocks
+from pypulseq.Sequence.timeline import block_waveforms, join_pieces, select_blocks
+from pypulseq.Sequence.write_seq import signature as signature_seq
 from pypulseq.Sequence.write_seq import write as write_seq
 from pypulseq.Sequence.write_seq import write_v141 as write_seq_v141
-from pypulseq.utils.cumsum import cumsum
-from pypulseq.utils.paper_plot import paper_plot as ext_paper_plot
-from pypulseq.utils.seq_plot import SeqPlot
+from pypulseq.utils.read_cache import cached_read
 from pypulseq.utils.tracing import format_trace, trace, trace_enabled
 
+# Plotting, spectrum, PNS and PPoly dependencies (matplotlib and scipy) are imported on first use to keep
+# `import pypulseq` fast for headless sequence generation
+if TYPE_CHECKING:
+    from scipy.interpolate import PPoly
+
+    from pypulseq.utils.seq_plot import SeqPlot
+
 major, minor, revision = __version__.split('.')[:3]
 
 
@@ -68,6 +77,7 @@ def __init__(self, system: Union[Opts, None] = None, use_block_cache: bool = Tru
         self.shape_library = EventLibrary(numpy_data=True)
         self.trigger_library = EventLibrary()
         self.soft_delay_library = EventLibrary()
+        self.rotation_library = EventLibrary()
 
         # =========
         # OTHER
@@ -76,8 +86,10 @@ def __init__(self, system: Union[Opts, None] = None, use_block_cache: bool = Tru
 
         self.block_events = OrderedDict()
         self.block_trace = OrderedDict()
+        self.block_writer = None  # SequenceWriter that blocks are streamed to, see `pypulseq.SequenceWriter`
         self.use_block_cache = use_block_cache
         self.block_cache = {}
+        self.rf_stats_cache = {}
         self.next_free_block_ID = 1
         self.definitions = {}
 
@@ -198,6 +210,9 @@ def add_block(self, *args: SimpleNamespace) -> None:
         block.set_block(self, self.next_free_block_ID, *args)
         self.next_free_block_ID += 1
 
+        if self.block_writer is not None:
+            self.block_writer.spool()
+
     def calculate_gradient_spectrum(
         self,
         max_frequency: float = 2000.0,
@@ -208,6 +223,10 @@ def calculate_gradient_spectrum(
         combine_mode: str = 'max',
         use_derivative: bool = False,
         acoustic_resonances: Union[List[dict], None] = None,
+        streaming: bool = False,
+        num_threads: Union[int, None] = None,
+        chunk_windows: int = 256,
+        num_processes: Union[int, None] = None,
     ) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
         """
         Calculates the gradient spectrum of the sequence. Returns a spectrogram
@@ -245,6 +264,20 @@ def calculate_gradient_spectrum(
         acoustic_resonances : List[dict], optional
             Acoustic resonances as a list of dictionaries with 'frequency' and
             'bandwidth' elements. Only used when plot==True. The default is [].
+        streaming : bool, optional
+            Calculate the combined spectra in chunks of windows generated directly
+            from the sequence blocks, without sampling the full waveforms or holding
+            the full spectrograms in memory. Only supported for combine modes 'max',
+            'mean' and 'rss'. The default is False.
+        num_threads : int, optional
+            Number of threads used to calculate the spectra of the gradient channels
+            in parallel in streaming mode. The default is None (no threads).
+        chunk_windows : int, optional
+            Number of windows processed at once in streaming mode. The default is 256.
+        num_processes : int, optional
+            Number of worker processes. If larger than 1, the gradient waveforms
+            and the spectrograms are calculated in time-contiguous shards in
+            parallel. Not used in streaming mode. The default is None (no processes).
 
         Returns
         -------
@@ -261,6 +294,8 @@ def calculate_gradient_spectrum(
         if acoustic_resonances is None:
             acoustic_resonances = []
 
+        from pypulseq.Sequence.calc_grad_spectrum import calculate_gradient_spectrum
+
         return calculate_gradient_spectrum(
             self,
             max_frequency=max_frequency,
@@ -271,6 +306,10 @@ def calculate_gradient_spectrum(
             combine_mode=combine_mode,
             use_derivative=use_derivative,
             acoustic_resonances=acoustic_resonances,
+            streaming=streaming,
+            num_threads=num_threads,
+            chunk_windows=chunk_windows,
+            num_processes=num_processes,
         )
 
     def calculate_kspace(
@@ -462,11 +501,31 @@ def calculate_kspacePP(
         )
         return self.calculate_kspace(trajectory_delay, gradient_offset)
 
+    def calculate_kspace_plan(self) -> KSpacePlan:
+        """
+        Precompute a reusable k-space trajectory plan of the entire pulse sequence. The plan evaluates the k-space
+        trajectory at the ADC sampling points for new trajectory delays and gradient offsets without recomputing the
+        trajectory from scratch, e.g. when calibrating gradient delays.
+
+        Examples
+        --------
+        >>> plan = seq.calculate_kspace_plan()
+        >>> k_traj_adc = plan.evaluate(trajectory_delay=[1e-6, 2e-6, 0])
+        >>> k_grid = plan.evaluate_grid(np.linspace(-5e-6, 5e-6, 100))
+
+        Returns
+        -------
+        plan : KSpacePlan
+            K-space trajectory plan. The plan is not updated when the sequence is modified afterwards.
+        """
+        return KSpacePlan(self)
+
     def calculate_pns(
         self,
         hardware: SimpleNamespace,
         time_range: Union[List[float], None] = None,
         do_plots: bool = True,
+        num_processes: Union[int, None] = None,
     ) -> Tuple[bool, np.ndarray, np.ndarray, np.ndarray]:
         """
         Calculate PNS using safe model implementation by Szczepankiewicz and Witzel
@@ -485,6 +544,10 @@ def calculate_pns(
             can be acquired from)
         do_plots : bool, optional
             Plot the results from the PNS calculations. The default is True.
+        num_processes : int, optional
+            Number of worker processes. If larger than 1, the gradient waveforms and the PNS model are calculated in
+            time-contiguous shards in parallel, see `pypulseq.Sequence.calc_pns.calc_pns()`. The default is None (no
+            processes).
 
         Returns
         -------
@@ -497,12 +560,15 @@ def calculate_pns(
         t_pns : np.array [N]
             Time axis for the pns_norm and pns_components arrays
         """
-        return calc_pns(self, hardware, time_range=time_range, do_plots=do_plots)
+        from pypulseq.Sequence.calc_pns import calc_pns
+
+        return calc_pns(self, hardware, time_range=time_range, do_plots=do_plots, num_processes=num_processes)
 
     def check_timing(
         self,
         print_errors: bool = False,
         max_errors: Union[int, None] = None,
+        num_processes: Union[int, None] = None,
     ) -> Tuple[bool, List[SimpleNamespace]]:
         """
         Checks timing of all blocks and objects in the sequence optionally returns the detailed error log.
@@ -514,6 +580,9 @@ def check_timing(
         max_errors : int or None, optional
             Maximum number of errors to report when print_errors is True.
             If None, all errors are reported. Default is None.
+        num_processes : int or None, optional
+            Number of worker processes. If larger than 1, the blocks are split into time-contiguous shards that are
+            checked in parallel. Default is None (no processes).
 
         Returns
         -------
@@ -522,7 +591,7 @@ def check_timing(
         error_report : List[SimpleNamespace]
             Error report in case of timing errors.
         """
-        is_ok, error_report = ext_check_timing(self)
+        is_ok, error_report = ext_check_timing(self, num_processes=num_processes)
 
         if not is_ok and print_errors:
             if max_errors is None:
@@ -798,7 +867,8 @@ def get_gradients(
         trajectory_delay: Union[float, List[float], np.ndarray] = 0,
         gradient_offset: Union[float, List[float], np.ndarray] = 0,
         time_range: Union[List[float], None] = None,
-    ) -> List[PPoly]:
+        num_processes: Union[int, None] = None,
+    ) -> List['PPoly']:
         """
         Get all gradient waveforms of the sequence in a piecewise-polynomial
         format (scipy PPoly). Gradient values can be accessed easily at one or
@@ -818,6 +888,8 @@ def get_gradients(
             If gradient_offset is a single value, this value will be used for all gradient channels.
             If gradient_offset is a list or array, it is expected to have the same length as the number of gradient
             channels and the first element is applied to the first gradient channel, the second to the second, and so on.
+        num_processes : int, default=None
+            Number of worker processes used to decompress the waveforms, see `waveforms()`.
 
         Returns
         -------
@@ -825,12 +897,14 @@ def get_gradients(
             List of gradient waveforms for each of the gradient channels,
             expressed as scipy PPoly objects.
         """
+        from scipy.interpolate import PPoly
+
         if np.any(np.abs(trajectory_delay) > 100e-6):
             raise Warning(f'Trajectory delay of {trajectory_delay * 1e6} us is suspiciously high')
 
         total_duration = sum(self.block_durations.values())
 
-        gw_data = self.waveforms(time_range=time_range)
+        gw_data = self.waveforms(time_range=time_range, num_processes=num_processes)
         ng = len(gw_data)
 
         # Gradient delay handling
@@ -878,6 +952,27 @@ def get_gradients(
             gw_pp.append(PPoly(np.stack((np.diff(gw[1]) / np.diff(gw[0]), gw[1][:-1])), gw[0], extrapolate=True))
         return gw_pp
 
+    def get_rf_stats(self, rf_id: int) -> SimpleNamespace:
+        """
+        Return derived quantities (energy, integral, peak amplitude, center and duration) of the RF library entry
+        `rf_id`. The shape-dependent quantities are computed once when the RF event is registered and cached.
+
+        See Also
+        --------
+        - `pypulseq.Sequence.sequence.Sequence.rf_stats()`
+
+        Parameters
+        ----------
+        rf_id : int
+            RF library ID.
+
+        Returns
+        -------
+        stats : SimpleNamespace
+            See `pypulseq.Sequence.rf_stats.get_rf_stats()`.
+        """
+        return get_rf_stats(self, rf_id)
+
     def install(self, target: Union[str, None] = None, clear_cache: bool = False, **kwargs: Any) -> None:
         """Install a sequence to a target scanner.
 
@@ -1042,6 +1137,8 @@ def paper_plot(
             Determines how to plot RF waveforms (magnitude, real or imaginary part).
 
         """
+        from pypulseq.utils.paper_plot import paper_plot as ext_paper_plot
+
         ext_paper_plot(self, time_range, line_width, axes_color, rf_color, gx_color, gy_color, gz_color, rf_plot)
 
     def plot(
@@ -1054,10 +1151,10 @@ def plot(
         grad_disp: str = 'kHz/m',
         plot_now: bool = True,
         clear: bool = True,
-        overlay: SeqPlot = None,
+        overlay: Union['SeqPlot', None] = None,
         stacked: bool = False,
         show_guides: bool = False,
-    ) -> SeqPlot:
+    ) -> 'SeqPlot':
         """
         Plot `Sequence`.
 
@@ -1096,6 +1193,8 @@ def plot(
         SeqPlot
             SeqPlot handle.
         """
+        from pypulseq.utils.seq_plot import SeqPlot
+
         return SeqPlot(
             self,
             label,
@@ -1111,7 +1210,14 @@ def plot(
             show_guides,
         )
 
-    def read(self, file_path: str, detect_rf_use: bool = False, remove_duplicates: bool = True) -> None:
+    def read(
+        self,
+        file_path: str,
+        detect_rf_use: bool = False,
+        remove_duplicates: bool = True,
+        lazy: bool = False,
+        num_processes: Union[int, None] = None,
+    ) -> None:
         """
         Read `.seq` file from `file_path`.
 
@@ -1122,15 +1228,44 @@ def read(self, file_path: str, detect_rf_use: bool = False, remove_duplicates: b
             Path to `.seq` file to be read.
         remove_duplicates : bool, default=True
             Remove duplicate events from the sequence after reading.
+        lazy : bool, default=False
+            Read the sequence for read-only analysis: blocks and shapes are only parsed when they are accessed, and
+            duplicates are not removed. See `pypulseq.Sequence.lazy_seq.read_lazy()`.
+        num_processes : int, default=None
+            If given, parse the `[BLOCKS]` and `[SHAPES]` sections with NumPy, in parallel in this number of processes
+            (in the calling process with 1). See `pypulseq.Sequence.parallel_read.read_parallel()`.
         """
         if self.use_block_cache:
             self.block_cache.clear()
 
-        read(self, path=file_path, detect_rf_use=detect_rf_use, remove_duplicates=remove_duplicates)
+        if lazy:
+            read_lazy(self, path=file_path, detect_rf_use=detect_rf_use)
+        else:
+            # Reads the file directly if the read cache is disabled
+            cached_read(
+                self,
+                path=file_path,
+                detect_rf_use=detect_rf_use,
+                remove_duplicates=remove_duplicates,
+                num_processes=num_processes,
+            )
 
         # Initialize next free block ID
         self.next_free_block_ID = (max(self.block_events) + 1) if self.block_events else 1
 
+    def read_binary(self, file_path: str, mmap: bool = False) -> None:
+        """
+        Read binary `.seqb` file from `file_path`, as written by `write_binary()`.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to `.seqb` file to be read.
+        mmap : bool, default=False
+            Memory-map the stored arrays read-only instead of loading them into memory.
+        """
+        read_binary(self, file_name=file_path, mmap=mmap)
+
     def register_adc_event(self, event: EventLibrary) -> int:
         return block.register_adc_event(self, event)
 
@@ -1143,6 +1278,9 @@ def register_label_event(self, event: SimpleNamespace) -> int:
     def register_rf_event(self, event: SimpleNamespace) -> Tuple[int, List[int]]:
         return block.register_rf_event(self, event)
 
+    def register_rotation_event(self, event: SimpleNamespace) -> int:
+        return block.register_rotation_event(self, event)
+
     def register_soft_delay_event(self, event: SimpleNamespace) -> int:
         return block.register_soft_delay_event(self, event)
 
@@ -1172,46 +1310,103 @@ def remove_duplicates(self, in_place: bool = False) -> 'Sequence':
             seq_copy = deepcopy(self)
             self.block_cache = tmp
 
+        mappings = seq_copy._remove_library_duplicates()
+
+        # Remap event IDs
+        for events in seq_copy.block_events.values():
+            for idx, mapping in mappings.items():
+                events[idx] = mapping[events[idx]]
+
+        return seq_copy
+
+    def _remove_library_duplicates(self) -> Dict[int, Dict[int, int]]:
+        """
+        Removes duplicate events from the shape and event libraries of this sequence in place, without remapping the
+        event IDs of the blocks.
+
+        Returns
+        -------
+        mappings : dict
+            Mappings of old to new event IDs, by index of the event ID in the block event arrays.
+        """
         # Find duplicate in shape library
-        seq_copy.shape_library, mapping = seq_copy.shape_library.remove_duplicates(9)
+        self.shape_library, mapping = self.shape_library.remove_duplicates(9)
 
         # Remap shape IDs of arbitrary gradient events
-        for grad_id in seq_copy.grad_library.data:
-            if seq_copy.grad_library.type[grad_id] == 'g':
-                data = seq_copy.grad_library.data[grad_id]
+        for grad_id in self.grad_library.data:
+            if self.grad_library.type[grad_id] == 'g':
+                data = self.grad_library.data[grad_id]
                 new_data = (*data[0:3], mapping[data[3]], mapping[data[4]], data[5])
                 if data != new_data:
-                    seq_copy.grad_library.update(grad_id, None, new_data)
+                    self.grad_library.update(grad_id, None, new_data)
 
         # Remap shape IDs of RF events
-        for rf_id in seq_copy.rf_library.data:
-            data = seq_copy.rf_library.data[rf_id]
+        for rf_id in self.rf_library.data:
+            data = self.rf_library.data[rf_id]
             new_data = (data[0], mapping[data[1]], mapping[data[2]], mapping[data[3]], *data[4:])
             if data != new_data:
-                seq_copy.rf_library.update(rf_id, None, new_data)
+                self.rf_library.update(rf_id, None, new_data)
 
-        # Filter duplicates in gradient library
-        seq_copy.grad_library, mapping = seq_copy.grad_library.remove_duplicates((6, -6, -6, -6, -6, -6))
+        # Filter duplicates in gradient, RF and ADC libraries
+        self.grad_library, grad_mapping = self.grad_library.remove_duplicates((6, -6, -6, -6, -6, -6))
+        self.rf_library, rf_mapping = self.rf_library.remove_duplicates((6, 0, 0, 0, 6, 6, 6, 6, 6, 6))
+        self.adc_library, adc_mapping = self.adc_library.remove_duplicates((0, -9, -6, 6, 6, 6, 6, 6, 6))
 
-        # Remap gradient event IDs
-        for block_id in seq_copy.block_events:
-            seq_copy.block_events[block_id][2] = mapping[seq_copy.block_events[block_id][2]]
-            seq_copy.block_events[block_id][3] = mapping[seq_copy.block_events[block_id][3]]
-            seq_copy.block_events[block_id][4] = mapping[seq_copy.block_events[block_id][4]]
+        return {1: rf_mapping, 2: grad_mapping, 3: grad_mapping, 4: grad_mapping, 5: adc_mapping}
+
+    def materialize_rotations(self, in_place: bool = False) -> 'Sequence':
+        """
+        Replaces the gradients of all blocks with a rotation extension by the rotated gradients and removes the
+        rotation extensions, e.g. for writing files for interpreters that do not support rotations.
 
-        # Filter duplicates in RF library
-        seq_copy.rf_library, mapping = seq_copy.rf_library.remove_duplicates((6, 0, 0, 0, 6, 6, 6, 6, 6, 6))
+        Parameters
+        ----------
+        in_place : bool, optional
+            If true, modifies the current sequence. Otherwise, a copy is created. The default is False.
 
-        # Remap RF event IDs
-        for block_id in seq_copy.block_events:
-            seq_copy.block_events[block_id][1] = mapping[seq_copy.block_events[block_id][1]]
+        Returns
+        -------
+        seq_copy : Sequence
+            If `in_place`, returns self. Otherwise returns a copy of the sequence.
+        """
+        if in_place:
+            seq_copy = self
+        else:
+            # Avoid copying block_cache for performance
+            tmp = self.block_cache
+            self.block_cache = {}
+            seq_copy = deepcopy(self)
+            self.block_cache = tmp
 
-        # Filter duplicates in ADC library
-        seq_copy.adc_library, mapping = seq_copy.adc_library.remove_duplicates((0, -9, -6, 6, 6, 6, 6, 6, 6))
+        if len(seq_copy.rotation_library.data) == 0:
+            return seq_copy
 
-        # Remap ADC event IDs
         for block_id in seq_copy.block_events:
-            seq_copy.block_events[block_id][5] = mapping[seq_copy.block_events[block_id][5]]
+            block = seq_copy.get_block(block_id)
+            if block.rotation is None:
+                continue
+
+            grads = [g for g in (block.gx, block.gy, block.gz) if g is not None]
+            rotated = RotatedGradientTable(seq_copy, *grads, matrices=block.rotation.rot_matrix)[0] if grads else []
+            block.gx = block.gy = block.gz = block.rotation = None
+            for grad in rotated:
+                setattr(block, 'g' + grad.channel, grad)
+            seq_copy.set_block(block_id, block)
+            seq_copy.block_cache.pop(block_id, None)
+
+        # Keep only the extension entries that are still referenced by a block
+        used = set()
+        for event in seq_copy.block_events.values():
+            ext_id = event[6]
+            while ext_id != 0 and ext_id not in used:
+                used.add(ext_id)
+                ext_id = seq_copy.extensions_library.data[ext_id][2]
+
+        extensions_library = EventLibrary()
+        for ext_id in sorted(used):
+            extensions_library.insert(ext_id, seq_copy.extensions_library.data[ext_id])
+        seq_copy.extensions_library = extensions_library
+        seq_copy.rotation_library = EventLibrary()
 
         return seq_copy
 
@@ -1279,6 +1474,19 @@ def rf_from_lib_data(self, lib_data: list, use: str = '') -> SimpleNamespace:
 
         return rf
 
+    def rf_stats(self) -> SimpleNamespace:
+        """
+        Tabulate energy, integral, peak amplitude, center, duration and flip angle of all RF library entries together
+        with the number of blocks using them, and compute the sequence-wide B1rms and RF duty cycle without decoding the
+        blocks.
+
+        Returns
+        -------
+        table : SimpleNamespace
+            See `pypulseq.Sequence.rf_stats.rf_stats()`.
+        """
+        return rf_stats(self)
+
     def rf_times(
         self, time_range: Union[List[float], None] = None
     ) -> Tuple[List[float], np.ndarray, List[float], np.ndarray, np.ndarray]:
@@ -1428,6 +1636,39 @@ def set_extension_string_ID(self, extension_str: str, extension_id: int) -> None
         self.extension_string_idx.append(extension_str)
         assert len(self.extension_numeric_idx) == len(self.extension_string_idx)
 
+    def signature(self, remove_duplicates: bool = True, mode: str = 'md5') -> str:
+        """
+        Compute the signature of the sequence without writing a file.
+
+        Parameters
+        ----------
+        remove_duplicates : bool, default=True
+            Remove duplicate events before hashing, like `write()`. Only used in 'md5' mode.
+        mode : str, default='md5'
+            'md5' returns the MD5 hash that `write()` stores in the [SIGNATURE] section of the file, by streaming
+            the text of the file into the hash in memory. 'structural' returns a cheaper SHA-256 hash of the block
+            table, the libraries and the definitions in memory, see `pypulseq.Sequence.binary_seq.structural_hash()`.
+
+        Returns
+        -------
+        signature : str
+            Hash as hexadecimal string.
+
+        Raises
+        ------
+        ValueError
+            If `mode` is not supported.
+        """
+        if mode == 'structural':
+            return structural_hash(self)
+        if mode != 'md5':
+            raise ValueError(f"Unsupported signature mode '{mode}', expected 'md5' or 'structural'.")
+
+        # write() stores the total duration in the definitions
+        seq = copy(self)
+        seq.definitions = {**self.definitions, 'TotalDuration': sum(self.block_durations.values())}
+        return signature_seq(seq, remove_duplicates=remove_duplicates)
+
     def apply_soft_delay(self, **kwargs):
         """
         Apply soft delay values to modify block durations in the sequence.
@@ -1541,7 +1782,12 @@ def test_report(self) -> str:
         """
         return ext_test_report(self)
 
-    def waveforms(self, append_RF: bool = False, time_range: Union[List[float], None] = None) -> Tuple[np.ndarray]:
+    def waveforms(
+        self,
+        append_RF: bool = False,
+        time_range: Union[List[float], None] = None,
+        num_processes: Union[int, None] = None,
+    ) -> Tuple[np.ndarray]:
         """
         Decompress the entire gradient waveform. Returns gradient waveforms as a tuple of `np.ndarray` of
         `gradient_axes` (typically 3) dimensions. Each `np.ndarray` contains timepoints and the corresponding
@@ -1551,159 +1797,39 @@ def waveforms(self, append_RF: bool = False, time_range: Union[List[float], None
         ----------
         append_RF : bool, default=False
             Boolean flag to indicate if RF wave shapes are to be appended after the gradients.
+        num_processes : int, default=None
+            Number of worker processes. If larger than 1, the blocks are split into time-contiguous shards that are
+            decompressed in parallel and joined. The result is identical to the one of a single process.
 
         Returns
         -------
         wave_data : np.ndarray
         """
-        grad_channels = ['gx', 'gy', 'gz']
-
         # Collect shape pieces
-        if append_RF:
-            shape_channels = len(grad_channels) + 1  # Last 'channel' is RF
-        else:
-            shape_channels = len(grad_channels)
+        shape_channels = 4 if append_RF else 3  # Last 'channel' is RF
 
-        shape_pieces = [[] for _ in range(shape_channels)]
-        out_len = np.zeros(shape_channels)  # Last 'channel' is RF
-
-        curr_dur = 0
-        if time_range is None:
-            blocks = self.block_events
+        if num_processes is not None and num_processes > 1:
+            shards = shard_blocks(self, num_processes, time_range)
         else:
-            if len(time_range) != 2:
-                raise ValueError('Time range must be list of two elements')
-            if time_range[0] > time_range[1]:
-                raise ValueError('End time of time_range must be after begin time')
-
-            # Calculate end times of each block
-            bd = np.array(list(self.block_durations.values()))
-            t = np.cumsum(bd)
-            # Search block end times for start of time range
-            begin_block = np.searchsorted(t, time_range[0])
-            # Search block begin times for end of time range
-            end_block = np.searchsorted(t - bd, time_range[1], side='right')
-            blocks = list(self.block_durations.keys())[begin_block:end_block]
-            curr_dur = t[begin_block] - bd[begin_block]
-
-        for block_counter in blocks:
-            block = self.get_block(block_counter)
-
-            for j in range(len(grad_channels)):
-                grad = getattr(block, grad_channels[j])
-                if grad is not None:  # Gradients
-                    if grad.type == 'grad':
-                        # Check if we have an extended trapezoid or an arbitrary gradient on a regular raster
-                        tt_rast = grad.tt / self.grad_raster_time + 0.5
-                        if np.all(np.abs(tt_rast - np.arange(1, len(tt_rast) + 1)) < eps):  # Arbitrary gradient
-                            """
-                            Arbitrary gradient: restore & recompress shape - if we had a trapezoid converted to shape we
-                            have to find the "corners" and we can eliminate internal samples on the straight segments
-                            but first we have to restore samples on the edges of the gradient raster intervals for that
-                            we need the first sample.
-                            """
-
-                            # TODO: Implement restoreAdditionalShapeSamples
-                            #       https://github.com/pulseq/pulseq/blob/master/matlab/%2Bmr/restoreAdditionalShapeSamples.m
-
-                            out_len[j] += len(grad.tt) + 2
-                            shape_pieces[j].append(
-                                np.array(
-                                    [
-                                        curr_dur
-                                        + grad.delay
-                                        + np.concatenate(([0], grad.tt, [grad.tt[-1] + self.grad_raster_time / 2])),
-                                        np.concatenate(([grad.first], grad.waveform, [grad.last])),
-                                    ]
-                                )
-                            )
-                        else:  # Extended trapezoid
-                            out_len[j] += len(grad.tt)
-                            shape_pieces[j].append(
-                                np.array(
-                                    [
-                                        curr_dur + grad.delay + grad.tt,
-                                        grad.waveform,
-                                    ]
-                                )
-                            )
-                    else:
-                        if abs(grad.flat_time) > eps:
-                            out_len[j] += 4
-                            _temp = np.vstack(
-                                (
-                                    cumsum(
-                                        curr_dur + grad.delay,
-                                        grad.rise_time,
-                                        grad.flat_time,
-                                        grad.fall_time,
-                                    ),
-                                    grad.amplitude * np.array([0, 1, 1, 0]),
-                                )
-                            )
-                            shape_pieces[j].append(_temp)
-                        else:
-                            if abs(grad.rise_time) > eps and abs(grad.fall_time) > eps:
-                                out_len[j] += 3
-                                _temp = np.vstack(
-                                    (
-                                        cumsum(curr_dur + grad.delay, grad.rise_time, grad.fall_time),
-                                        grad.amplitude * np.array([0, 1, 0]),
-                                    )
-                                )
-                                shape_pieces[j].append(_temp)
-                            else:
-                                if abs(grad.amplitude) > eps:
-                                    print(
-                                        'Warning: "empty" gradient with non-zero magnitude detected in block {}'.format(
-                                            block_counter
-                                        )
-                                    )
-
-            if block.rf is not None:  # RF
-                rf = block.rf
-                full_freq_offset = rf.freq_offset + rf.freq_ppm * 1e-6 * self.system.gamma * self.system.B0
-                full_phase_offset = rf.phase_offset + rf.phase_ppm * 1e-6 * self.system.gamma * self.system.B0
-                if append_RF:
-                    rf_piece = np.array(
-                        [
-                            curr_dur + rf.delay + rf.t,
-                            rf.signal * np.exp(1j * (full_phase_offset + 2 * math.pi * full_freq_offset * rf.t)),
-                        ]
-                    )
-                    out_len[-1] += len(rf.t)
-
-                    if abs(rf.signal[0]) > 0:
-                        pre = np.array([[rf_piece[0, 0] - 0.1 * self.system.rf_raster_time], [0]])
-                        rf_piece = np.hstack((pre, rf_piece))
-                        out_len[-1] += pre.shape[1]
-
-                    if abs(rf.signal[-1]) > 0:
-                        post = np.array([[rf_piece[0, -1] + 0.1 * self.system.rf_raster_time], [0]])
-                        rf_piece = np.hstack((rf_piece, post))
-                        out_len[-1] += post.shape[1]
-
-                    shape_pieces[-1].append(rf_piece)
-
-            curr_dur += self.block_durations[block_counter]
+            shards = [select_blocks(self, time_range)]
+        results = map_shards(
+            block_waveforms, self, [(blocks, start, append_RF) for blocks, start in shards], num_processes
+        )
 
         # Collect wave data
         wave_data = []
 
         for j in range(shape_channels):
-            if shape_pieces[j] == []:
+            shape_pieces = [waveforms[j] for waveforms, _ in results if waveforms[j] is not None]
+            if shape_pieces == []:
                 wave_data.append(np.zeros((2, 0)))
                 continue
 
             # If the first element of the next shape has the same time as
             # the last element of the previous shape, drop the first
             # element of the next shape.
-            shape_pieces[j] = [shape_pieces[j][0]] + [
-                cur if prev[0, -1] + eps < cur[0, 0] else cur[:, 1:]
-                for prev, cur in zip(shape_pieces[j][:-1], shape_pieces[j][1:], strict=False)
-            ]
-
-            wave_data.append(np.concatenate(shape_pieces[j], axis=1))
+            end_times = [end_times[j] for _, end_times in results if end_times[j] is not None]
+            wave_data.append(join_pieces(shape_pieces, end_times))
 
             rftdiff = np.diff(wave_data[j][0])
             if np.any(rftdiff < eps):
@@ -1754,6 +1880,7 @@ def write(
         remove_duplicates: bool = True,
         check_timing: bool = True,
         v141_compat: bool = False,
+        compression: Union[str, None] = None,
     ) -> Union[str, None]:
         """
         Write the sequence data to the given filename using the open file format for MR sequences.
@@ -1770,6 +1897,11 @@ def write(
             Remove duplicate events from the sequence before writing
         v141_compat: bool, default=False
             Write the sequence in v1.4.1 compatible file format.
+        compression : str, default=None
+            Compress the file with 'gzip' or 'zstd' while writing, and append `.gz` or `.zst` to the file name.
+            `read()` detects compressed files automatically. The signature is the MD5 hash of the uncompressed text,
+            so it can be verified as usual after decompressing the file. zstd requires Python 3.14 or the
+            `zstandard` package.
 
         Returns
         -------
@@ -1809,9 +1941,9 @@ def write(
 
         # Write the sequence
         if v141_compat:
-            signature = write_seq_v141(self, name, create_signature, remove_duplicates)
+            signature = write_seq_v141(self, name, create_signature, remove_duplicates, compression)
         else:
-            signature = write_seq(self, name, create_signature, remove_duplicates)
+            signature = write_seq(self, name, create_signature, remove_duplicates, compression)
 
         # Return the sequence md5 signature if requested
         if signature is not None:
@@ -1821,3 +1953,17 @@ def write(
             return signature
         else:
             return None
+
+    def write_binary(self, name: str) -> None:
+        """
+        Write the sequence data to the given filename in the lossless binary `.seqb` format. In contrast to `write()`,
+        no values are rounded and no duplicates are removed, so `read_binary()` restores the sequence exactly.
+
+        See also `pypulseq.Sequence.binary_seq.write_binary()`.
+
+        Parameters
+        ----------
+        name : str
+            Filename of `.seqb` file to be written to disk.
+        """
+        write_binary(self, name)
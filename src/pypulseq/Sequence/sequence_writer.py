@@ -0,0 +1,167 @@
+import tempfile
+from copy import deepcopy
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Union
+
+import numpy as np
+
+from pypulseq.Sequence.compression import open_seq_file, seq_file_name
+from pypulseq.Sequence.write_seq import (
+    _block_duration,
+    _HashingWriter,
+    _write_blocks,
+    _write_header,
+    _write_libraries,
+    _write_signature,
+)
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+
+class SequenceWriter:
+    """
+    Context manager that streams the blocks of a sequence to a `.seq` file while the sequence is being built.
+
+    While the writer is open, each block added with `Sequence.add_block()` is moved from the sequence to a temporary
+    spool file as soon as the next block is added (the last block is kept for the gradient checks of `add_block()`).
+    Only the event and shape libraries are kept in memory, so the memory use is bounded by the size of the libraries
+    instead of the number of blocks. When the writer is closed, the `.seq` file is assembled from the definitions,
+    the spooled blocks, the libraries and the signature. It is identical to the file written by `Sequence.write()`,
+    but the timing is not checked.
+
+    After closing, the sequence only holds the definitions and libraries, the blocks are only stored in the file. If
+    an exception is raised inside the `with` block, no file is written.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to write. Blocks already in the sequence are written first.
+    file_name : str or Path
+        File name of `.seq` file to be written to disk.
+    create_signature : bool, default=True
+        Boolean flag to indicate if the file has to be signed.
+    remove_duplicates : bool, default=True
+        Remove duplicate events from the libraries before writing.
+    compression : str, optional
+        Compress the file with 'gzip' or 'zstd', see `Sequence.write()`.
+
+    Attributes
+    ----------
+    num_blocks : int
+        Number of blocks written so far.
+    signature : str or None
+        MD5 signature of the written file, once the writer is closed and if `create_signature` is True.
+
+    Examples
+    --------
+    >>> seq = pp.Sequence()
+    >>> with pp.SequenceWriter(seq, 'gre.seq') as writer:
+    ...     for i in range(n_lines):
+    ...         seq.add_block(rf, gz)
+    ...         seq.add_block(gx, adc)
+    """
+
+    # Number of block rows collected in memory before they are appended to the spool file
+    chunk_size = 4096
+
+    def __init__(
+        self,
+        seq: 'Sequence',
+        file_name: Union[str, Path],
+        create_signature: bool = True,
+        remove_duplicates: bool = True,
+        compression: Union[str, None] = None,
+    ):
+        self.seq = seq
+        self.file_name = seq_file_name(file_name, compression)
+        self.create_signature = create_signature
+        self.remove_duplicates = remove_duplicates
+        self.compression = compression
+        self.num_blocks = 0
+        self.signature = None
+
+        self._rows: List[tuple] = []
+        self._spool = None
+        # Summed in block order like in `Sequence.write()`, so the TotalDuration definition is identical
+        self._total_duration = 0
+
+    def __enter__(self) -> 'SequenceWriter':
+        if self.seq.block_writer is not None:
+            raise RuntimeError('The sequence is already being written by another SequenceWriter.')
+        self._spool = tempfile.TemporaryFile()
+        self.seq.block_writer = self
+        self.spool()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.seq.block_writer = None
+        try:
+            if exc_type is None:
+                self.spool(keep_last=False)
+                self._assemble()
+        finally:
+            self._spool.close()
+
+    def spool(self, keep_last: bool = True) -> None:
+        """
+        Moves the blocks of the sequence to the spool file. Called by `Sequence.add_block()` while the writer is open.
+
+        Parameters
+        ----------
+        keep_last : bool, default=True
+            Keep the last block in the sequence, for the gradient checks of the next `add_block()` call.
+        """
+        seq = self.seq
+        while len(seq.block_events) > (1 if keep_last else 0):
+            block_id = next(iter(seq.block_events))
+            self._rows.append((block_id, _block_duration(seq, block_id), *seq.block_events.pop(block_id)[1:]))
+            self._total_duration += seq.block_durations.pop(block_id)
+            seq.block_cache.pop(block_id, None)
+            seq.block_trace.pop(block_id, None)
+            self.num_blocks += 1
+
+        if len(self._rows) >= self.chunk_size or not keep_last:
+            self._spool.write(np.array(self._rows, dtype=np.int64).reshape(-1, 8).tobytes())
+            self._rows = []
+
+    def _assemble(self) -> None:
+        seq = self.seq
+        seq.set_definition('TotalDuration', self._total_duration)
+
+        mappings = {}
+        if self.remove_duplicates:
+            # All blocks are spooled, so this only copies the libraries
+            seq = deepcopy(seq)
+            mappings = seq._remove_library_duplicates()
+
+        with open_seq_file(self.file_name, 'w', self.compression) as file:
+            output_file = _HashingWriter(file)
+            _write_header(seq, output_file)
+            _write_blocks(output_file, self._read_rows(mappings), num_blocks=self.num_blocks)
+            _write_libraries(seq, output_file)
+            if self.create_signature:
+                self.signature = output_file.hexdigest()
+                _write_signature(output_file, self.signature)
+
+        if self.create_signature:
+            self.seq.signature_type = 'md5'
+            self.seq.signature_file = 'text'
+            self.seq.signature_value = self.signature
+
+    def _read_rows(self, mappings: Dict[int, Dict[int, int]]) -> Iterator[List[int]]:
+        """Yields the spooled block rows, with the event IDs remapped by `mappings`."""
+        lookup_tables = {}
+        for idx, mapping in mappings.items():
+            lookup_tables[idx] = np.zeros(max(mapping) + 1, dtype=np.int64)
+            lookup_tables[idx][list(mapping)] = list(mapping.values())
+
+        self._spool.seek(0)
+        while True:
+            rows = np.frombuffer(self._spool.read(8 * 8 * self.chunk_size), dtype=np.int64).reshape(-1, 8).copy()
+            if len(rows) == 0:
+                break
+            # Column 0 of the rows is the block ID, the event IDs follow the duration
+            for idx, lookup_table in lookup_tables.items():
+                rows[:, idx + 1] = lookup_table[rows[:, idx + 1]]
+            yield from rows.tolist()
@@ -0,0 +1,93 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple, Union
+
+import numpy as np
+
+from pypulseq.Sequence.timeline import select_blocks
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+# Data shared with the worker processes of `map_shards()`, set by the pool initializer
+_shared = None
+
+
+def shard_blocks(
+    seq: 'Sequence', num_shards: int, time_range: Union[List[float], None] = None
+) -> List[Tuple[List[int], float]]:
+    """
+    Split the blocks of the sequence into time-contiguous shards with similar numbers of blocks.
+
+    The start times of the shards are accumulated in the same order as in `Sequence.waveforms()`, so times derived
+    from them are bitwise identical to the ones of a single pass over all blocks.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to split.
+    num_shards : int
+        Maximum number of shards. Fewer shards are returned if the sequence has fewer blocks.
+    time_range : List[float], optional
+        Time range as a list of two timepoints (in seconds). The default is None (all blocks).
+
+    Returns
+    -------
+    shards : List[Tuple[List[int], float]]
+        Block IDs and start time of each shard, in sequence order.
+    """
+    blocks, curr_dur = select_blocks(seq, time_range)
+
+    shards = []
+    for start, stop in split_range(len(blocks), num_shards):
+        shards.append((blocks[start:stop], curr_dur))
+        for block_counter in blocks[start:stop]:
+            curr_dur += seq.block_durations[block_counter]
+    return shards
+
+
+def split_range(n: int, num_shards: int) -> List[Tuple[int, int]]:
+    """Splits `range(n)` into up to `num_shards` non-empty, contiguous ranges of similar length."""
+    bounds = np.linspace(0, n, max(num_shards, 1) + 1).round().astype(int).tolist()
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if start < stop]
+
+
+def map_shards(func: Callable[..., Any], shared: Any, tasks: List[tuple], num_processes: Union[int, None]) -> list:
+    """
+    Calls `func(shared, *task)` for all tasks in a process pool and returns the results in order.
+
+    `shared` is passed to each worker process once, when it is started, instead of with each task. With the 'fork'
+    start method (the default on Linux), the workers share it copy-on-write with the calling process, so sequences and
+    their event and shape libraries are not copied at all.
+
+    Parameters
+    ----------
+    func : callable
+        Module-level function to call for each task.
+    shared : Any
+        Data shared by all tasks, e.g. the sequence.
+    tasks : List[tuple]
+        Additional arguments of each call.
+    num_processes : int or None
+        Number of worker processes. With None or 1, the tasks are run in the calling process.
+
+    Returns
+    -------
+    results : list
+        Return values of `func`, in the order of `tasks`.
+    """
+    if num_processes is None or num_processes <= 1 or len(tasks) <= 1:
+        return [func(shared, *task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=min(num_processes, len(tasks)), initializer=_set_shared, initargs=(shared,)
+    ) as pool:
+        return list(pool.map(_call_shared, [func] * len(tasks), tasks))
+
+
+def _set_shared(shared: Any) -> None:
+    global _shared
+    _shared = shared
+
+
+def _call_shared(func: Callable[..., Any], task: tuple) -> Any:
+    return func(_shared, *task)
@@ -0,0 +1,299 @@
+import math
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from pypulseq import eps
+from pypulseq.utils.cumsum import cumsum
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+
+def select_blocks(seq: 'Sequence', time_range: Union[List[float], None] = None) -> Tuple[list, float]:
+    """
+    Select the blocks of the sequence that overlap with `time_range`.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to select blocks from.
+    time_range : List[float], optional
+        Time range as a list of two timepoints (in seconds). The default is None (all blocks).
+
+    Returns
+    -------
+    blocks : list
+        Block IDs overlapping with `time_range`, in sequence order.
+    start_time : float
+        Start time of the first selected block.
+
+    Raises
+    ------
+    ValueError
+        If `time_range` does not consist of two increasing timepoints.
+    """
+    if time_range is None:
+        return list(seq.block_events), 0
+
+    if len(time_range) != 2:
+        raise ValueError('Time range must be list of two elements')
+    if time_range[0] > time_range[1]:
+        raise ValueError('End time of time_range must be after begin time')
+
+    # Calculate end times of each block
+    bd = np.array(list(seq.block_durations.values()))
+    t = np.cumsum(bd)
+    # Search block end times for start of time range
+    begin_block = np.searchsorted(t, time_range[0])
+    # Search block begin times for end of time range
+    end_block = np.searchsorted(t - bd, time_range[1], side='right')
+    blocks = list(seq.block_durations.keys())[begin_block:end_block]
+    start_time = t[begin_block] - bd[begin_block] if begin_block < len(bd) else 0
+
+    return blocks, start_time
+
+
+def iter_blocks(
+    seq: 'Sequence', time_range: Union[List[float], None] = None
+) -> Iterator[Tuple[int, float, SimpleNamespace]]:
+    """
+    Iterate over the (decompressed) blocks of the sequence together with their start times.
+
+    Block start times are accumulated in the same order as in `Sequence.waveforms()`, so times derived from them
+    are bitwise identical to the ones returned there.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to iterate over.
+    time_range : List[float], optional
+        Time range as a list of two timepoints (in seconds). The default is None (all blocks).
+
+    Yields
+    ------
+    block_counter : int
+        Block ID.
+    block_start : float
+        Start time of the block.
+    block : SimpleNamespace
+        Block returned by `Sequence.get_block()`.
+    """
+    blocks, curr_dur = select_blocks(seq, time_range)
+
+    for block_counter in blocks:
+        yield block_counter, curr_dur, seq.get_block(block_counter)
+        curr_dur += seq.block_durations[block_counter]
+
+
+def grad_waveform_points(
+    grad: SimpleNamespace, grad_raster_time: float, block_start: float = 0.0
+) -> Union[np.ndarray, None]:
+    """
+    Return the corner points of a gradient event as a piecewise-linear waveform.
+
+    Parameters
+    ----------
+    grad : SimpleNamespace
+        Gradient event ('grad' or 'trap') as returned by `Sequence.get_block()`.
+    grad_raster_time : float
+        Gradient raster time.
+    block_start : float, default=0.0
+        Start time of the block containing the gradient.
+
+    Returns
+    -------
+    points : np.ndarray or None
+        Array of shape [2, N] with the times (including the block start and the gradient delay) and the gradient
+        amplitudes at the corner points. None for "empty" trapezoids without rise, flat and fall times.
+    """
+    if grad.type == 'grad':
+        # Check if we have an extended trapezoid or an arbitrary gradient on a regular raster
+        tt_rast = grad.tt / grad_raster_time + 0.5
+        if np.all(np.abs(tt_rast - np.arange(1, len(tt_rast) + 1)) < eps):  # Arbitrary gradient
+            """
+            Arbitrary gradient: restore & recompress shape - if we had a trapezoid converted to shape we
+            have to find the "corners" and we can eliminate internal samples on the straight segments
+            but first we have to restore samples on the edges of the gradient raster intervals for that
+            we need the first sample.
+            """
+
+            # TODO: Implement restoreAdditionalShapeSamples
+            #       https://github.com/pulseq/pulseq/blob/master/matlab/%2Bmr/restoreAdditionalShapeSamples.m
+
+            return np.array(
+                [
+                    block_start + grad.delay + np.concatenate(([0], grad.tt, [grad.tt[-1] + grad_raster_time / 2])),
+                    np.concatenate(([grad.first], grad.waveform, [grad.last])),
+                ]
+            )
+        else:  # Extended trapezoid
+            return np.array([block_start + grad.delay + grad.tt, grad.waveform])
+
+    if abs(grad.flat_time) > eps:
+        return np.vstack(
+            (
+                cumsum(block_start + grad.delay, grad.rise_time, grad.flat_time, grad.fall_time),
+                grad.amplitude * np.array([0, 1, 1, 0]),
+            )
+        )
+    if abs(grad.rise_time) > eps and abs(grad.fall_time) > eps:
+        return np.vstack(
+            (
+                cumsum(block_start + grad.delay, grad.rise_time, grad.fall_time),
+                grad.amplitude * np.array([0, 1, 0]),
+            )
+        )
+
+    return None
+
+
+def block_grad_points(
+    block: SimpleNamespace, grad_raster_time: float, block_start: float = 0.0
+) -> List[Union[np.ndarray, None]]:
+    """
+    Return the corner points of the gradient waveforms of a block on the physical gradient axes.
+
+    If the block contains a rotation extension, the stored (unrotated) gradients are sampled on the union of their
+    corner points and rotated, so that the returned pieces describe the gradients played out on the x, y and z axes.
+
+    Parameters
+    ----------
+    block : SimpleNamespace
+        Block as returned by `Sequence.get_block()`.
+    grad_raster_time : float
+        Gradient raster time.
+    block_start : float, default=0.0
+        Start time of the block.
+
+    Returns
+    -------
+    pieces : List[np.ndarray or None]
+        For each of the gradient axes x, y and z an array of shape [2, N] with the times and amplitudes of the corner
+        points (see `grad_waveform_points()`), or None if there is no gradient on this axis.
+    """
+    pieces = []
+    for channel in ['gx', 'gy', 'gz']:
+        grad = getattr(block, channel, None)
+        pieces.append(None if grad is None else grad_waveform_points(grad, grad_raster_time, block_start))
+
+    rotation = getattr(block, 'rotation', None)
+    if rotation is None or all(piece is None for piece in pieces):
+        return pieces
+
+    # Sample all gradients on the union of their corner points; the waveforms are piecewise linear between them
+    times = np.unique(np.concatenate([piece[0] for piece in pieces if piece is not None]))
+    times = times[np.concatenate(([True], np.diff(times) >= eps))]
+    waveforms = np.zeros((3, len(times)))
+    for j, piece in enumerate(pieces):
+        if piece is not None:
+            waveforms[j] = np.interp(times, piece[0], piece[1], left=0, right=0)
+
+    rotated = rotation.rot_matrix @ waveforms
+    threshold = 1e-6 * np.max(np.abs(waveforms))
+    return [np.array([times, w]) if np.max(np.abs(w)) > threshold else None for w in rotated]
+
+
+def block_waveforms(
+    seq: 'Sequence', blocks: List[int], start_time: float, append_RF: bool = False
+) -> Tuple[List[Union[np.ndarray, None]], List[Union[float, None]]]:
+    """
+    Collect the gradient (and RF) waveforms of consecutive blocks, see `Sequence.waveforms()`.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence containing the blocks.
+    blocks : List[int]
+        IDs of consecutive blocks.
+    start_time : float
+        Start time of the first block.
+    append_RF : bool, default=False
+        Boolean flag to indicate if RF wave shapes are to be appended after the gradients.
+
+    Returns
+    -------
+    waveforms : List[np.ndarray or None]
+        For each channel an array of shape [2, N] with the times and values of the waveform pieces of all blocks,
+        joined with `join_pieces()`, or None if there are no pieces on this channel.
+    end_times : List[float or None]
+        For each channel the time of the last point of the last piece, needed to join the waveforms of consecutive
+        ranges of blocks.
+    """
+    grad_channels = ['gx', 'gy', 'gz']
+
+    # Collect shape pieces
+    if append_RF:
+        shape_channels = len(grad_channels) + 1  # Last 'channel' is RF
+    else:
+        shape_channels = len(grad_channels)
+
+    shape_pieces = [[] for _ in range(shape_channels)]
+    curr_dur = start_time
+
+    for block_counter in blocks:
+        block = seq.get_block(block_counter)
+
+        grad_pieces = block_grad_points(block, seq.grad_raster_time, curr_dur)
+        for j in range(len(grad_channels)):
+            grad = getattr(block, grad_channels[j])
+            piece = grad_pieces[j]
+            if piece is not None:  # Gradients
+                shape_pieces[j].append(piece)
+            elif grad is not None and block.rotation is None and abs(grad.amplitude) > eps:
+                print('Warning: "empty" gradient with non-zero magnitude detected in block {}'.format(block_counter))
+
+        if block.rf is not None and append_RF:  # RF
+            rf = block.rf
+            full_freq_offset = rf.freq_offset + rf.freq_ppm * 1e-6 * seq.system.gamma * seq.system.B0
+            full_phase_offset = rf.phase_offset + rf.phase_ppm * 1e-6 * seq.system.gamma * seq.system.B0
+            rf_piece = np.array(
+                [
+                    curr_dur + rf.delay + rf.t,
+                    rf.signal * np.exp(1j * (full_phase_offset + 2 * math.pi * full_freq_offset * rf.t)),
+                ]
+            )
+
+            if abs(rf.signal[0]) > 0:
+                pre = np.array([[rf_piece[0, 0] - 0.1 * seq.system.rf_raster_time], [0]])
+                rf_piece = np.hstack((pre, rf_piece))
+
+            if abs(rf.signal[-1]) > 0:
+                post = np.array([[rf_piece[0, -1] + 0.1 * seq.system.rf_raster_time], [0]])
+                rf_piece = np.hstack((rf_piece, post))
+
+            shape_pieces[-1].append(rf_piece)
+
+        curr_dur += seq.block_durations[block_counter]
+
+    waveforms = [join_pieces(pieces) if pieces else None for pieces in shape_pieces]
+    end_times = [pieces[-1][0, -1] if pieces else None for pieces in shape_pieces]
+    return waveforms, end_times
+
+
+def join_pieces(pieces: List[np.ndarray], end_times: Union[List[float], None] = None) -> np.ndarray:
+    """
+    Concatenate waveform pieces of shape [2, N]. If the first point of a piece has the same time as the last point of
+    the previous piece, the first point of the piece is dropped.
+
+    Parameters
+    ----------
+    pieces : List[np.ndarray]
+        Non-empty waveform pieces, in time order.
+    end_times : List[float], optional
+        Times of the last points of the pieces before dropping any points, if the pieces are already joined waveforms
+        (see `block_waveforms()`). The default is the time of the last point of each piece.
+
+    Returns
+    -------
+    waveform : np.ndarray
+        Joined waveform.
+    """
+    if end_times is None:
+        end_times = [piece[0, -1] for piece in pieces]
+
+    pieces = [pieces[0]] + [
+        cur if prev + eps < cur[0, 0] else cur[:, 1:] for prev, cur in zip(end_times[:-1], pieces[1:], strict=False)
+    ]
+    return np.concatenate(pieces, axis=1)
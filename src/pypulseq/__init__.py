@@ -34,6 +34,8 @@ def round_half_up(n, decimals=0):
 # =========
 from pypulseq.SAR.SAR_calc import calc_SAR
 from pypulseq.Sequence.sequence import Sequence
+from pypulseq.Sequence.sequence_writer import SequenceWriter
+from pypulseq.Sequence.binary_seq import convert_sequence_file
 from pypulseq.add_gradients import add_gradients
 from pypulseq.align import align
 from pypulseq.calc_duration import calc_duration
@@ -42,26 +44,39 @@ def round_half_up(n, decimals=0):
 from pypulseq.calc_rf_center import calc_rf_center
 from pypulseq.make_adc import make_adc, calc_adc_segments
 from pypulseq.make_adiabatic_pulse import make_adiabatic_pulse
+from pypulseq.make_adiabatic_pulses import make_adiabatic_pulses
 from pypulseq.make_arbitrary_grad import make_arbitrary_grad
 from pypulseq.make_arbitrary_rf import make_arbitrary_rf
 from pypulseq.make_block_pulse import make_block_pulse
+from pypulseq.make_block_pulses import make_block_pulses
 from pypulseq.make_delay import make_delay
 from pypulseq.make_soft_delay import make_soft_delay
 from pypulseq.make_digital_output_pulse import make_digital_output_pulse
 from pypulseq.make_extended_trapezoid import make_extended_trapezoid
 from pypulseq.make_extended_trapezoid_area import make_extended_trapezoid_area
+from pypulseq.make_extended_trapezoids import make_extended_trapezoids
 from pypulseq.make_gauss_pulse import make_gauss_pulse
+from pypulseq.make_gauss_pulses import make_gauss_pulses
 from pypulseq.make_label import make_label
+from pypulseq.make_rotation import make_rotation
 from pypulseq.make_sinc_pulse import make_sinc_pulse
+from pypulseq.make_sinc_pulses import make_sinc_pulses
 from pypulseq.make_trapezoid import make_trapezoid
+from pypulseq.make_trapezoids import make_trapezoids
+from pypulseq.gradient_table import GradientTable
 from pypulseq.sigpy_pulse_opts import SigpyPulseOpts
 from pypulseq.make_trigger import make_trigger
 from pypulseq.opts import Opts
-from pypulseq.points_to_waveform import points_to_waveform
+from pypulseq.points_to_waveform import points_to_waveform, points_to_waveforms
 from pypulseq.rotate import rotate
+from pypulseq.rf_pulse_set import RFPulseSet
+from pypulseq.rotated_gradient_table import RotatedGradientTable
 from pypulseq.scale_grad import scale_grad
 from pypulseq.split_gradient import split_gradient
 from pypulseq.split_gradient_at import split_gradient_at
 from pypulseq.supported_labels_rf_use import get_supported_labels
 from pypulseq.traj_to_grad import traj_to_grad
 from pypulseq.utils.tracing import enable_trace, disable_trace
+from pypulseq.utils.pulse_cache import enable_pulse_cache, disable_pulse_cache, clear_pulse_cache
+from pypulseq.utils.read_cache import enable_read_cache, disable_read_cache, clear_read_cache
+from pypulseq.utils.sweep import run_sweep
@@ -10,7 +10,7 @@
 from pypulseq.make_extended_trapezoid import make_extended_trapezoid
 from pypulseq.make_trapezoid import make_trapezoid
 from pypulseq.opts import Opts
-from pypulseq.points_to_waveform import points_to_waveform
+from pypulseq.points_to_waveform import points_to_waveforms
 from pypulseq.utils.cumsum import cumsum
 from pypulseq.utils.tracing import trace, trace_enabled
 
@@ -178,6 +178,8 @@ def add_gradients(
     else:
         target_raster = system.grad_raster_time
 
+    # Corner points of all extended trapezoids and trapezoids, interpolated onto the raster in one pass
+    corner_times, corner_amplitudes, corner_index = [], [], []
     for ii in range(len(grads)):
         g = grads[ii]
         if g.type == 'grad':
@@ -191,11 +193,9 @@ def add_gradients(
                 else:
                     waveforms[ii] = g.waveform
             else:
-                waveforms[ii] = points_to_waveform(
-                    amplitudes=g.waveform,
-                    times=g.tt,
-                    grad_raster_time=target_raster,
-                )
+                corner_times.append(g.tt)
+                corner_amplitudes.append(g.waveform)
+                corner_index.append(ii)
         elif g.type == 'trap':
             if g.flat_time > 0:  # Triangle or trapezoid
                 times = np.array(
@@ -216,14 +216,25 @@ def add_gradients(
                     ]
                 )
                 amplitudes = np.array([0, g.amplitude, 0])
-            waveforms[ii] = points_to_waveform(
-                amplitudes=amplitudes,
-                times=times,
-                grad_raster_time=target_raster,
-            )
+            corner_times.append(times)
+            corner_amplitudes.append(amplitudes)
+            corner_index.append(ii)
         else:
             raise ValueError('Unknown gradient type')
 
+    if corner_index:
+        offsets = np.concatenate(([0], np.cumsum([len(t) for t in corner_times])))
+        corner_waveforms, waveform_offsets = points_to_waveforms(
+            amplitudes=np.concatenate(corner_amplitudes),
+            grad_raster_time=target_raster,
+            times=np.concatenate(corner_times),
+            offsets=offsets,
+        )
+        for k, ii in enumerate(corner_index):
+            waveforms[ii] = corner_waveforms[waveform_offsets[k] : waveform_offsets[k + 1]]
+
+    for ii in range(len(grads)):
+        g = grads[ii]
         if g.delay - common_delay > 0:
             # Stop for numpy.arange is not g.delay - common_delay - system.grad_raster_time like in Matlab
             # so as to include the endpoint
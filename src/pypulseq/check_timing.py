@@ -1,8 +1,9 @@
 from types import SimpleNamespace
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
 from pypulseq import Sequence, eps
 from pypulseq.calc_duration import calc_duration
+from pypulseq.Sequence.sharding import map_shards, shard_blocks
 from pypulseq.utils.tracing import format_trace
 
 error_messages = {
@@ -20,7 +21,52 @@
 }
 
 
-def check_timing(seq: Sequence) -> Tuple[bool, List[SimpleNamespace]]:
+def check_timing(seq: Sequence, num_processes: Union[int, None] = None) -> Tuple[bool, List[SimpleNamespace]]:
+    """
+    Checks the timing of all blocks and events of the sequence.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to check.
+    num_processes : int, optional
+        Number of worker processes. If larger than 1, the blocks are split into time-contiguous shards that are
+        checked in parallel. The error report is identical to the one of a single process.
+
+    Returns
+    -------
+    is_ok : bool
+        Boolean flag indicating timing errors.
+    error_report : List[SimpleNamespace]
+        Error report in case of timing errors.
+    """
+    if num_processes is not None and num_processes > 1:
+        shards = [blocks for blocks, _ in shard_blocks(seq, num_processes)]
+    else:
+        shards = [list(seq.block_events)]
+    results = map_shards(_check_blocks, seq, [(blocks, {}) for blocks in shards], num_processes)
+
+    error_report: List[SimpleNamespace] = []
+    soft_delay_defaults = {}
+    for blocks, (errors, defaults) in zip(shards, results, strict=True):
+        # Soft delays are checked against the default duration of their first occurrence. If a soft delay first
+        # occurs in a previous shard with a different default, check the shard again with the previous defaults.
+        if any(soft_delay_defaults.get(num_id, default) != default for num_id, default in defaults.items()):
+            errors, defaults = _check_blocks(seq, blocks, dict(soft_delay_defaults))
+        error_report.extend(errors)
+        for num_id, default in defaults.items():
+            soft_delay_defaults.setdefault(num_id, default)
+
+    return len(error_report) == 0, error_report
+
+
+def _check_blocks(
+    seq: Sequence, blocks: List[int], soft_delay_defaults: Dict[int, float]
+) -> Tuple[List[SimpleNamespace], Dict[int, float]]:
+    """
+    Checks the timing of the given blocks. Returns the error report and the default durations of the soft delays,
+    including `soft_delay_defaults` and the ones of soft delays that first occur in these blocks.
+    """
     error_report: List[SimpleNamespace] = []
 
     def div_check(a: float, b: float, event: str, field: str, raster: str):
@@ -45,10 +91,8 @@ def div_check(a: float, b: float, event: str, field: str, raster: str):
                 )
             )
 
-    soft_delay_defaults = {}
-
     # Loop over all blocks
-    for block_counter in seq.block_events:
+    for block_counter in blocks:
         block = seq.get_block(block_counter)
 
         # Check block duration
@@ -208,7 +252,7 @@ def div_check(a: float, b: float, event: str, field: str, raster: str):
                     )
                 )
 
-    return len(error_report) == 0, error_report
+    return error_report, soft_delay_defaults
 
 
 def format_string(template: str, **kwargs: Any) -> str:
@@ -34,7 +34,8 @@ class EventLibrary:
     type : dict{str, str}
         Key-value pairs of event keys and corresponding event types.
     keymap : dict{str, int}
-        Key-value pairs of data values and corresponding event keys.
+        Key-value pairs of data values and corresponding event keys. Entries of events added with `insert_deferred()`
+        are only created when the keymap is first accessed.
     """
 
     def __init__(self, numpy_data=False):
@@ -44,6 +45,20 @@ def __init__(self, numpy_data=False):
         self.next_free_ID = 1
         self.numpy_data = numpy_data
 
+    @property
+    def keymap(self) -> dict:
+        if self._deferred_keys:
+            deferred_keys, self._deferred_keys = self._deferred_keys, []
+            for key_id in deferred_keys:
+                data = self.data[key_id]
+                self._keymap[np.asarray(data).tobytes() if self.numpy_data else tuple(data)] = key_id
+        return self._keymap
+
+    @keymap.setter
+    def keymap(self, keymap: dict) -> None:
+        self._keymap = keymap
+        self._deferred_keys = []
+
     def __str__(self) -> str:
         s = 'EventLibrary:'
         s += '\ndata: ' + str(len(self.data))
@@ -127,6 +142,53 @@ def find_or_insert(self, new_data: np.ndarray, data_type: str = str()) -> Tuple[
 
         return key_id, found
 
+    def find_or_insert_many(self, new_data: list, data_type: str = str()) -> Tuple[np.ndarray, bool]:
+        """
+        Lookup several data structures of the same type in the library at once, inserting the ones that do not exist.
+
+        See also `pypulseq.event_library.EventLibrary.find_or_insert()`.
+
+        Parameters
+        ----------
+        new_data : list
+            List of data tuples to be found (or added, if not found) in event library.
+        data_type : str, default=str()
+            Type of data.
+
+        Returns
+        -------
+        key_ids : numpy.ndarray
+            Keys of the `new_data` entries in event library.
+        any_found : bool
+            If any of the `new_data` entries was found in the event library.
+        """
+        key_ids = np.zeros(len(new_data), dtype=int)
+        any_found = False
+        keymap = self.keymap
+
+        for i, data in enumerate(new_data):
+            if self.numpy_data:
+                data = np.asarray(data)
+                data.flags.writeable = False
+                key = data.tobytes()
+            else:
+                data = tuple(data)
+                key = data
+
+            key_id = keymap.get(key)
+            if key_id is None:
+                key_id = self.next_free_ID
+                self.data[key_id] = data
+                if data_type != str():
+                    self.type[key_id] = data_type
+                keymap[key] = key_id
+                self.next_free_ID = key_id + 1
+            else:
+                any_found = True
+            key_ids[i] = key_id
+
+        return key_ids, any_found
+
     def insert(self, key_id: int, new_data: np.ndarray | list, data_type: str = str()) -> int:
         """
         Add event to library.
@@ -171,6 +233,45 @@ def insert(self, key_id: int, new_data: np.ndarray | list, data_type: str = str(
 
         return key_id
 
+    def insert_deferred(self, key_id: int, new_data: np.ndarray | list, data_type: str = str()) -> int:
+        """
+        Add event to library without adding it to the keymap yet. The keymap entry is created when the keymap is first
+        accessed, e.g. by `find()` or `insert()`, so `new_data` is not read until then. This allows memory-mapped
+        shape data to be loaded lazily.
+
+        See also `pypulseq.event_library.EventLibrary.insert()`.
+
+        Parameters
+        ----------
+        key_id : int
+            Key of `new_data`.
+        new_data : numpy.ndarray or list
+            Data to be inserted into event library. Arrays are stored as they are, without being copied.
+        data_type : str, default=str()
+            Data type of `new_data`.
+
+        Returns
+        -------
+        key_id : int
+            Key ID of inserted event.
+        """
+        if isinstance(key_id, float):
+            key_id = int(key_id)
+
+        if key_id == 0:
+            key_id = self.next_free_ID
+
+        self.data[key_id] = new_data
+        if data_type != str():
+            self.type[key_id] = data_type
+
+        self._deferred_keys.append(key_id)
+
+        if key_id >= self.next_free_ID:
+            self.next_free_ID = key_id + 1  # Update next_free_id
+
+        return key_id
+
     def get(self, key_id: int) -> dict:
         """
 
@@ -0,0 +1,182 @@
+from copy import copy
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+
+from pypulseq import eps
+from pypulseq.make_trapezoids import TrapezoidSet
+from pypulseq.opts import Opts
+from pypulseq.scale_grad import scale_grad
+from pypulseq.Sequence.block import register_grad_event
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+
+class GradientTable:
+    """
+    Table of scaled variants of a gradient event (e.g. phase encoding gradients) registered in the gradient library of
+    a sequence in one go.
+
+    All variants are inserted into `seq.grad_library` when the table is created. Indexing the table returns the scaled
+    gradient event (as `scale_grad()` would) with its library `id` set, so `Sequence.add_block()` uses the registered
+    event without registering or hashing it again. The returned events are shared between accesses to the same index
+    and should not be modified.
+
+    Examples
+    --------
+    >>> gy = pp.make_trapezoid(channel='y', area=delta_k * n_y / 2, duration=1e-3, system=system)
+    >>> gy_table = pp.GradientTable(seq, gy, scales=(np.arange(n_y) - n_y / 2) / (n_y / 2))
+    >>> for i in range(n_y):
+    ...     seq.add_block(gx_pre, gy_table[i], gz_reph)
+
+    See Also
+    --------
+    - `pypulseq.scale_grad.scale_grad()`
+    - `pypulseq.make_trapezoids.make_trapezoids()`
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to register the gradients in. The table is only valid for this sequence.
+    grad : SimpleNamespace or TrapezoidSet
+        Trapezoid or arbitrary gradient event to be scaled, or a set of trapezoids from `make_trapezoids()` to be
+        registered as is.
+    scales : numpy.ndarray, optional
+        Scaling factors (array of any shape). Required if `grad` is a single gradient event.
+    system : Opts, optional
+        System limits. If provided, the scaled gradients are checked against the maximum gradient amplitude and slew
+        rate like in `scale_grad()`.
+
+    Attributes
+    ----------
+    ids : numpy.ndarray
+        Gradient library IDs of the variants, with the shape of `scales`.
+
+    Raises
+    ------
+    ValueError
+        If `scales` is missing or provided for a `TrapezoidSet`.
+        If a scaled gradient exceeds the system limits.
+    """
+
+    def __init__(
+        self,
+        seq: 'Sequence',
+        grad: Union[SimpleNamespace, TrapezoidSet],
+        scales: Union[np.ndarray, None] = None,
+        system: Union[Opts, None] = None,
+    ):
+        self._events = {}
+
+        if isinstance(grad, TrapezoidSet):
+            if scales is not None:
+                raise ValueError('`scales` cannot be used with a TrapezoidSet.')
+            self._grad = None
+            self._set = grad
+            self.scales = None
+            data = np.stack(
+                np.broadcast_arrays(grad.amplitude, grad.rise_time, grad.flat_time, grad.fall_time, grad.delay),
+                axis=-1,
+            )
+            self.ids = self._register(seq, data.reshape(-1, 5).tolist(), 't').reshape(grad.shape)
+            return
+
+        if scales is None:
+            raise ValueError('`scales` must be provided to scale a single gradient event.')
+
+        self._grad = grad
+        self._set = None
+        self.scales = np.asarray(scales, dtype=float)
+        scales = self.scales.reshape(-1)
+
+        if system is not None:
+            self._check_limits(grad, scales, system)
+
+        if grad.type == 'trap':
+            # Same data layout as `register_grad_event()`
+            amplitude = grad.amplitude * scales
+            timing = (grad.rise_time, grad.flat_time, grad.fall_time, grad.delay)
+            data = [(a, *timing) for a in amplitude.tolist()]
+            ids = self._register(seq, data, 't')
+        else:
+            # Register the unscaled gradient once to obtain its shape IDs; all non-zero scaled variants share the
+            # normalized waveform shape and only differ in amplitude, first and last points
+            base = copy(grad)
+            if hasattr(base, 'id'):
+                delattr(base, 'id')
+            base_id, shape_ids = register_grad_event(seq, base)
+            base_data = seq.grad_library.data[base_id]
+
+            nonzero = np.abs(scales) > 0
+            amplitude = base_data[0] * scales
+            first = grad.first * scales
+            last = grad.last * scales
+            data = [
+                (a, f, last_, *shape_ids, grad.delay)
+                for a, f, last_ in zip(amplitude[nonzero].tolist(), first[nonzero].tolist(), last[nonzero].tolist())
+            ]
+            ids = np.zeros(len(scales), dtype=int)
+            ids[nonzero] = self._register(seq, data, 'g')
+
+            # An all-zero waveform cannot be normalized, register it like any other gradient
+            if not np.all(nonzero):
+                zero_id, _ = register_grad_event(seq, scale_grad(grad, 0))
+                ids[~nonzero] = zero_id
+
+        self.ids = ids.reshape(self.scales.shape)
+
+    @staticmethod
+    def _register(seq: 'Sequence', data: list, data_type: str) -> np.ndarray:
+        ids, any_found = seq.grad_library.find_or_insert_many(data, data_type)
+
+        # Clear block cache because grad events were overwritten (see `register_grad_event()`)
+        if seq.use_block_cache and any_found:
+            seq.block_cache.clear()
+        return ids
+
+    @staticmethod
+    def _check_limits(grad: SimpleNamespace, scales: np.ndarray, system: Opts) -> None:
+        max_scale = np.max(np.abs(scales), initial=0)
+        if grad.type == 'trap':
+            max_amplitude = abs(grad.amplitude) * max_scale
+            max_slew = max_amplitude / min(grad.rise_time, grad.fall_time) if abs(grad.amplitude) > eps else 0
+        else:
+            max_amplitude = np.max(np.abs(grad.waveform)) * max_scale
+            max_slew = np.max(np.abs(np.diff(grad.waveform) / np.diff(grad.tt)), initial=0) * max_scale
+
+        if max_amplitude > system.max_grad:
+            raise ValueError(f'GradientTable: maximum amplitude exceeded {100 * max_amplitude / system.max_grad} %')
+        if max_slew > system.max_slew:
+            raise ValueError(f'GradientTable: maximum slew rate exceeded {100 * max_slew / system.max_slew} %')
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.ids.shape
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index) -> SimpleNamespace:
+        # Events are created on first access and reused afterwards
+        grad = self._events.get(index) if isinstance(index, (int, np.integer, tuple)) else None
+        if grad is not None:
+            return grad
+
+        grad_id = self.ids[index]
+        if np.ndim(grad_id) > 0:
+            raise IndexError('GradientTable index must select a single gradient event.')
+
+        if self._set is not None:
+            grad = self._set[index]
+        else:
+            grad = scale_grad(self._grad, float(self.scales[index]))
+        grad.id = int(grad_id)
+
+        if isinstance(index, (int, np.integer, tuple)):
+            self._events[index] = grad
+        return grad
+
+    def __repr__(self) -> str:
+        return f'GradientTable(shape={self.shape})'
@@ -1,7 +1,8 @@
-import itertools
-from math import ceil, floor, gcd, isclose, prod
+from bisect import bisect_left
+from functools import lru_cache
+from math import ceil, floor, gcd, isclose, isqrt
 from types import SimpleNamespace
-from typing import List, Tuple, Union
+from typing import Tuple, Union
 from warnings import warn
 
 import numpy as np
@@ -139,9 +140,6 @@ def calc_adc_segments(
     ValueError
         If number of segments exceeds 128.
     """
-    # Define maximum number of segments for the ADC
-    max_segments = 128
-
     if mode not in ['shorten', 'lengthen']:
         raise ValueError(f"'mode' must be 'shorten' or 'lengthen' but is {mode}")
 
@@ -152,23 +150,48 @@ def calc_adc_segments(
     if system.adc_samples_limit <= 0:
         return 1, num_samples
 
+    return _calc_adc_segments(
+        int(num_samples),
+        float(dwell),
+        system.grad_raster_time,
+        system.adc_raster_time,
+        system.adc_samples_limit,
+        system.adc_samples_divisor,
+        mode,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _calc_adc_segments(
+    num_samples: int,
+    dwell: float,
+    grad_raster_time: float,
+    adc_raster_time: float,
+    adc_samples_limit: int,
+    adc_samples_divisor: int,
+    mode: str,
+) -> Tuple[int, int]:
+    """Search the ADC segmentation (memoized on the inputs and the system rasters and limits)."""
+    # Define maximum number of segments for the ADC
+    max_segments = 128
+
     # Get minimum number of samples for which the adc duration
     # is a multiple of grad raster time (GRT) and adc raster time (ART)
-    i_gr = round(system.grad_raster_time / system.adc_raster_time)  # GRT in units of ART
-    if not isclose(system.grad_raster_time / system.adc_raster_time, i_gr):
+    i_gr = round(grad_raster_time / adc_raster_time)  # GRT in units of ART
+    if not isclose(grad_raster_time / adc_raster_time, i_gr):
         raise ValueError("System 'grad_raster_time' is not a multiple of 'adc_raster_time'.")
 
-    i_dwell = round(dwell / system.adc_raster_time)  # dwell in units of ART
-    if not isclose(dwell / system.adc_raster_time, i_dwell):
+    i_dwell = round(dwell / adc_raster_time)  # dwell in units of ART
+    if not isclose(dwell / adc_raster_time, i_dwell):
         raise ValueError("'dwell' is not a multiple of system 'adc_raster_time'.")
 
     i_common = _lcm(i_gr, i_dwell)
     min_samples_segment = int(i_common / i_dwell)  # lcm(a,b)/b is always int
 
     # Siemens: Number of Samples should be divisible by a divisor
-    gcd_adcdiv = gcd(min_samples_segment, system.adc_samples_divisor)
-    if gcd_adcdiv != system.adc_samples_divisor:
-        min_samples_segment *= system.adc_samples_divisor / gcd_adcdiv
+    gcd_adcdiv = gcd(min_samples_segment, adc_samples_divisor)
+    if gcd_adcdiv != adc_samples_divisor:
+        min_samples_segment *= adc_samples_divisor / gcd_adcdiv
 
     # Get segment multiplier
     if mode == 'shorten':
@@ -176,23 +199,25 @@ def calc_adc_segments(
     else:
         samples_seg_multip = ceil(num_samples / min_samples_segment)
     while samples_seg_multip > 0 and samples_seg_multip < (2 * num_samples / min_samples_segment):
-        # Get prime factors from segments multiplier
-        adc_seg_primes = _prime_factors(samples_seg_multip)
+        # Candidate numbers of segments are the products of any non-empty subset of the prime factors of the
+        # segments multiplier, i.e. all of its divisors except 1 (only 1 if the multiplier is prime)
+        num_segments_candids = _divisors(samples_seg_multip)[1:]
         num_segments = 1
-        if len(adc_seg_primes) > 1:
-            num_segments_candids = set()
-            for k in range(1, len(adc_seg_primes) + 1):
-                num_segments_candids |= {prod(perm) for perm in itertools.combinations(adc_seg_primes, k)}
+        if len(num_segments_candids) > 1:
+            # Skip candidates that result in too many samples per segment
+            first = max(
+                bisect_left(num_segments_candids, samples_seg_multip * min_samples_segment / adc_samples_limit) - 1, 0
+            )
             # Find suitable candidate
-            for num_segments in sorted(num_segments_candids):
+            for num_segments in num_segments_candids[first:]:
                 num_samples_seg = samples_seg_multip * min_samples_segment / num_segments
-                if num_samples_seg <= system.adc_samples_limit and num_segments <= max_segments:
+                if num_samples_seg <= adc_samples_limit and num_segments <= max_segments:
                     break  # Found segments and samples
         else:  # Only one possible solution
             num_samples_seg = samples_seg_multip * min_samples_segment
 
         # Does output already fulfill constraints?
-        if num_samples_seg <= system.adc_samples_limit and num_segments <= max_segments:
+        if num_samples_seg <= adc_samples_limit and num_segments <= max_segments:
             break
         else:  # Shorten or lengthen the number of samples per segment
             samples_seg_multip += 1 if mode == 'lengthen' else -1
@@ -208,28 +233,12 @@ def calc_adc_segments(
     return int(num_segments), int(num_samples_seg)
 
 
-def _prime_factors(n: int) -> List[int]:
-    """Compute the prime factors of given integer n."""
-    if n == 1:
-        return [1]
-    else:
-        factors = []
-        # Dividing n by 2 until it's odd
-        while n % 2 == 0:
-            factors.append(2)
-            n //= 2
-
-        # Checking odd factors from 3 upwards
-        i = 3
-        while i * i <= n:
-            while n % i == 0:
-                factors.append(i)
-                n //= i
-            i += 2
-        if n > 2:
-            factors.append(n)
-
-        return factors
+@lru_cache(maxsize=4096)
+def _divisors(n: int) -> Tuple[int, ...]:
+    """Compute the sorted divisors of given integer n."""
+    small = [i for i in range(1, isqrt(n) + 1) if n % i == 0]
+    large = [n // i for i in reversed(small) if i * i != n]
+    return tuple(small + large)
 
 
 def _lcm(a, b):
@@ -10,6 +10,7 @@
 from pypulseq.make_trapezoid import make_trapezoid
 from pypulseq.opts import Opts
 from pypulseq.supported_labels_rf_use import get_supported_rf_uses
+from pypulseq.utils.pulse_cache import cached_pulse
 from pypulseq.utils.tracing import trace, trace_enabled
 
 
@@ -146,90 +147,40 @@ def make_adiabatic_pulse(
     if return_gz and slice_thickness <= 0:
         raise ValueError('Slice thickness must be provided')
 
-    valid_pulse_types = ['hypsec', 'wurst']
-    if (not pulse_type) or (pulse_type not in valid_pulse_types):
-        raise ValueError(f'Invalid type parameter. Must be one of {valid_pulse_types}.Passed: {pulse_type}')
-    valid_rf_use_labels = get_supported_rf_uses()
-    if use != '' and use not in valid_rf_use_labels:
-        raise ValueError(f'Invalid use parameter. Must be one of {valid_rf_use_labels}. Passed: {use}')
+    _check_pulse_type_and_use(pulse_type, use)
 
     if dwell is None:
         dwell = system.rf_raster_time
 
-    # WTC and PS - we have no idea why eps is added here. Leaving for now.
-    n_raw = round(duration / dwell + eps)
-    # Number of points must be divisible by 4 - requirement of individual pulse functions
-    n_samples = math.floor(n_raw / 4) * 4
-
-    if pulse_type == 'hypsec':
-        amp_mod, freq_mod = _hypsec(n=n_samples, beta=beta, mu=mu, dur=duration)
-    elif pulse_type == 'wurst':
-        amp_mod, freq_mod = _wurst(n=n_samples, n_fac=n_fac, bw=bandwidth, dur=duration)
-
-    phase_mod = np.cumsum(freq_mod) * dwell
-
-    min_abs_freq_idx = np.argmin(np.abs(freq_mod))
-    min_abs_freq_value = abs(freq_mod[min_abs_freq_idx])
-
-    # Find rate of change of frequency at the center of the pulse
-    if min_abs_freq_value == 0:
-        phase_at_zero_freq = phase_mod[min_abs_freq_idx]
-        amp_at_zero_freq = amp_mod[min_abs_freq_idx]
-        rate_of_freq_change = abs(freq_mod[min_abs_freq_idx + 1] - freq_mod[min_abs_freq_idx - 1]) / (2 * dwell)
-    else:  # We need to bracket the zero-crossing
-        b = 1 if freq_mod[min_abs_freq_idx] * freq_mod[min_abs_freq_idx + 1] < 0 else -1
-        diff_freq = freq_mod[min_abs_freq_idx + b] - freq_mod[min_abs_freq_idx]
-
-        phase_at_zero_freq = (
-            phase_mod[min_abs_freq_idx] * freq_mod[min_abs_freq_idx + b]
-            - phase_mod[min_abs_freq_idx + b] * freq_mod[min_abs_freq_idx]
-        ) / diff_freq
-
-        amp_at_zero_freq = (
-            amp_mod[min_abs_freq_idx] * freq_mod[min_abs_freq_idx + b]
-            - amp_mod[min_abs_freq_idx + b] * freq_mod[min_abs_freq_idx]
-        ) / diff_freq
-
-        rate_of_freq_change = abs(freq_mod[min_abs_freq_idx] - freq_mod[min_abs_freq_idx + b]) / dwell
-
-    # Adjust phase modulation and calculate amplitude
-    phase_mod -= phase_at_zero_freq
-    amp = np.sqrt(rate_of_freq_change * adiabaticity) / (2 * np.pi * amp_at_zero_freq)
-
-    # Create the modulated signal
-    signal = amp * amp_mod * np.exp(1j * phase_mod)
-
-    # Adjust the number of samples if needed
-    if n_samples != n_raw:
-        n_pad = n_raw - n_samples
-        pad_left = n_pad // 2
-        pad_right = n_pad - pad_left
-        signal = np.pad(signal, (pad_left, pad_right), mode='constant')
-        n_samples = n_raw
-
-    # Calculate time points
-    t = (np.arange(n_samples) + 0.5) * dwell
-
-    rf = SimpleNamespace()
-    rf.type = 'rf'
-    rf.signal = signal
-    rf.t = t
-    rf.shape_dur = n_samples * dwell
-    rf.freq_offset = freq_offset
-    rf.phase_offset = phase_offset
-    rf.freq_ppm = freq_ppm
-    rf.phase_ppm = phase_ppm
-    rf.dead_time = system.rf_dead_time
-    rf.ringdown_time = system.rf_ringdown_time
-    rf.delay = delay
-    rf.center, _ = calc_rf_center(rf)
-    rf.use = use
-    if rf.dead_time > rf.delay:
-        warn(
-            f'Specified RF delay {rf.delay * 1e6:.2f} us is less than the dead time {rf.dead_time * 1e6:.0f} us. Delay was increased to the dead time.',
-            stacklevel=2,
-        )
-        rf.delay = rf.dead_time
+    def design():
+        # WTC and PS - we have no idea why eps is added here. Leaving for now.
+        n_raw = round(duration / dwell + eps)
+        signal = _adiabatic_signal(pulse_type, n_raw, dwell, duration, adiabaticity, bandwidth, beta, mu, n_fac)
+        return {'signal': signal}
+
+    params = {
+        'pulse_type': pulse_type,
+        'adiabaticity': adiabaticity,
+        'bandwidth': bandwidth,
+        'beta': beta,
+        'mu': mu,
+        'n_fac': n_fac,
+        'duration': duration,
+        'dwell': dwell,
+    }
+    signal = cached_pulse('adiabatic', params, design)['signal']
+
+    rf = _make_rf_event(
+        signal,
+        dwell=dwell,
+        delay=_check_delay(delay, system),
+        freq_offset=freq_offset,
+        phase_offset=phase_offset,
+        freq_ppm=freq_ppm,
+        phase_ppm=phase_ppm,
+        use=use,
+        system=system,
+    )
 
     if return_gz:
         max_grad_slice_select = max_grad
@@ -275,6 +226,147 @@ def make_adiabatic_pulse(
         return rf
 
 
+def _check_pulse_type_and_use(pulse_type: str, use: str) -> None:
+    """Validate the pulse type and use of `make_adiabatic_pulse()` and `make_adiabatic_pulses()`."""
+    valid_pulse_types = ['hypsec', 'wurst']
+    if (not pulse_type) or (pulse_type not in valid_pulse_types):
+        raise ValueError(f'Invalid type parameter. Must be one of {valid_pulse_types}.Passed: {pulse_type}')
+    valid_rf_use_labels = get_supported_rf_uses()
+    if use != '' and use not in valid_rf_use_labels:
+        raise ValueError(f'Invalid use parameter. Must be one of {valid_rf_use_labels}. Passed: {use}')
+
+
+def _check_delay(delay: float, system: Opts) -> float:
+    """Returns the RF delay, increased to the RF dead time (with a warning) if it is shorter."""
+    if system.rf_dead_time > delay:
+        warn(
+            f'Specified RF delay {delay * 1e6:.2f} us is less than the dead time {system.rf_dead_time * 1e6:.0f} us. Delay was increased to the dead time.',
+            stacklevel=3,
+        )
+        delay = system.rf_dead_time
+    return delay
+
+
+def _make_rf_event(
+    signal: np.ndarray,
+    dwell: float,
+    delay: float,
+    freq_offset: float,
+    phase_offset: float,
+    freq_ppm: float,
+    phase_ppm: float,
+    use: str,
+    system: Opts,
+) -> SimpleNamespace:
+    """Build the RF event of an adiabatic pulse with the given waveform."""
+    n_samples = len(signal)
+
+    rf = SimpleNamespace()
+    rf.type = 'rf'
+    rf.signal = signal
+    rf.t = (np.arange(n_samples) + 0.5) * dwell
+    rf.shape_dur = n_samples * dwell
+    rf.freq_offset = freq_offset
+    rf.phase_offset = phase_offset
+    rf.freq_ppm = freq_ppm
+    rf.phase_ppm = phase_ppm
+    rf.dead_time = system.rf_dead_time
+    rf.ringdown_time = system.rf_ringdown_time
+    rf.delay = delay
+    rf.center, _ = calc_rf_center(rf)
+    rf.use = use
+    return rf
+
+
+def _adiabatic_signal(
+    pulse_type: str,
+    n_raw: int,
+    dwell: float,
+    duration: float,
+    adiabaticity: Union[float, np.ndarray],
+    bandwidth: Union[float, np.ndarray],
+    beta: Union[float, np.ndarray],
+    mu: Union[float, np.ndarray],
+    n_fac: Union[float, np.ndarray],
+) -> np.ndarray:
+    """
+    Calculate the scaled complex waveforms of adiabatic pulses with `n_raw` samples. The pulse parameters are
+    broadcast against each other, the result has shape `(*broadcast_shape, n_raw)`.
+    """
+    # Number of points must be divisible by 4 - requirement of individual pulse functions
+    n_samples = math.floor(n_raw / 4) * 4
+
+    if pulse_type == 'hypsec':
+        amp_mod, freq_mod = _hypsec(n=n_samples, beta=beta, mu=mu, dur=duration)
+    elif pulse_type == 'wurst':
+        amp_mod, freq_mod = _wurst(n=n_samples, n_fac=n_fac, bw=bandwidth, dur=duration)
+
+    shape = np.broadcast_shapes(amp_mod.shape, freq_mod.shape, (*np.shape(adiabaticity), 1))
+    amp_mod = np.broadcast_to(amp_mod, shape)
+    freq_mod = np.broadcast_to(freq_mod, shape)
+
+    phase_mod = np.cumsum(freq_mod, axis=-1) * dwell
+
+    def at(x: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(x, idx[..., None], axis=-1)[..., 0]
+
+    min_abs_freq_idx = np.argmin(np.abs(freq_mod), axis=-1)
+    min_abs_freq_value = np.abs(at(freq_mod, min_abs_freq_idx))
+    next_idx = np.minimum(min_abs_freq_idx + 1, n_samples - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Find rate of change of frequency at the center of the pulse, if the frequency passes zero exactly
+        phase_at_zero_freq = at(phase_mod, min_abs_freq_idx)
+        amp_at_zero_freq = at(amp_mod, min_abs_freq_idx)
+        rate_of_freq_change = np.abs(at(freq_mod, next_idx) - at(freq_mod, min_abs_freq_idx - 1)) / (2 * dwell)
+
+        # Otherwise we need to bracket the zero-crossing
+        b = np.where(at(freq_mod, min_abs_freq_idx) * at(freq_mod, next_idx) < 0, 1, -1)
+        bracket_idx = np.clip(min_abs_freq_idx + b, 0, n_samples - 1)
+        diff_freq = at(freq_mod, bracket_idx) - at(freq_mod, min_abs_freq_idx)
+
+        bracketed = min_abs_freq_value != 0
+        phase_at_zero_freq = np.where(
+            bracketed,
+            (
+                at(phase_mod, min_abs_freq_idx) * at(freq_mod, bracket_idx)
+                - at(phase_mod, bracket_idx) * at(freq_mod, min_abs_freq_idx)
+            )
+            / diff_freq,
+            phase_at_zero_freq,
+        )
+        amp_at_zero_freq = np.where(
+            bracketed,
+            (
+                at(amp_mod, min_abs_freq_idx) * at(freq_mod, bracket_idx)
+                - at(amp_mod, bracket_idx) * at(freq_mod, min_abs_freq_idx)
+            )
+            / diff_freq,
+            amp_at_zero_freq,
+        )
+        rate_of_freq_change = np.where(
+            bracketed,
+            np.abs(at(freq_mod, min_abs_freq_idx) - at(freq_mod, bracket_idx)) / dwell,
+            rate_of_freq_change,
+        )
+
+    # Adjust phase modulation and calculate amplitude
+    phase_mod = phase_mod - phase_at_zero_freq[..., None]
+    amp = np.sqrt(rate_of_freq_change * adiabaticity) / (2 * np.pi * amp_at_zero_freq)
+
+    # Create the modulated signal
+    signal = amp[..., None] * amp_mod * np.exp(1j * phase_mod)
+
+    # Adjust the number of samples if needed
+    if n_samples != n_raw:
+        n_pad = n_raw - n_samples
+        pad_left = n_pad // 2
+        pad_right = n_pad - pad_left
+        signal = np.pad(signal, [(0, 0)] * (signal.ndim - 1) + [(pad_left, pad_right)], mode='constant')
+
+    return signal
+
+
 """Adiabatic Pulse Design functions.
     The below functions are originally from ssigpy/sigpy/mri/rf/adiabatic.py
     Used under the terms of the Sigpy BSD 3-clause license.
@@ -323,12 +415,14 @@ def _bir4(n: int, beta: float, kappa: float, theta: float, dw0: np.ndarray):
         theta (float): flip angle in radians.
         dw0: FM waveform scaling (radians/s).
 
+    All parameters except `n` can be arrays, which are broadcast against each other.
+
     Returns
     -------
         2-element tuple containing
 
-        - **a** (*array*): AM waveform.
-        - **om** (*array*): FM waveform (radians/s).
+        - **a** (*array*): AM waveform(s), shape `(*broadcast_shape, n)`.
+        - **om** (*array*): FM waveform(s) (radians/s), shape `(*broadcast_shape, n)`.
 
     References
     ----------
@@ -336,6 +430,7 @@ def _bir4(n: int, beta: float, kappa: float, theta: float, dw0: np.ndarray):
         coil and a new adiabatic pulse, BIR-4'.
         Invest. Radiology, 25:559-567.
     """
+    beta, kappa, theta, dw0 = (np.asarray(x)[..., None] for x in (beta, kappa, theta, dw0))
     dphi = np.pi + theta / 2
 
     t = np.arange(0, n) / n
@@ -345,15 +440,16 @@ def _bir4(n: int, beta: float, kappa: float, theta: float, dw0: np.ndarray):
     a3 = np.tanh(beta * (3 - 4 * t[n // 2 : 3 * n // 4]))
     a4 = np.tanh(beta * (4 * t[3 * n // 4 :] - 3))
 
-    a = np.concatenate((a1, a2, a3, a4)).astype(np.complex64)
-    a[n // 4 : 3 * n // 4] = a[n // 4 : 3 * n // 4] * np.exp(1j * dphi)
+    shape = np.broadcast_shapes(beta.shape, kappa.shape, theta.shape, dw0.shape, (n,))
+    a = np.broadcast_to(np.concatenate((a1, a2, a3, a4), axis=-1), shape).astype(np.complex64)
+    a[..., n // 4 : 3 * n // 4] = a[..., n // 4 : 3 * n // 4] * np.exp(1j * dphi)
 
     om1 = dw0 * np.tan(kappa * 4 * t[: n // 4]) / np.tan(kappa)
     om2 = dw0 * np.tan(kappa * (4 * t[n // 4 : n // 2] - 2)) / np.tan(kappa)
     om3 = dw0 * np.tan(kappa * (4 * t[n // 2 : 3 * n // 4] - 2)) / np.tan(kappa)
     om4 = dw0 * np.tan(kappa * (4 * t[3 * n // 4 :] - 4)) / np.tan(kappa)
 
-    om = np.concatenate((om1, om2, om3, om4))
+    om = np.array(np.broadcast_to(np.concatenate((om1, om2, om3, om4), axis=-1), shape))
 
     return a, om
 
@@ -369,12 +465,14 @@ def _hypsec(n: int = 512, beta: float = 800.0, mu: float = 4.9, dur: float = 0.0
         mu (float): a constant, determines amplitude of frequency sweep.
         dur (float): pulse time (s).
 
+    All parameters except `n` can be arrays, which are broadcast against each other.
+
     Returns
     -------
         2-element tuple containing
 
-        - **a** (*array*): AM waveform.
-        - **om** (*array*): FM waveform (radians/s).
+        - **a** (*array*): AM waveform(s), shape `(*broadcast_shape, n)`.
+        - **om** (*array*): FM waveform(s) (radians/s), shape `(*broadcast_shape, n)`.
 
     References
     ----------
@@ -382,10 +480,13 @@ def _hypsec(n: int = 512, beta: float = 800.0, mu: float = 4.9, dur: float = 0.0
         inversion of a two-level system by phase-modulated pulses'.
         Phys. Rev. A., 32:3435-3447.
     """
+    beta, mu, dur = (np.asarray(x)[..., None] for x in (beta, mu, dur))
     t = np.arange(-n // 2, n // 2) / n * dur
 
     a = np.cosh(beta * t) ** -1
     om = -mu * beta * np.tanh(beta * t)
+    shape = np.broadcast_shapes(a.shape, om.shape)
+    a, om = np.array(np.broadcast_to(a, shape)), np.array(np.broadcast_to(om, shape))
 
     return a, om
 
@@ -401,13 +502,14 @@ def _wurst(n: int = 512, n_fac: int = 40, bw: float = 40e3, dur: float = 2e-3):
         bw (float): pulse bandwidth.
         dur (float): pulse time (s).
 
+    All parameters except `n` can be arrays, which are broadcast against each other.
 
     Returns
     -------
         2-element tuple containing
 
-        - **a** (*array*): AM waveform.
-        - **om** (*array*): FM waveform (radians/s).
+        - **a** (*array*): AM waveform(s), shape `(*broadcast_shape, n)`.
+        - **om** (*array*): FM waveform(s) (radians/s), shape `(*broadcast_shape, n)`.
 
     References
     ----------
@@ -415,10 +517,13 @@ def _wurst(n: int = 512, n_fac: int = 40, bw: float = 40e3, dur: float = 2e-3):
         Broadband Spin Inversion'.
         J. Magn. Reason. Set. A., 117:246-256.
     """
+    n_fac, bw, dur = (np.asarray(x)[..., None] for x in (n_fac, bw, dur))
     t = np.arange(0, n) * dur / n
 
     a = 1 - np.power(np.abs(np.cos(np.pi * t / dur)), n_fac)
-    om = np.linspace(-bw / 2, bw / 2, n) * 2 * np.pi
+    om = np.linspace(-bw[..., 0] / 2, bw[..., 0] / 2, n, axis=-1) * 2 * np.pi
+    shape = np.broadcast_shapes(a.shape, om.shape)
+    a, om = np.array(np.broadcast_to(a, shape)), np.array(np.broadcast_to(om, shape))
 
     return a, om
 
@@ -444,13 +549,15 @@ def _goia_wurst(
         b1_max (float): maximum b1 (Hz)
         bw (float): pulse bandwidth (Hz)
 
+    All parameters except `n` can be arrays, which are broadcast against each other.
+
     Returns
     -------
         3-element tuple containing:
 
-        - **a** (*array*): AM waveform (Hz)
-        - **om** (*array*): FM waveform (Hz)
-        - **g** (*array*): normalized gradient waveform
+        - **a** (*array*): AM waveform(s) (Hz), shape `(*broadcast_shape, n)`
+        - **om** (*array*): FM waveform(s) (Hz), shape `(*broadcast_shape, n)`
+        - **g** (*array*): normalized gradient waveform(s), shape `(*broadcast_shape, n)`
 
     References
     ----------
@@ -459,14 +566,17 @@ def _goia_wurst(
         J Magn Reason, 203:283-293, 2010.
 
     """
+    dur, f, n_b1, m_grad, b1_max, bw = (np.asarray(x)[..., None] for x in (dur, f, n_b1, m_grad, b1_max, bw))
     t = np.arange(0, n) * dur / n
 
     a = b1_max * (1 - np.abs(np.sin(np.pi / 2 * (2 * t / dur - 1))) ** n_b1)
     g = (1 - f) + f * np.abs(np.sin(np.pi / 2 * (2 * t / dur - 1))) ** m_grad
-    om = np.cumsum((a**2) / g) * dur / n
-    om = om - om[n // 2 + 1]
+    om = np.cumsum((a**2) / g, axis=-1) * dur / n
+    om = om - om[..., n // 2 + 1, None]
     om = g * om
-    om = om / np.max(np.abs(om)) * bw / 2
+    om = om / np.max(np.abs(om), axis=-1, keepdims=True) * bw / 2
+    shape = om.shape
+    a, g = np.array(np.broadcast_to(a, shape)), np.array(np.broadcast_to(g, shape))
 
     return a, om, g
 
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+from typing import List, Union
+
+import numpy as np
+
+from pypulseq import eps
+from pypulseq.make_adiabatic_pulse import _adiabatic_signal, _check_delay, _check_pulse_type_and_use, _make_rf_event
+from pypulseq.opts import Opts
+from pypulseq.utils.tracing import trace, trace_enabled
+
+
+def make_adiabatic_pulses(
+    pulse_type: str,
+    adiabaticity: Union[float, np.ndarray] = 4,
+    bandwidth: Union[float, np.ndarray] = 40000,
+    beta: Union[float, np.ndarray] = 800.0,
+    delay: float = 0.0,
+    duration: float = 10e-3,
+    dwell: Union[float, None] = None,
+    freq_offset: float = 0.0,
+    n_fac: Union[float, np.ndarray] = 40,
+    mu: Union[float, np.ndarray] = 4.9,
+    phase_offset: float = 0.0,
+    system: Union[Opts, None] = None,
+    use: str = 'inversion',
+    freq_ppm: float = 0.0,
+    phase_ppm: float = 0.0,
+) -> List[SimpleNamespace]:
+    """
+    Make a family of adiabatic inversion pulses for arrays of design parameters, e.g. for adiabaticity sweeps or
+    B1-robust pulse design.
+
+    `adiabaticity`, `bandwidth`, `beta`, `n_fac` and `mu` can be arrays, which are broadcast against each other. All
+    waveforms are calculated in one vectorized pass. Element `i` of the returned list is identical to
+    `make_adiabatic_pulse()` with the `i`-th combination of parameters (in C order of the broadcast shape). All pulses
+    share the same duration and time points.
+
+    See Also
+    --------
+    - `pypulseq.make_adiabatic_pulse.make_adiabatic_pulse()`
+
+    Parameters
+    ----------
+    pulse_type : str
+        One of 'hypsec' or 'wurst' pulse types.
+    adiabaticity : numpy.ndarray, default=4
+    bandwidth : numpy.ndarray, default=40000
+        Pulse bandwidth. Only used for 'wurst'.
+    beta : numpy.ndarray, default=800.0
+        AM waveform parameter. Only used for 'hypsec'.
+    n_fac : numpy.ndarray, default=40
+        Power to exponentiate to within AM term. Only used for 'wurst'.
+    mu : numpy.ndarray, default=4.9
+        Constant determining amplitude of frequency sweep. Only used for 'hypsec'.
+
+    All other parameters are as in `make_adiabatic_pulse()`.
+
+    Returns
+    -------
+    rfs : list of SimpleNamespace
+        Adiabatic RF pulse events, one per parameter combination.
+
+    Raises
+    ------
+    ValueError
+        If invalid pulse type is encountered.
+        If invalid pulse use is encountered.
+    """
+    if system is None:
+        system = Opts.default
+
+    _check_pulse_type_and_use(pulse_type, use)
+
+    if dwell is None:
+        dwell = system.rf_raster_time
+
+    # Same number of samples as `make_adiabatic_pulse()`
+    n_raw = round(duration / dwell + eps)
+    shape = np.broadcast_shapes(*(np.shape(x) for x in (adiabaticity, bandwidth, beta, n_fac, mu)))
+    signals = _adiabatic_signal(pulse_type, n_raw, dwell, duration, adiabaticity, bandwidth, beta, mu, n_fac)
+    # Parameters that the pulse type ignores broadcast to read-only views of the same waveform, so the waveforms are
+    # copied into one writable array
+    signals = np.array(np.broadcast_to(signals, (*shape, n_raw))).reshape(-1, n_raw)
+
+    delay = _check_delay(delay, system)
+    rf_trace = trace() if trace_enabled() else None
+
+    rfs = []
+    for signal in signals:
+        rf = _make_rf_event(
+            signal,
+            dwell=dwell,
+            delay=delay,
+            freq_offset=freq_offset,
+            phase_offset=phase_offset,
+            freq_ppm=freq_ppm,
+            phase_ppm=phase_ppm,
+            use=use,
+            system=system,
+        )
+        if rf_trace is not None:
+            rf.trace = rf_trace
+        rfs.append(rf)
+
+    return rfs
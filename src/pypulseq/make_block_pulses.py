@@ -0,0 +1,68 @@
+from typing import Union
+
+import numpy as np
+
+from pypulseq.make_block_pulse import make_block_pulse
+from pypulseq.opts import Opts
+from pypulseq.rf_pulse_set import RFPulseSet
+
+
+def make_block_pulses(
+    flip_angle: float,
+    freq_offset: Union[float, np.ndarray] = 0.0,
+    phase_offset: Union[float, np.ndarray] = 0.0,
+    delay: float = 0.0,
+    duration: Union[float, None] = None,
+    bandwidth: Union[float, None] = None,
+    time_bw_product: Union[float, None] = None,
+    system: Union[Opts, None] = None,
+    use: str = 'undefined',
+    freq_ppm: float = 0.0,
+    phase_ppm: float = 0.0,
+) -> RFPulseSet:
+    """
+    Create a set of block (RECT or hard) pulses that only differ in frequency and phase offset.
+
+    The waveform is designed once. Element `i` of the returned set is identical to
+    `make_block_pulse(flip_angle, freq_offset=freq_offset[i], phase_offset=phase_offset[i], ...)`.
+
+    See Also
+    --------
+    - `pypulseq.make_block_pulse.make_block_pulse()`
+    - `pypulseq.rf_pulse_set.RFPulseSet`
+
+    Parameters
+    ----------
+    flip_angle : float
+        Flip angle in radians.
+    freq_offset : numpy.ndarray, default=0
+        Frequency offsets in Hertz (Hz), array of any shape.
+    phase_offset : numpy.ndarray, default=0
+        Phase offsets in radians (rad), broadcastable to `freq_offset`.
+
+    All other parameters are as in `make_block_pulse()`.
+
+    Returns
+    -------
+    rf : RFPulseSet
+        Set of radio-frequency block pulse events.
+
+    Raises
+    ------
+    ValueError
+        If invalid `use` parameter is passed.
+        One of bandwidth or duration must be defined, but not both.
+        One of bandwidth or duration must be defined and be > 0.
+    """
+    rf = make_block_pulse(
+        flip_angle=flip_angle,
+        delay=delay,
+        duration=duration,
+        bandwidth=bandwidth,
+        time_bw_product=time_bw_product,
+        system=system,
+        use=use,
+        freq_ppm=freq_ppm,
+        phase_ppm=phase_ppm,
+    )
+    return RFPulseSet(rf, freq_offset, phase_offset)
@@ -1,5 +1,7 @@
+import math
+from functools import lru_cache
 from types import SimpleNamespace
-from typing import Tuple, Union
+from typing import List, Tuple, Union
 
 import numpy as np
 
@@ -10,6 +12,268 @@
 from pypulseq.utils.tracing import trace, trace_enabled
 
 
+def _to_raster(time: float, raster_time: float) -> float:
+    return math.ceil(time / raster_time) * raster_time
+
+
+def _calc_ramp_time(grad_1: float, grad_2: float, max_slew: float, raster_time: float) -> float:
+    return _to_raster(abs(grad_1 - grad_2) / max_slew, raster_time)
+
+
+def _max_slew_timings(
+    duration: int, grad_start: float, grad_end: float, max_slew: float, max_grad: float, raster_time: float
+) -> List[Tuple[int, int]]:
+    """Ramp-up and ramp-down times (in integer multiples of raster_time) of the solutions with maximum slew rate."""
+    timings = []
+
+    # Analytically calculate calculate the point where:
+    #   grad_start + ramp_up_time * max_slew == grad_end + ramp_down_time * max_slew
+    ramp_up_time = (duration * max_slew * raster_time - grad_start + grad_end) / (2 * max_slew * raster_time)
+    ramp_up_time = round(ramp_up_time)
+
+    # Check if gradient amplitude exceeds max_grad, if so, adjust ramp
+    # times for a trapezoidal gradient with maximum slew rate.
+    if grad_start + ramp_up_time * max_slew * raster_time > max_grad + eps:
+        ramp_up_time = round(_calc_ramp_time(grad_start, max_grad, max_slew, raster_time) / raster_time)
+        ramp_down_time = round(_calc_ramp_time(grad_end, max_grad, max_slew, raster_time) / raster_time)
+    else:
+        ramp_down_time = duration - ramp_up_time
+
+    # Add possible solution if timing is valid
+    if ramp_up_time > 0 and ramp_down_time > 0 and ramp_up_time + ramp_down_time <= duration:
+        timings.append((ramp_up_time, ramp_down_time))
+
+    # Analytically calculate calculate the point where:
+    #   grad_start - ramp_up_time * max_slew == grad_end - ramp_down_time * max_slew
+    ramp_up_time = (duration * max_slew * raster_time + grad_start - grad_end) / (2 * max_slew * raster_time)
+    ramp_up_time = round(ramp_up_time)
+
+    # Check if gradient amplitude exceeds -max_grad, if so, adjust ramp
+    # times for a trapezoidal gradient with maximum slew rate.
+    if grad_start - ramp_up_time * max_slew * raster_time < -max_grad - eps:
+        ramp_up_time = round(_calc_ramp_time(grad_start, -max_grad, max_slew, raster_time) / raster_time)
+        ramp_down_time = round(_calc_ramp_time(grad_end, -max_grad, max_slew, raster_time) / raster_time)
+    else:
+        ramp_down_time = duration - ramp_up_time
+
+    # Add possible solution if timing is valid
+    if ramp_up_time > 0 and ramp_down_time > 0 and ramp_up_time + ramp_down_time <= duration:
+        timings.append((ramp_up_time, ramp_down_time))
+
+    return timings
+
+
+def _flat_zero_range(
+    duration: int,
+    area: float,
+    grad_start: float,
+    grad_end: float,
+    max_slew: float,
+    max_grad: float,
+    raster_time: float,
+    widen: bool,
+) -> Tuple[int, int]:
+    """
+    Range of ramp-up times (in integer multiples of raster_time) of the candidates with flat_time == 0 that satisfy
+    the max_grad and max_slew constraints.
+
+    The gradient amplitude is linear in the ramp-up time r, so each constraint is a linear inequality c + k * r >= 0.
+    With `widen`, the range is extended by a tolerance, so it contains all candidates that pass the checks of
+    `_check_timings()`. Otherwise, it is reduced by the tolerance, so all candidates in it pass these checks.
+    """
+    slew = max_slew * raster_time
+
+    # amp = a0 + a1 * r
+    a0 = (2 * area - duration * raster_time * grad_end) / (duration * raster_time)
+    a1 = -(grad_start - grad_end) / duration
+    tolerance = 1e-6 * (max_grad + slew * duration + abs(grad_start) + abs(grad_end) + abs(a0) + 1)
+    if not widen:
+        tolerance = -tolerance
+
+    # |amp| <= max_grad, |grad_start - amp| <= slew * r, |grad_end - amp| <= slew * (duration - r)
+    constraints = [
+        (max_grad - a0, -a1),
+        (max_grad + a0, a1),
+        (a0 - grad_start, slew + a1),
+        (grad_start - a0, slew - a1),
+        (slew * duration - grad_end + a0, a1 - slew),
+        (slew * duration + grad_end - a0, -slew - a1),
+    ]
+
+    lower = 1
+    upper = duration - 1
+    for c, k in constraints:
+        c += tolerance
+        if k > 0:
+            bound = -c / k
+            lower = max(lower, math.floor(bound) - 1 if widen else math.ceil(bound))
+        elif k < 0:
+            bound = -c / k
+            upper = min(upper, math.ceil(bound) + 1 if widen else math.floor(bound))
+        elif c < 0:
+            # The constraint does not depend on r and is never satisfied
+            return 1, 0
+    return lower, upper
+
+
+def _check_timings(
+    time_ramp_up: np.ndarray,
+    flat_time: np.ndarray,
+    time_ramp_down: np.ndarray,
+    area: float,
+    grad_start: float,
+    grad_end: float,
+    max_slew: float,
+    max_grad: float,
+    raster_time: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gradient amplitudes, slew rates and validity of candidate timings, given as arrays or scalars."""
+    # Calculate gradient strength for given timing using analytical solution
+    grad_amp = -(time_ramp_up * raster_time * grad_start + time_ramp_down * raster_time * grad_end - 2 * area) / (
+        (time_ramp_up + 2 * flat_time + time_ramp_down) * raster_time
+    )
+
+    # Calculate slew rates for given timings
+    slew_rate1 = abs(grad_start - grad_amp) / (time_ramp_up * raster_time)
+    slew_rate2 = abs(grad_end - grad_amp) / (time_ramp_down * raster_time)
+
+    # Filter solutions that satisfy max_grad and max_slew constraints
+    valid = (abs(grad_amp) <= max_grad + 1e-8) & (slew_rate1 <= max_slew + 1e-8) & (slew_rate2 <= max_slew + 1e-8)
+    return grad_amp, slew_rate1 + slew_rate2, valid
+
+
+def _find_solution(
+    duration: int,
+    area: float,
+    grad_start: float,
+    grad_end: float,
+    max_slew: float,
+    max_grad: float,
+    raster_time: float,
+) -> Union[Tuple[int, int, int, float], None]:
+    """Find extended trapezoid gradient waveform for a given duration.
+
+    The function performs a grid search over the possible ramp-up, ramp-down and flat times
+    and returns the solution with the lowest slew rate.
+
+    Parameters
+    ----------
+    duration
+        duration of the gradient in integer multiples of raster_time
+
+    Returns
+    -------
+        Tuple of ramp-up time, flat time, ramp-down time, gradient amplitude or None if no solution was found
+    """
+    args = (area, grad_start, grad_end, max_slew, max_grad, raster_time)
+
+    # First, consider solutions that use maximum slew rate
+    timings = _max_slew_timings(duration, grad_start, grad_end, max_slew, max_grad, raster_time)
+
+    # Second, try any solution with flat_time == 0
+    # This appears to be necessary for many cases, but going through all
+    # timings here is probably too conservative still. Ramp-up times
+    # outside of the (widened) range that satisfies the constraints are
+    # skipped, which does not change the result.
+    ramp_up_min, ramp_up_max = _flat_zero_range(duration, *args, widen=True)
+    ramp_up = np.arange(ramp_up_min, ramp_up_max + 1)
+    time_ramp_up = np.concatenate((np.array([t[0] for t in timings], dtype=int), ramp_up))
+    time_ramp_down = np.concatenate((np.array([t[1] for t in timings], dtype=int), duration - ramp_up))
+
+    # Calculate corresponding flat times
+    flat_time = duration - time_ramp_up - time_ramp_down
+
+    grad_amp, slew_rate, valid = _check_timings(time_ramp_up, flat_time, time_ramp_down, *args)
+
+    # Check if any valid solutions were found
+    if not np.any(valid):
+        return None
+
+    # Find solution with lowest slew rate and return it
+    solutions = np.flatnonzero(valid)
+    ind = solutions[np.argmin(slew_rate[solutions])]
+    return (int(time_ramp_up[ind]), int(flat_time[ind]), int(time_ramp_down[ind]), float(grad_amp[ind]))
+
+
+def _has_solution(
+    duration: int,
+    area: float,
+    grad_start: float,
+    grad_end: float,
+    max_slew: float,
+    max_grad: float,
+    raster_time: float,
+) -> bool:
+    """
+    Check if `_find_solution()` finds a solution for a given duration. Most durations are decided by checking the
+    solutions with maximum slew rate and the range of feasible ramp-up times, without a grid search.
+    """
+    args = (area, grad_start, grad_end, max_slew, max_grad, raster_time)
+
+    for time_ramp_up, time_ramp_down in _max_slew_timings(
+        duration, grad_start, grad_end, max_slew, max_grad, raster_time
+    ):
+        if _check_timings(time_ramp_up, duration - time_ramp_up - time_ramp_down, time_ramp_down, *args)[2]:
+            return True
+
+    ramp_up_min, ramp_up_max = _flat_zero_range(duration, *args, widen=False)
+    if ramp_up_min <= ramp_up_max:
+        return True
+    ramp_up_min, ramp_up_max = _flat_zero_range(duration, *args, widen=True)
+    if ramp_up_min > ramp_up_max:
+        return False
+
+    # Close to the boundary of the feasible durations, check the candidates
+    return _find_solution(duration, *args) is not None
+
+
+@lru_cache(maxsize=1024)
+def _solve(
+    area: float, grad_start: float, grad_end: float, max_slew: float, max_grad: float, raster_time: float
+) -> Tuple[int, int, int, float]:
+    """Find the shortest extended trapezoid timing (memoized on the inputs and the system limits)."""
+    args = (area, grad_start, grad_end, max_slew, max_grad, raster_time)
+
+    # Perform a linear search
+    # This is necessary because there can exist a dead space where solutions
+    # do not exist for some durations longer than the optimal duration. The
+    # binary search below fails to find the optimum in those cases.
+    # TODO: Check if range is sufficient, try to calculate the dead space.
+    min_duration = max(round(_calc_ramp_time(grad_end, grad_start, max_slew, raster_time) / raster_time), 2)
+
+    # Calculate duration needed to ramp down gradient to zero.
+    # From this point onwards, solutions can always be found by extending
+    # the duration and doing a binary search.
+    max_duration = max(
+        round(_calc_ramp_time(0, grad_start, max_slew, raster_time) / raster_time),
+        round(_calc_ramp_time(0, grad_end, max_slew, raster_time) / raster_time),
+        min_duration,
+    )
+
+    # Linear search
+    for duration in range(min_duration, max_duration + 1):
+        if _has_solution(duration, *args):
+            return _find_solution(duration, *args)
+
+    # Perform a binary search for duration > max_duration if no solution was found
+    # First, find the upper limit on duration where a solution exists by
+    # exponentially expanding the duration.
+    max_duration *= 2
+    while not _has_solution(max_duration, *args):
+        max_duration *= 2
+
+    lower_limit = max_duration // 2
+    upper_limit = max_duration
+    while lower_limit < upper_limit - 1:
+        test_value = (upper_limit + lower_limit) // 2
+        if _has_solution(test_value, *args):
+            upper_limit = test_value
+        else:
+            lower_limit = test_value
+
+    return _find_solution(upper_limit, *args)
+
+
 def make_extended_trapezoid_area(
     area: float,
     channel: str,
@@ -55,154 +319,7 @@ def make_extended_trapezoid_area(
     max_grad = system.max_grad * 0.99
     raster_time = system.grad_raster_time
 
-    def _to_raster(time: float) -> float:
-        return np.ceil(time / raster_time) * raster_time
-
-    def _calc_ramp_time(grad_1: float, grad_2: float) -> float:
-        return _to_raster(abs(grad_1 - grad_2) / max_slew)
-
-    def _find_solution(duration: int) -> Union[None, Tuple[int, int, int, float]]:
-        """Find extended trapezoid gradient waveform for given duration.
-
-        The function performs a grid search over all possible ramp-up, ramp-down and flat times
-        for the given duration and returns the solution with the lowest slew rate.
-
-        Parameters
-        ----------
-        duration
-            duration of the gradient in integer multiples of raster_time
-
-        Returns
-        -------
-            Tuple of ramp-up time, flat time, ramp-down time, gradient amplitude or None if no solution was found
-        """
-        # Determine timings to check for possible solutions
-        ramp_up_times = []
-        ramp_down_times = []
-
-        # First, consider solutions that use maximum slew rate:
-        # Analytically calculate calculate the point where:
-        #   grad_start + ramp_up_time * max_slew == grad_end + ramp_down_time * max_slew
-        ramp_up_time = (duration * max_slew * raster_time - grad_start + grad_end) / (2 * max_slew * raster_time)
-        ramp_up_time = round(ramp_up_time)
-
-        # Check if gradient amplitude exceeds max_grad, if so, adjust ramp
-        # times for a trapezoidal gradient with maximum slew rate.
-        if grad_start + ramp_up_time * max_slew * raster_time > max_grad + eps:
-            ramp_up_time = round(_calc_ramp_time(grad_start, max_grad) / raster_time)
-            ramp_down_time = round(_calc_ramp_time(grad_end, max_grad) / raster_time)
-        else:
-            ramp_down_time = duration - ramp_up_time
-
-        # Add possible solution if timing is valid
-        if ramp_up_time > 0 and ramp_down_time > 0 and ramp_up_time + ramp_down_time <= duration:
-            ramp_up_times.append(ramp_up_time)
-            ramp_down_times.append(ramp_down_time)
-
-        # Analytically calculate calculate the point where:
-        #   grad_start - ramp_up_time * max_slew == grad_end - ramp_down_time * max_slew
-        ramp_up_time = (duration * max_slew * raster_time + grad_start - grad_end) / (2 * max_slew * raster_time)
-        ramp_up_time = round(ramp_up_time)
-
-        # Check if gradient amplitude exceeds -max_grad, if so, adjust ramp
-        # times for a trapezoidal gradient with maximum slew rate.
-        if grad_start - ramp_up_time * max_slew * raster_time < -max_grad - eps:
-            ramp_up_time = round(_calc_ramp_time(grad_start, -max_grad) / raster_time)
-            ramp_down_time = round(_calc_ramp_time(grad_end, -max_grad) / raster_time)
-        else:
-            ramp_down_time = duration - ramp_up_time
-
-        # Add possible solution if timing is valid
-        if ramp_up_time > 0 and ramp_down_time > 0 and ramp_up_time + ramp_down_time <= duration:
-            ramp_up_times.append(ramp_up_time)
-            ramp_down_times.append(ramp_down_time)
-
-        # Second, try any solution with flat_time == 0
-        # This appears to be necessary for many cases, but going through all
-        # timings here is probably too conservative still.
-        for ramp_up_time in range(1, duration):
-            ramp_up_times.append(ramp_up_time)
-            ramp_down_times.append(duration - ramp_up_time)
-
-        time_ramp_up = np.array(ramp_up_times)
-        time_ramp_down = np.array(ramp_down_times)
-
-        # Calculate corresponding flat times
-        flat_time = duration - time_ramp_up - time_ramp_down
-
-        # Filter search space for valid timings (flat time >= 0)
-        valid_indices = flat_time >= 0
-        time_ramp_up = time_ramp_up[valid_indices]
-        time_ramp_down = time_ramp_down[valid_indices]
-        flat_time = flat_time[valid_indices]
-
-        # Calculate gradient strength for given timing using analytical solution
-        grad_amp = -(time_ramp_up * raster_time * grad_start + time_ramp_down * raster_time * grad_end - 2 * area) / (
-            (time_ramp_up + 2 * flat_time + time_ramp_down) * raster_time
-        )
-
-        # Calculate slew rates for given timings
-        slew_rate1 = abs(grad_start - grad_amp) / (time_ramp_up * raster_time)
-        slew_rate2 = abs(grad_end - grad_amp) / (time_ramp_down * raster_time)
-
-        # Filter solutions that satisfy max_grad and max_slew constraints
-        valid_indices = (
-            (abs(grad_amp) <= max_grad + 1e-8) & (slew_rate1 <= max_slew + 1e-8) & (slew_rate2 <= max_slew + 1e-8)
-        )
-        solutions = np.flatnonzero(valid_indices)
-
-        # Check if any valid solutions were found
-        if solutions.shape[0] == 0:
-            return None
-
-        # Find solution with lowest slew rate and return it
-        ind = np.argmin(slew_rate1[valid_indices] + slew_rate2[valid_indices])
-        ind = solutions[ind]
-        return (int(time_ramp_up[ind]), int(flat_time[ind]), int(time_ramp_down[ind]), float(grad_amp[ind]))
-
-    # Perform a linear search
-    # This is necessary because there can exist a dead space where solutions
-    # do not exist for some durations longer than the optimal duration. The
-    # binary search below fails to find the optimum in those cases.
-    # TODO: Check if range is sufficient, try to calculate the dead space.
-    min_duration = max(round(_calc_ramp_time(grad_end, grad_start) / raster_time), 2)
-
-    # Calculate duration needed to ramp down gradient to zero.
-    # From this point onwards, solutions can always be found by extending
-    # the duration and doing a binary search.
-    max_duration = max(
-        round(_calc_ramp_time(0, grad_start) / raster_time),
-        round(_calc_ramp_time(0, grad_end) / raster_time),
-        min_duration,
-    )
-
-    # Linear search
-    solution = None
-    for duration in range(min_duration, max_duration + 1):
-        solution = _find_solution(duration)
-        if solution:
-            break
-
-    # Perform a binary search for duration > max_duration if no solution was found
-    if not solution:
-        # First, find the upper limit on duration where a solution exists by
-        # exponentially expanding the duration.
-        while not solution:
-            max_duration *= 2
-            solution = _find_solution(max_duration)
-
-        def binary_search(fun, lower_limit, upper_limit):
-            if lower_limit == upper_limit - 1:
-                return fun(upper_limit)
-
-            test_value = (upper_limit + lower_limit) // 2
-
-            if fun(test_value):
-                return binary_search(fun, lower_limit, test_value)
-            else:
-                return binary_search(fun, test_value, upper_limit)
-
-        solution = binary_search(_find_solution, max_duration // 2, max_duration)
+    solution = _solve(float(area), float(grad_start), float(grad_end), max_slew, max_grad, raster_time)
 
     # Get timing and gradient amplitude from solution
     time_ramp_up = solution[0] * raster_time
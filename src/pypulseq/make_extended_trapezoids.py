@@ -0,0 +1,182 @@
+from types import SimpleNamespace
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from pypulseq import eps
+from pypulseq.opts import Opts
+from pypulseq.points_to_waveform import points_to_waveforms
+from pypulseq.utils.tracing import trace, trace_enabled
+
+
+def make_extended_trapezoids(
+    channel: str,
+    amplitudes: Union[np.ndarray, Sequence[np.ndarray]],
+    times: Union[np.ndarray, Sequence[np.ndarray]],
+    offsets: Union[np.ndarray, None] = None,
+    convert_to_arbitrary: bool = False,
+    max_grad: float = 0.0,
+    max_slew: float = 0.0,
+    skip_check: bool = False,
+    system: Union[Opts, None] = None,
+) -> List[SimpleNamespace]:
+    """
+    Create many extended trapezoid gradients on the same channel in one call, e.g. for rotated or scaled variants of
+    a gradient or for spiral interleaves.
+
+    The points of the gradients are passed in ragged (CSR) form: gradient `i` is defined by
+    `amplitudes[offsets[i]:offsets[i + 1]]` at `times[offsets[i]:offsets[i + 1]]`. Alternatively, `amplitudes` and
+    `times` can be sequences of arrays and `offsets` omitted. Checks and, with `convert_to_arbitrary`, the
+    interpolation onto the gradient raster are done for all gradients at once. Element `i` of the result is identical
+    to `make_extended_trapezoid()` with the points of gradient `i`.
+
+    See Also
+    --------
+    - `pypulseq.make_extended_trapezoid.make_extended_trapezoid()`
+    - `pypulseq.points_to_waveform.points_to_waveforms()`
+
+    Parameters
+    ----------
+    channel : str
+        Orientation of the gradient events. Must be one of 'x', 'y' or 'z'.
+    amplitudes : numpy.ndarray or sequence of numpy.ndarray
+        Concatenated amplitude values of all gradients, or one array per gradient.
+    times : numpy.ndarray or sequence of numpy.ndarray
+        Concatenated time points of all gradients, or one array per gradient.
+    offsets : numpy.ndarray, default=None
+        Start of each gradient in `amplitudes` and `times`, followed by the total number of points. Required if
+        `amplitudes` and `times` are concatenated arrays.
+    convert_to_arbitrary : bool, default=False
+        Boolean flag to indicate if the gradients have to be converted into arbitrary gradients.
+    max_grad : float, default=0
+        Maximum gradient strength.
+    max_slew : float, default=0
+        Maximum slew rate.
+    skip_check : bool, default=False
+        Boolean flag to indicate if the check of the first amplitude is to be skipped.
+    system : Opts, default=Opts()
+        System limits.
+
+    Returns
+    -------
+    grads : list of SimpleNamespace
+        Extended trapezoid gradient events.
+
+    Raises
+    ------
+    ValueError
+        If invalid `channel` is passed. Must be one of 'x', 'y' or 'z'.
+        If the points of any gradient violate the conditions of `make_extended_trapezoid()`.
+        If any gradient violates the slew rate or amplitude limits.
+    """
+    if system is None:
+        system = Opts.default
+
+    if channel not in ['x', 'y', 'z']:
+        raise ValueError(f"Invalid channel. Must be one of 'x', 'y' or 'z'. Passed: {channel}")
+
+    if offsets is None:
+        if len(amplitudes) != len(times):
+            raise ValueError('Times and amplitudes must have the same number of gradients.')
+        counts = [len(t) for t in times]
+        if [len(a) for a in amplitudes] != counts:
+            raise ValueError('Times and amplitudes must have the same length.')
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=int)))
+        amplitudes = np.concatenate([np.zeros(0), *amplitudes])
+        times = np.concatenate([np.zeros(0), *times])
+
+    amplitudes = np.asarray(amplitudes, dtype=float)
+    times = np.asarray(times, dtype=float)
+    offsets = np.asarray(offsets, dtype=int)
+    if len(times) != len(amplitudes) or offsets[-1] != len(times):
+        raise ValueError('Times and amplitudes must have the same length.')
+
+    num_grads = len(offsets) - 1
+    counts = np.diff(offsets)
+    if np.any(counts == 0):
+        raise ValueError('Every gradient must have at least one point.')
+    first = offsets[:-1]
+    last = offsets[1:] - 1
+    point_grad = np.repeat(np.arange(num_grads), counts)
+    within = point_grad[1:] == point_grad[:-1]
+
+    if np.any(np.logical_and.reduceat(times == 0, first)):
+        raise ValueError('At least one of the given times must be non-zero')
+
+    if np.any(np.diff(times)[within] <= 0):
+        raise ValueError('Times must be in ascending order and all times must be distinct')
+
+    t_last = times[last]
+    if np.any(np.abs(np.round(t_last / system.grad_raster_time) * system.grad_raster_time - t_last) > eps):
+        raise ValueError('The last time point must be on a gradient raster')
+
+    if skip_check is False and np.any((times[first] > 0) & (amplitudes[first] != 0)):
+        raise ValueError('If first amplitude of a gradient is non-zero, it must connect to previous block')
+
+    if max_grad <= 0:
+        max_grad = system.max_grad
+
+    if max_slew <= 0:
+        max_slew = system.max_slew
+
+    if convert_to_arbitrary:
+        # Represent the extended trapezoids on the regularly sampled time grid
+        waveforms, waveform_offsets = points_to_waveforms(
+            amplitudes=amplitudes, grad_raster_time=system.grad_raster_time, times=times, offsets=offsets
+        )
+        lengths = np.diff(waveform_offsets)
+        if np.any(lengths < 2):
+            raise ValueError('Gradients converted to arbitrary gradients must span at least two raster periods.')
+
+        # Slew rate of the arbitrary gradients including the extrapolated edges (see `make_arbitrary_grad()`)
+        w_first = waveforms[waveform_offsets[:-1]]
+        w_last = waveforms[waveform_offsets[1:] - 1]
+        pre = 2 * (0.5 * (3 * w_first - waveforms[waveform_offsets[:-1] + 1]) - w_first)
+        post = 2 * (w_last - 0.5 * (3 * w_last - waveforms[waveform_offsets[1:] - 2]))
+        sample_grad = np.repeat(np.arange(num_grads), lengths)
+        slew = np.diff(waveforms)[sample_grad[1:] == sample_grad[:-1]]
+        max_abs_slew = max(np.max(np.abs(slew), initial=0), np.max(np.abs(pre)), np.max(np.abs(post)))
+        max_abs_slew /= system.grad_raster_time
+    else:
+        #  Keep the original possibly irregular sampling
+        if np.any(np.abs(np.round(times / system.grad_raster_time) * system.grad_raster_time - times) > eps):
+            raise ValueError(
+                'All time points must be on a gradient raster or "convert_to_arbitrary" option must be used.'
+            )
+        waveforms, waveform_offsets = amplitudes, offsets
+        slew = (np.diff(amplitudes) / np.diff(times))[within]
+        max_abs_slew = np.max(np.abs(slew), initial=0)
+
+    if max_abs_slew > max_slew * (1 + eps):
+        raise ValueError(f'Slew rate violation {max_abs_slew / max_slew * 100:.2f}%')
+
+    max_abs_grad = np.max(np.abs(waveforms), initial=0)
+    if max_abs_grad > max_grad + eps:
+        raise ValueError(f'Gradient amplitude violation {max_abs_grad / max_grad * 100:.2f}%')
+
+    grads = []
+    for i in range(num_grads):
+        grad = SimpleNamespace()
+        grad.type = 'grad'
+        grad.channel = channel
+        grad.waveform = waveforms[waveform_offsets[i] : waveform_offsets[i + 1]]
+        tt = times[offsets[i] : offsets[i + 1]]
+        if convert_to_arbitrary:
+            grad.delay = tt[0]
+            grad.area = grad.waveform.sum() * system.grad_raster_time
+            grad.tt = (np.arange(len(grad.waveform)) + 0.5) * system.grad_raster_time
+            grad.shape_dur = len(grad.waveform) * system.grad_raster_time
+        else:
+            grad.delay = round(tt[0] / system.grad_raster_time) * system.grad_raster_time
+            grad.tt = tt - grad.delay
+            grad.shape_dur = grad.tt[-1]
+            grad.area = 0.5 * ((grad.tt[1:] - grad.tt[:-1]) * (grad.waveform[1:] + grad.waveform[:-1])).sum()
+        grad.first = amplitudes[offsets[i]]
+        grad.last = amplitudes[offsets[i + 1] - 1]
+
+        if trace_enabled():
+            grad.trace = trace()
+
+        grads.append(grad)
+
+    return grads
@@ -0,0 +1,162 @@
+from types import SimpleNamespace
+from typing import Union
+
+import numpy as np
+
+
+def rotation_matrices(angles: np.ndarray, axis: str) -> np.ndarray:
+    """
+    Rotation matrices about the given axis with the sign convention of `pypulseq.rotate.rotate()`.
+
+    Parameters
+    ----------
+    angles : numpy.ndarray
+        Rotation angles (rad).
+    axis : str
+        Rotation axis, 'x', 'y' or 'z'.
+
+    Returns
+    -------
+    matrices : numpy.ndarray
+        Array of shape (n_angles, 3, 3) mapping gradient vectors (x, y, z) to rotated gradient vectors.
+    """
+    if axis not in ['x', 'y', 'z']:
+        raise ValueError('Incorrect axes specification.')
+
+    angles = np.asarray(angles, dtype=float).reshape(-1)
+    i_axis = ['x', 'y', 'z'].index(axis)
+    i1, i2 = [i for i in range(3) if i != i_axis]
+
+    cos, sin = np.cos(angles), np.sin(angles)
+    matrices = np.zeros((len(angles), 3, 3))
+    matrices[:, i_axis, i_axis] = 1
+    matrices[:, i1, i1] = cos
+    matrices[:, i2, i2] = cos
+    matrices[:, i2, i1] = sin
+    matrices[:, i1, i2] = -sin
+    return matrices
+
+
+def quaternion_to_matrix(quaternion: np.ndarray) -> np.ndarray:
+    """
+    Convert a unit quaternion (w, x, y, z) to a 3x3 rotation matrix.
+
+    Parameters
+    ----------
+    quaternion : numpy.ndarray
+        Unit quaternion (w, x, y, z).
+
+    Returns
+    -------
+    rotation_matrix : numpy.ndarray
+        Rotation matrix of shape (3, 3).
+    """
+    w, x, y, z = np.asarray(quaternion, dtype=float) / np.linalg.norm(quaternion)
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+            [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+            [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def matrix_to_quaternion(rotation_matrix: np.ndarray) -> np.ndarray:
+    """
+    Convert a 3x3 rotation matrix to a unit quaternion (w, x, y, z) with non-negative w.
+
+    Parameters
+    ----------
+    rotation_matrix : numpy.ndarray
+        Rotation matrix of shape (3, 3).
+
+    Returns
+    -------
+    quaternion : numpy.ndarray
+        Unit quaternion (w, x, y, z).
+    """
+    m = np.asarray(rotation_matrix, dtype=float)
+    trace = np.trace(m)
+
+    # Use the numerically most stable formula depending on the largest diagonal element
+    if trace > 0:
+        s = 2 * np.sqrt(1 + trace)
+        q = np.array([s / 4, (m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s])
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = 2 * np.sqrt(1 + m[0, 0] - m[1, 1] - m[2, 2])
+        q = np.array([(m[2, 1] - m[1, 2]) / s, s / 4, (m[0, 1] + m[1, 0]) / s, (m[0, 2] + m[2, 0]) / s])
+    elif m[1, 1] > m[2, 2]:
+        s = 2 * np.sqrt(1 + m[1, 1] - m[0, 0] - m[2, 2])
+        q = np.array([(m[0, 2] - m[2, 0]) / s, (m[0, 1] + m[1, 0]) / s, s / 4, (m[1, 2] + m[2, 1]) / s])
+    else:
+        s = 2 * np.sqrt(1 + m[2, 2] - m[0, 0] - m[1, 1])
+        q = np.array([(m[1, 0] - m[0, 1]) / s, (m[0, 2] + m[2, 0]) / s, (m[1, 2] + m[2, 1]) / s, s / 4])
+
+    q /= np.linalg.norm(q)
+    return -q if q[0] < 0 else q
+
+
+def make_rotation(
+    rotation_matrix: Union[np.ndarray, None] = None,
+    axis: Union[str, None] = None,
+    angle: Union[float, None] = None,
+    quaternion: Union[np.ndarray, None] = None,
+) -> SimpleNamespace:
+    """
+    Create a rotation extension event. When added to a block together with gradient events, the gradients of the block
+    are rotated on the fly: the block stores references to the unrotated gradients and the rotation, and the rotated
+    gradient vector is `rotation_matrix @ (gx, gy, gz)`.
+
+    Exactly one of `rotation_matrix`, `quaternion` or the combination of `axis` and `angle` has to be provided.
+    Rotations about an axis follow the sign convention of `pypulseq.rotate.rotate()`.
+
+    See also `pypulseq.Sequence.sequence.Sequence.add_block()`.
+
+    Parameters
+    ----------
+    rotation_matrix : numpy.ndarray, optional
+        Rotation matrix of shape (3, 3).
+    axis : str, optional
+        Rotation axis, 'x', 'y' or 'z'.
+    angle : float, optional
+        Rotation angle (rad) about `axis`.
+    quaternion : numpy.ndarray, optional
+        Unit quaternion (w, x, y, z).
+
+    Returns
+    -------
+    rotation : SimpleNamespace
+        Rotation event with the fields `rot_quaternion` and `rot_matrix`.
+
+    Raises
+    ------
+    ValueError
+        If not exactly one way of specifying the rotation is used.
+        If `rotation_matrix` is not a proper rotation matrix.
+    """
+    given = [rotation_matrix is not None, quaternion is not None, axis is not None or angle is not None]
+    if sum(given) != 1:
+        raise ValueError('Exactly one of `rotation_matrix`, `quaternion` or `axis` and `angle` must be provided.')
+
+    if quaternion is not None:
+        quaternion = np.asarray(quaternion, dtype=float)
+        if quaternion.shape != (4,) or np.linalg.norm(quaternion) == 0:
+            raise ValueError('`quaternion` must be a non-zero vector of length 4.')
+        rotation_matrix = quaternion_to_matrix(quaternion)
+    elif rotation_matrix is None:
+        if axis is None or angle is None:
+            raise ValueError('Both `axis` and `angle` must be provided.')
+        rotation_matrix = rotation_matrices([angle], axis)[0]
+
+    rotation_matrix = np.asarray(rotation_matrix, dtype=float)
+    if rotation_matrix.shape != (3, 3):
+        raise ValueError('`rotation_matrix` must have shape (3, 3).')
+    if not np.allclose(rotation_matrix @ rotation_matrix.T, np.eye(3), atol=1e-6) or np.linalg.det(rotation_matrix) < 0:
+        raise ValueError('`rotation_matrix` must be a proper rotation matrix.')
+
+    rotation = SimpleNamespace()
+    rotation.type = 'rot3D'
+    rotation.rot_quaternion = matrix_to_quaternion(rotation_matrix)
+    rotation.rot_matrix = quaternion_to_matrix(rotation.rot_quaternion)
+
+    return rotation
@@ -7,6 +7,7 @@
 import numpy as np
 
 try:
+    import sigpy
     import sigpy.mri.rf as rf
     import sigpy.plot as pl
 except ModuleNotFoundError as err:
@@ -18,6 +19,7 @@
 from pypulseq.opts import Opts
 from pypulseq.sigpy_pulse_opts import SigpyPulseOpts
 from pypulseq.supported_labels_rf_use import get_supported_rf_uses
+from pypulseq.utils.pulse_cache import cached_pulse
 from pypulseq.utils.tracing import trace, trace_enabled
 
 
@@ -232,15 +234,29 @@ def make_slr(
     d2 = pulse_cfg.d2
     cancel_alpha_phs = pulse_cfg.cancel_alpha_phs
 
-    pulse = rf.slr.dzrf(
-        n=n_samples,
-        tb=time_bw_product,
-        ptype=ptype,
-        ftype=ftype,
-        d1=d1,
-        d2=d2,
-        cancel_alpha_phs=cancel_alpha_phs,
-    )
+    def design():
+        pulse = rf.slr.dzrf(
+            n=n_samples,
+            tb=time_bw_product,
+            ptype=ptype,
+            ftype=ftype,
+            d1=d1,
+            d2=d2,
+            cancel_alpha_phs=cancel_alpha_phs,
+        )
+        return {'pulse': pulse}
+
+    params = {
+        'n': n_samples,
+        'tb': time_bw_product,
+        'ptype': ptype,
+        'ftype': ftype,
+        'd1': d1,
+        'd2': d2,
+        'cancel_alpha_phs': cancel_alpha_phs,
+        'sigpy': sigpy.__version__,
+    }
+    pulse = cached_pulse('slr', params, design)['pulse']
     flip = np.sum(pulse) * system.rf_raster_time * 2 * np.pi
     signal = pulse * flip_angle / flip
 
@@ -287,16 +303,35 @@ def make_sms(
     band_sep = pulse_cfg.band_sep
     phs_0_pt = pulse_cfg.phs_0_pt
 
-    pulse_in = rf.slr.dzrf(
-        n=n_samples,
-        tb=time_bw_product,
-        ptype=ptype,
-        ftype=ftype,
-        d1=d1,
-        d2=d2,
-        cancel_alpha_phs=cancel_alpha_phs,
-    )
-    pulse = rf.multiband.mb_rf(pulse_in, n_bands=n_bands, band_sep=band_sep, phs_0_pt=phs_0_pt)
+    def design():
+        pulse_in = rf.slr.dzrf(
+            n=n_samples,
+            tb=time_bw_product,
+            ptype=ptype,
+            ftype=ftype,
+            d1=d1,
+            d2=d2,
+            cancel_alpha_phs=cancel_alpha_phs,
+        )
+        pulse = rf.multiband.mb_rf(pulse_in, n_bands=n_bands, band_sep=band_sep, phs_0_pt=phs_0_pt)
+        return {'pulse_in': pulse_in, 'pulse': pulse}
+
+    params = {
+        'n': n_samples,
+        'tb': time_bw_product,
+        'ptype': ptype,
+        'ftype': ftype,
+        'd1': d1,
+        'd2': d2,
+        'cancel_alpha_phs': cancel_alpha_phs,
+        'n_bands': n_bands,
+        'band_sep': band_sep,
+        'phs_0_pt': phs_0_pt,
+        'sigpy': sigpy.__version__,
+    }
+    designed = cached_pulse('sms', params, design)
+    pulse_in = designed['pulse_in']
+    pulse = designed['pulse']
 
     flip = np.sum(pulse) * system.rf_raster_time * 2 * np.pi
     signal = pulse * flip_angle / flip
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from typing import Tuple, Union
+
+import numpy as np
+
+from pypulseq.make_sinc_pulse import make_sinc_pulse
+from pypulseq.opts import Opts
+from pypulseq.rf_pulse_set import RFPulseSet
+
+
+def make_sinc_pulses(
+    flip_angle: float,
+    freq_offset: Union[float, np.ndarray] = 0.0,
+    phase_offset: Union[float, np.ndarray] = 0.0,
+    slice_positions: Union[np.ndarray, None] = None,
+    apodization: float = 0.0,
+    delay: float = 0.0,
+    duration: float = 4e-3,
+    dwell: float = 0.0,
+    center_pos: float = 0.5,
+    max_grad: float = 0.0,
+    max_slew: float = 0.0,
+    return_gz: bool = False,
+    slice_thickness: float = 0.0,
+    system: Union[Opts, None] = None,
+    time_bw_product: float = 4.0,
+    use: str = 'undefined',
+    freq_ppm: float = 0.0,
+    phase_ppm: float = 0.0,
+) -> Union[RFPulseSet, Tuple[RFPulseSet, SimpleNamespace, SimpleNamespace]]:
+    """
+    Creates a set of radio-frequency sinc pulse events that only differ in frequency and phase offset (e.g. for
+    multi-slice or multi-band excitation) and optionally the shared slice select and slice select rephasing trapezoidal
+    gradient events.
+
+    The waveform and gradients are designed once. Element `i` of the returned set is identical to
+    `make_sinc_pulse(flip_angle, freq_offset=freq_offset[i], phase_offset=phase_offset[i], ...)`.
+
+    See Also
+    --------
+    - `pypulseq.make_sinc_pulse.make_sinc_pulse()`
+    - `pypulseq.rf_pulse_set.RFPulseSet`
+
+    Parameters
+    ----------
+    flip_angle : float
+        Flip angle in radians.
+    freq_offset : numpy.ndarray, default=0
+        Frequency offsets in Hertz (Hz), array of any shape.
+    phase_offset : numpy.ndarray, default=0
+        Phase offsets in radians (rad), broadcastable to `freq_offset`.
+    slice_positions : numpy.ndarray, default=None
+        Slice positions in meters (m). If provided, the frequency offsets of the slices, calculated from the slice
+        select gradient amplitude, are added to `freq_offset`. Requires `slice_thickness`.
+    slice_thickness : float, default=0
+        Slice thickness of accompanying slice select trapezoidal event. The slice thickness determines the area of the
+        slice select event.
+
+    All other parameters are as in `make_sinc_pulse()`.
+
+    Returns
+    -------
+    rf : RFPulseSet
+        Set of radio-frequency sinc pulse events.
+    gz : SimpleNamespace, optional
+        Accompanying slice select trapezoidal gradient event. Returned only if `return_gz=True`.
+    gzr : SimpleNamespace, optional
+        Accompanying slice select rephasing trapezoidal gradient event. Returned only if `return_gz=True`.
+
+    Raises
+    ------
+    ValueError
+        If invalid `use` parameter was passed.
+        If `return_gz=True` or `slice_positions` are given and `slice_thickness` was not provided.
+    """
+    if slice_positions is not None:
+        if slice_thickness == 0:
+            raise ValueError('Slice thickness must be provided')
+        freq_offset = freq_offset + time_bw_product / duration / slice_thickness * np.asarray(slice_positions)
+
+    result = make_sinc_pulse(
+        flip_angle=flip_angle,
+        apodization=apodization,
+        delay=delay,
+        duration=duration,
+        dwell=dwell,
+        center_pos=center_pos,
+        max_grad=max_grad,
+        max_slew=max_slew,
+        return_gz=return_gz,
+        slice_thickness=slice_thickness,
+        system=system,
+        time_bw_product=time_bw_product,
+        use=use,
+        freq_ppm=freq_ppm,
+        phase_ppm=phase_ppm,
+    )
+
+    if return_gz:
+        rf, gz, gzr = result
+        return RFPulseSet(rf, freq_offset, phase_offset), gz, gzr
+    else:
+        return RFPulseSet(result, freq_offset, phase_offset)
@@ -0,0 +1,249 @@
+from types import SimpleNamespace
+from typing import Tuple, Union
+
+import numpy as np
+
+from pypulseq import eps
+from pypulseq.opts import Opts
+
+
+class TrapezoidSet:
+    """
+    Array-backed set of trapezoidal gradient events on the same channel, e.g. a phase encoding table.
+
+    Indexing the set with an integer (or a tuple of integers for multi-dimensional sets) returns a trapezoid event
+    identical to the one returned by `make_trapezoid()`, which can be passed to `Sequence.add_block()` directly.
+    Indexing with slices or arrays returns a `TrapezoidSet` with the selected events.
+
+    See Also
+    --------
+    - `pypulseq.make_trapezoids.make_trapezoids()`
+
+    Attributes
+    ----------
+    channel : str
+        Orientation of the gradient events.
+    amplitude, rise_time, flat_time, fall_time, area, flat_area, delay : numpy.ndarray
+        Parameters of the trapezoids, all with the same shape.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        amplitude: np.ndarray,
+        rise_time: np.ndarray,
+        flat_time: np.ndarray,
+        fall_time: np.ndarray,
+        delay: Union[float, np.ndarray] = 0.0,
+    ):
+        amplitude = np.asarray(amplitude, dtype=float)
+        shape = amplitude.shape
+
+        self.channel = channel
+        self.amplitude = amplitude
+        self.rise_time = np.broadcast_to(np.asarray(rise_time, dtype=float), shape)
+        self.flat_time = np.broadcast_to(np.asarray(flat_time, dtype=float), shape)
+        self.fall_time = np.broadcast_to(np.asarray(fall_time, dtype=float), shape)
+        self.delay = np.broadcast_to(np.asarray(delay, dtype=float), shape)
+        self.area = self.amplitude * (self.flat_time + self.rise_time / 2 + self.fall_time / 2)
+        self.flat_area = self.amplitude * self.flat_time
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.amplitude.shape
+
+    def __len__(self) -> int:
+        return len(self.amplitude)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index) -> Union[SimpleNamespace, 'TrapezoidSet']:
+        amplitude = self.amplitude[index]
+        if np.ndim(amplitude) > 0:
+            return TrapezoidSet(
+                self.channel,
+                amplitude,
+                self.rise_time[index],
+                self.flat_time[index],
+                self.fall_time[index],
+                self.delay[index],
+            )
+
+        grad = SimpleNamespace()
+        grad.type = 'trap'
+        grad.channel = self.channel
+        grad.amplitude = float(amplitude)
+        grad.rise_time = float(self.rise_time[index])
+        grad.flat_time = float(self.flat_time[index])
+        grad.fall_time = float(self.fall_time[index])
+        grad.area = float(self.area[index])
+        grad.flat_area = float(self.flat_area[index])
+        grad.delay = float(self.delay[index])
+        grad.first = 0
+        grad.last = 0
+        return grad
+
+    def __repr__(self) -> str:
+        return f'TrapezoidSet(channel={self.channel!r}, shape={self.shape})'
+
+
+def _shortest_params_for_areas(
+    areas: np.ndarray, max_slew: float, max_grad: float, grad_raster_time: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized `calculate_shortest_params_for_area()`."""
+    abs_area = np.abs(areas)
+
+    # Calculate initial rise time constrained by max slew rate
+    rise_time = np.ceil(np.sqrt(abs_area / max_slew) / grad_raster_time) * grad_raster_time
+    rise_time = np.maximum(rise_time, grad_raster_time)
+
+    # Calculate initial amplitude
+    amplitude = areas / rise_time
+    effective_time = rise_time
+
+    # Adjust for max gradient constraint
+    limited = np.abs(amplitude) > max_grad + eps
+    if np.any(limited):
+        effective_time = np.where(
+            limited, np.ceil(abs_area / max_grad / grad_raster_time) * grad_raster_time, effective_time
+        )
+        amplitude = np.where(limited, areas / effective_time, amplitude)
+        limited_rise_time = np.ceil(np.abs(amplitude) / max_slew / grad_raster_time) * grad_raster_time
+        rise_time = np.where(limited, np.maximum(limited_rise_time, grad_raster_time), rise_time)
+
+    # Calculate flat and fall times
+    flat_time = effective_time - rise_time
+    fall_time = rise_time
+
+    return amplitude, rise_time, flat_time, fall_time
+
+
+def make_trapezoids(
+    channel: str,
+    areas: np.ndarray,
+    delay: float = 0.0,
+    duration: Union[float, None] = None,
+    rise_time: Union[float, None] = None,
+    shared_timing: bool = False,
+    max_grad: Union[float, None] = None,
+    max_slew: Union[float, None] = None,
+    system: Union[Opts, None] = None,
+) -> TrapezoidSet:
+    """
+    Create a set of trapezoidal gradient events for an array of areas (e.g. a phase encoding table) in one call.
+
+    Element `i` of the returned set is identical to `make_trapezoid(channel, area=areas[i], ...)` with the same
+    `delay`, `duration`, `rise_time` and limits. With `shared_timing`, all trapezoids use the timing of the largest
+    absolute area and only differ in amplitude.
+
+    See Also
+    --------
+    - `pypulseq.make_trapezoid.make_trapezoid()`
+    - `pypulseq.make_trapezoids.TrapezoidSet`
+
+    Parameters
+    ----------
+    channel : str
+        Orientation of trapezoidal gradient events. Must be one of `x`, `y` or `z`.
+    areas : numpy.ndarray
+        Areas (1/m), array of any shape.
+    delay : float, default=0
+        Delay in seconds (s).
+    duration : float, default=None
+        Duration in seconds (s). If not provided, the shortest possible duration is used.
+    rise_time : float, default=None
+        Rise and fall time in seconds (s). Requires `duration`.
+    shared_timing : bool, default=False
+        Use the same rise, flat and fall times for all trapezoids.
+    max_grad : float, default=None
+        Maximum gradient strength (Hz/m).
+    max_slew : float, default=None
+        Maximum slew rate (Hz/m/s).
+    system : Opts, default=Opts()
+        System limits.
+
+    Returns
+    -------
+    grads : TrapezoidSet
+        Set of trapezoidal gradient events with the shape of `areas`.
+
+    Raises
+    ------
+    ValueError
+        If `channel` is invalid.
+        If `rise_time` is provided without `duration`.
+        If the requested areas are too large for the given duration or the gradient limits are violated.
+    """
+    if system is None:
+        system = Opts.default
+
+    if channel not in ['x', 'y', 'z']:
+        raise ValueError(f'Invalid channel. Must be one of `x`, `y` or `z`. Passed: {channel}')
+
+    if max_grad is None:
+        max_grad = system.max_grad
+
+    if max_slew is None:
+        max_slew = system.max_slew
+
+    if rise_time is not None and duration is None:
+        raise ValueError('Must supply `duration` when `rise_time` is provided.')
+
+    areas = np.asarray(areas, dtype=float)
+    if shared_timing:
+        # Timing of the largest area, all other trapezoids are scaled versions
+        timing_areas = np.full(areas.shape, np.max(np.abs(areas), initial=0))
+    else:
+        timing_areas = areas
+
+    if duration is None:
+        amplitude, rise_times, flat_times, fall_times = _shortest_params_for_areas(
+            timing_areas, max_slew, max_grad, system.grad_raster_time
+        )
+        if shared_timing:
+            amplitude = areas / (rise_times / 2 + fall_times / 2 + flat_times)
+    else:
+        if rise_time is None:
+            _, rise_times, flat_times, fall_times = _shortest_params_for_areas(
+                timing_areas, max_slew, max_grad, system.grad_raster_time
+            )
+            min_duration = rise_times + flat_times + fall_times
+            if np.any(duration < min_duration):
+                raise ValueError(
+                    f'Requested area is too large for this gradient. Minimum required duration is '
+                    f'{round(np.max(min_duration) * 1e6)} us'
+                )
+        else:
+            if duration <= (rise_time + eps):
+                raise ValueError('The `duration` is too short for the given `rise_time`.')
+
+            rise_times = fall_times = np.full(areas.shape, float(rise_time))
+            amplitude = areas / (duration - 0.5 * rise_times - 0.5 * fall_times)
+            if duration < 2 * rise_time or np.any(np.abs(amplitude) > max_grad):
+                raise ValueError(
+                    f'Requested area is too large for this gradient. Probably amplitude is violated '
+                    f'{round(np.max(np.abs(amplitude)) / max_grad * 100)}'
+                )
+        flat_times = duration - rise_times - fall_times
+        amplitude = areas / (rise_times / 2 + fall_times / 2 + flat_times)
+
+    # Validate all trapezoids at once
+    max_amplitude = np.max(np.abs(amplitude), initial=0)
+    if max_amplitude > max_grad + eps:
+        raise ValueError(f'Refined amplitude ({max_amplitude:0.0f} Hz/m) is larger than max ({max_grad:0.0f} Hz/m).')
+
+    if areas.size > 0:
+        max_rise_slew = np.max(np.abs(amplitude) / rise_times)
+        if max_rise_slew > max_slew * (1 + eps):
+            raise ValueError(
+                f'Refined slew rate ({max_rise_slew:0.0f} Hz/m/s) for ramp up is larger than max ({max_slew:0.0f} Hz/m/s).'
+            )
+        max_fall_slew = np.max(np.abs(amplitude) / fall_times)
+        if max_fall_slew > max_slew * (1 + eps):
+            raise ValueError(
+                f'Refined slew rate ({max_fall_slew:0.0f} Hz/m/s) for ramp down is larger than max ({max_slew:0.0f} Hz/m/s).'
+            )
+
+    return TrapezoidSet(channel, amplitude, rise_times, flat_times, fall_times, delay)
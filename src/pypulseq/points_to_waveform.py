@@ -1,3 +1,5 @@
+from typing import Tuple
+
 import numpy as np
 
 
@@ -36,3 +38,81 @@ def points_to_waveform(amplitudes: np.ndarray, grad_raster_time: float, times: n
     waveform = np.interp(x=grd + grad_raster_time / 2, xp=times, fp=amplitudes)
 
     return waveform
+
+
+def points_to_waveforms(
+    amplitudes: np.ndarray, grad_raster_time: float, times: np.ndarray, offsets: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched `points_to_waveform()` for many sets of points stored in ragged (CSR) form: the points of set `i` are
+    `amplitudes[offsets[i]:offsets[i + 1]]` at `times[offsets[i]:offsets[i + 1]]`. All waveforms are interpolated in
+    one pass, set `i` of the result is identical to `points_to_waveform()` applied to the points of set `i`.
+
+    Parameters
+    ----------
+    amplitudes : numpy.ndarray
+        Concatenated amplitude values of all sets.
+    grad_raster_time : float
+        Gradient raster time.
+    times : numpy.ndarray
+        Concatenated time points of all sets, ascending within each set.
+    offsets : numpy.ndarray
+        Start of each set in `amplitudes` and `times`, followed by the total number of points.
+
+    Returns
+    -------
+    waveforms : numpy.ndarray
+        Concatenated gradient waveforms.
+    waveform_offsets : numpy.ndarray
+        Start of each waveform in `waveforms`, followed by the total number of samples.
+    """
+    amplitudes = np.asarray(amplitudes, dtype=float)
+    times = np.asarray(times, dtype=float)
+    offsets = np.asarray(offsets, dtype=int)
+    counts = np.diff(offsets)
+    num_sets = len(counts)
+    nonempty = counts > 0
+
+    # Raster range of every set, empty sets result in a single zero sample like in `points_to_waveform()`
+    start = np.zeros(num_sets, dtype=int)
+    stop = np.ones(num_sets, dtype=int)
+    if np.any(nonempty):
+        idx = offsets[:-1][nonempty]
+        start[nonempty] = np.round(np.minimum.reduceat(times, idx) / grad_raster_time)
+        stop[nonempty] = np.round(np.maximum.reduceat(times, idx) / grad_raster_time)
+    lengths = np.maximum(stop - start, 0)
+    waveform_offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    sample_set = np.repeat(np.arange(num_sets), lengths)
+    k = np.arange(waveform_offsets[-1]) - waveform_offsets[sample_set] + start[sample_set]
+    x = k * grad_raster_time + grad_raster_time / 2
+    waveforms = np.zeros(len(x))
+
+    # Find the last point at or before each sample within its set by sorting samples and points together
+    sample_nonempty = nonempty[sample_set]
+    x, sample_set = x[sample_nonempty], sample_set[sample_nonempty]
+    point_set = np.repeat(np.arange(num_sets), counts)
+    order = np.lexsort(
+        (
+            np.concatenate((np.zeros(len(times)), np.ones(len(x)))),
+            np.concatenate((times, x)),
+            np.concatenate((point_set, sample_set)),
+        )
+    )
+    is_point = order < len(times)
+    j = (np.cumsum(is_point) - 1)[~is_point]
+
+    # Same arithmetic as `numpy.interp()`, clamped to the first and last point of each set
+    first = offsets[sample_set]
+    last = offsets[sample_set + 1] - 1
+    j = np.clip(j, first, np.maximum(last - 1, first))
+    j1 = np.minimum(j + 1, last)
+    dt = times[j1] - times[j]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(dt > 0, (amplitudes[j1] - amplitudes[j]) / dt, 0)
+    values = slope * (x - times[j]) + amplitudes[j]
+    values = np.where(x <= times[first], amplitudes[first], values)
+    values = np.where(x >= times[last], amplitudes[last], values)
+    waveforms[sample_nonempty] = values
+
+    return waveforms, waveform_offsets
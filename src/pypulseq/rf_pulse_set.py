@@ -0,0 +1,176 @@
+from copy import copy
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+
+from pypulseq.opts import Opts
+from pypulseq.Sequence.block import register_rf_event, register_rf_shapes
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+
+class RFPulseSet:
+    """
+    Array-backed set of RF events that share one waveform and only differ in frequency and phase offset, e.g. the
+    excitation pulses of a multi-slice acquisition.
+
+    Indexing the set with an integer (or a tuple of integers for multi-dimensional sets) returns an RF event identical
+    to the base event with the offsets of that variant, which can be passed to `Sequence.add_block()` directly. All
+    returned events share the `signal` and `t` arrays of the base event, which should not be modified. Indexing with
+    slices or arrays returns an `RFPulseSet` with the selected variants.
+
+    See Also
+    --------
+    - `pypulseq.make_sinc_pulses.make_sinc_pulses()`
+    - `pypulseq.make_gauss_pulses.make_gauss_pulses()`
+    - `pypulseq.make_block_pulses.make_block_pulses()`
+
+    Parameters
+    ----------
+    rf : SimpleNamespace
+        Base RF event.
+    freq_offset : numpy.ndarray
+        Frequency offsets in Hertz (Hz), array of any shape.
+    phase_offset : numpy.ndarray, default=0
+        Phase offsets in radians (rad), broadcastable to the shape of `freq_offset`.
+
+    Attributes
+    ----------
+    rf : SimpleNamespace
+        Base RF event.
+    freq_offset, phase_offset : numpy.ndarray
+        Offsets of the variants, both with the same shape.
+    ids : numpy.ndarray or None
+        RF library IDs of the variants after `register()`.
+    """
+
+    def __init__(
+        self,
+        rf: SimpleNamespace,
+        freq_offset: np.ndarray,
+        phase_offset: Union[float, np.ndarray] = 0.0,
+    ):
+        freq_offset, phase_offset = np.broadcast_arrays(
+            np.asarray(freq_offset, dtype=float), np.asarray(phase_offset, dtype=float)
+        )
+
+        self.rf = rf
+        self.freq_offset = freq_offset
+        self.phase_offset = phase_offset
+        self.ids = None
+        self._shape_IDs = None
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.freq_offset.shape
+
+    def __len__(self) -> int:
+        return len(self.freq_offset)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index) -> Union[SimpleNamespace, 'RFPulseSet']:
+        freq_offset = self.freq_offset[index]
+        if np.ndim(freq_offset) > 0:
+            rf_set = RFPulseSet(self.rf, freq_offset, self.phase_offset[index])
+            if self.ids is not None:
+                rf_set.ids = self.ids[index]
+                rf_set._shape_IDs = self._shape_IDs
+            return rf_set
+
+        rf = copy(self.rf)
+        rf.freq_offset = float(freq_offset)
+        rf.phase_offset = float(self.phase_offset[index])
+        if self.ids is not None:
+            rf.id = int(self.ids[index])
+            rf.shape_IDs = self._shape_IDs
+        return rf
+
+    def __repr__(self) -> str:
+        return f'RFPulseSet(shape={self.shape})'
+
+    def register(self, seq: 'Sequence') -> np.ndarray:
+        """
+        Register all variants in the RF library of `seq`.
+
+        The waveform shapes are compressed and registered once for the whole set. Afterwards, indexing the set returns
+        events with their library `id` set, so `Sequence.add_block()` uses the registered events directly. The set is
+        then only valid for this sequence.
+
+        Parameters
+        ----------
+        seq : Sequence
+            Sequence to register the RF events in.
+
+        Returns
+        -------
+        ids : numpy.ndarray
+            RF library IDs of the variants, with the shape of the set.
+        """
+        self._shape_IDs, _ = register_rf_shapes(seq, self.rf.signal, self.rf.t)
+
+        rf = copy(self.rf)
+        rf.shape_IDs = self._shape_IDs
+        if hasattr(rf, 'id'):
+            delattr(rf, 'id')
+
+        ids = np.zeros(self.freq_offset.size, dtype=int)
+        for i, (freq_offset, phase_offset) in enumerate(
+            zip(self.freq_offset.reshape(-1).tolist(), self.phase_offset.reshape(-1).tolist())
+        ):
+            rf.freq_offset = freq_offset
+            rf.phase_offset = phase_offset
+            ids[i], _ = register_rf_event(seq, rf)
+
+        self.ids = ids.reshape(self.shape)
+        return self.ids
+
+    def multiband(self, system: Union[Opts, None] = None) -> SimpleNamespace:
+        """
+        Combine all variants into a single multi-band RF event.
+
+        The waveform of the returned event is the sum of the frequency and phase shifted copies of the base waveform,
+        with the phase of each frequency offset evolving from the start of the pulse, as it would be played out for
+        the individual variants. The frequency and phase offsets of the returned event are zero. Waveforms with a
+        sparse time shape, such as block pulses, are resampled to the RF raster first.
+
+        Parameters
+        ----------
+        system : Opts, default=Opts()
+            System limits. Only used for resampling sparse waveforms.
+
+        Returns
+        -------
+        rf : SimpleNamespace
+            Multi-band RF event.
+        """
+        if system is None:
+            system = Opts.default
+
+        signal = self.rf.signal
+        t = self.rf.t
+        n_samples = round(self.rf.shape_dur / system.rf_raster_time)
+        if len(t) < n_samples:
+            t_raster = (np.arange(n_samples) + 0.5) * system.rf_raster_time
+            signal = np.interp(t_raster, t, signal)
+            t = t_raster
+
+        # Vectorized sum of all shifted copies
+        phasors = np.exp(
+            1j * (2 * np.pi * np.outer(self.freq_offset.reshape(-1), t) + self.phase_offset.reshape(-1, 1))
+        )
+        signal = signal * np.sum(phasors, axis=0)
+
+        rf = copy(self.rf)
+        rf.signal = signal
+        rf.t = t
+        rf.freq_offset = 0.0
+        rf.phase_offset = 0.0
+        for attr in ('id', 'shape_IDs'):
+            if hasattr(rf, attr):
+                delattr(rf, attr)
+        return rf
@@ -0,0 +1,340 @@
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+import numpy as np
+
+from pypulseq import eps
+from pypulseq.make_rotation import rotation_matrices
+from pypulseq.make_trapezoids import TrapezoidSet
+from pypulseq.opts import Opts
+from pypulseq.Sequence.block import register_grad_shapes
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+_CHANNELS = ['x', 'y', 'z']
+
+
+def _corner_points(grad: SimpleNamespace) -> Tuple[np.ndarray, np.ndarray]:
+    """Times (including the delay) and amplitudes of the corner points of a trapezoid or extended trapezoid."""
+    if grad.type == 'trap':
+        if grad.flat_time > 0:
+            times = np.cumsum([grad.delay, grad.rise_time, grad.flat_time, grad.fall_time])
+            amplitudes = np.array([0, grad.amplitude, grad.amplitude, 0])
+        else:
+            times = np.cumsum([grad.delay, grad.rise_time, grad.fall_time])
+            amplitudes = np.array([0, grad.amplitude, 0])
+        return times, amplitudes
+    return grad.delay + grad.tt, np.asarray(grad.waveform, dtype=float)
+
+
+def _unique_times(times: np.ndarray) -> np.ndarray:
+    """Sorted unique time points, merging time points closer than `eps` (see `add_gradients()`)."""
+    times = np.unique(times)
+    keep = np.concatenate(([True], np.diff(times) >= eps))
+    return times[keep]
+
+
+class RotatedGradientTable:
+    """
+    Table of rotated variants of a set of gradient events (e.g. the spokes of a radial or the blades of a PROPELLER
+    sequence) registered in the gradient library of a sequence in one go.
+
+    Element `i` of the table contains the same events as `rotate(*args, angle=angles[i], axis=axis)`: non-gradient
+    events are passed through unchanged and the gradients are rotated and summed per channel. Instead of rotating and
+    adding the gradients one rotation at a time, the base gradients are sampled once on a common time grid and all
+    rotated waveforms are computed as one `(n_rotations, 3, n_samples)` array operation. Each unique normalized
+    waveform is registered once in the shape library and all gradient events are inserted in the gradient library in
+    bulk. The returned gradient events have their library `id` set, so `Sequence.add_block()` does not register them
+    again. Rotated gradients that are composed of trapezoids with identical timing remain trapezoids.
+
+    Examples
+    --------
+    >>> spokes = pp.RotatedGradientTable(seq, gx, adc, angles=np.arange(n_spokes) * np.pi / n_spokes, axis='z')
+    >>> for i in range(n_spokes):
+    ...     seq.add_block(rf, gz)
+    ...     seq.add_block(*spokes[i])
+
+    See Also
+    --------
+    - `pypulseq.rotate.rotate()`
+    - `pypulseq.gradient_table.GradientTable`
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to register the gradients in. The table is only valid for this sequence.
+    args : SimpleNamespace
+        Events to be rotated. Trapezoids, extended trapezoids and arbitrary gradients on the regular gradient raster
+        are supported.
+    angles : numpy.ndarray, optional
+        Rotation angles (rad) about `axis`.
+    axis : str, optional
+        Rotation axis, 'x', 'y' or 'z'. Required with `angles`.
+    matrices : numpy.ndarray, optional
+        Rotation matrices of shape (n_rotations, 3, 3), alternative to `angles` and `axis`. The rotated gradient
+        vector is `matrices[i] @ (gx, gy, gz)`.
+    system : Opts, optional
+        System limits. If provided, the rotated gradients are checked against the maximum gradient amplitude and slew
+        rate.
+
+    Attributes
+    ----------
+    matrices : numpy.ndarray
+        Rotation matrices of shape (n_rotations, 3, 3).
+    times : numpy.ndarray
+        Time points (s) of `waveforms`, relative to the start of the block.
+    waveforms : numpy.ndarray
+        Rotated gradient waveforms of shape (n_rotations, 3, len(times)).
+    ids : numpy.ndarray
+        Gradient library IDs of shape (n_rotations, 3), 0 where the rotated gradient vanishes.
+
+    Raises
+    ------
+    ValueError
+        If neither or both of `angles` and `matrices` are provided, or if the axis is invalid.
+        If an oversampled arbitrary gradient is passed.
+        If a rotated gradient exceeds the system limits.
+    """
+
+    def __init__(
+        self,
+        seq: 'Sequence',
+        *args: SimpleNamespace,
+        angles: Union[np.ndarray, None] = None,
+        axis: Union[str, None] = None,
+        matrices: Union[np.ndarray, None] = None,
+        system: Union[Opts, None] = None,
+    ):
+        if (angles is None) == (matrices is None):
+            raise ValueError('Exactly one of `angles` and `matrices` must be provided.')
+        if angles is not None:
+            if axis is None:
+                raise ValueError('`axis` must be provided with `angles`.')
+            matrices = rotation_matrices(angles, axis)
+        else:
+            matrices = np.asarray(matrices, dtype=float)
+            if matrices.ndim == 2:
+                matrices = matrices[np.newaxis]
+            if matrices.shape[1:] != (3, 3):
+                raise ValueError('`matrices` must have shape (n_rotations, 3, 3).')
+
+        self.matrices = matrices
+        self._events = {}
+        self._bypass = [e for e in args if e.type not in ('grad', 'trap')]
+        grads = [e for e in args if e.type in ('grad', 'trap')]
+        grad_raster_time = seq.grad_raster_time
+        self._grad_raster_time = grad_raster_time
+
+        n = len(matrices)
+        self.ids = np.zeros((n, 3), dtype=int)
+        self._axes = [None, None, None]
+
+        if len(grads) == 0:
+            self.times = np.zeros(0)
+            self.waveforms = np.zeros((n, 3, 0))
+            self._nonzero = self.ids > 0
+            return
+
+        channels = np.array([_CHANNELS.index(g.channel) for g in grads])
+        is_trap = np.array([g.type == 'trap' for g in grads])
+        is_arb = np.zeros(len(grads), dtype=bool)
+        for i, g in enumerate(grads):
+            if g.type == 'grad':
+                tt_rast = g.tt / grad_raster_time
+                if np.all(np.abs(tt_rast - 0.5 * np.arange(1, len(tt_rast) + 1)) < eps):
+                    raise ValueError('RotatedGradientTable does not support oversampled gradients.')
+                is_arb[i] = np.all(np.abs(tt_rast + 0.5 - np.arange(1, len(tt_rast) + 1)) < eps)
+
+        # Sample all base gradients on a common time grid: the union of the corner points if there are only
+        # trapezoids and extended trapezoids, otherwise the regular gradient raster
+        points = [_corner_points(g) for g in grads]
+        starts = np.array([t[0] for t, _ in points]) - np.where(is_arb, 0.5 * grad_raster_time, 0)
+        ends = np.array([t[-1] for t, _ in points]) + np.where(is_arb, 0.5 * grad_raster_time, 0)
+        self._is_raster = bool(np.any(is_arb))
+        if self._is_raster:
+            num_samples = round(np.max(ends) / grad_raster_time)
+            times = (np.arange(num_samples) + 0.5) * grad_raster_time
+        else:
+            times = _unique_times(np.concatenate([t for t, _ in points]))
+        self.times = times
+
+        base = np.zeros((len(grads), len(times)))
+        for i, (t, a) in enumerate(points):
+            base[i] = np.interp(times, t, a, left=0, right=0)
+
+        # Channel waveforms, first and last points of the unrotated gradients
+        channel_waveforms = np.zeros((3, len(times)))
+        np.add.at(channel_waveforms, channels, base)
+        max_mag = np.max(np.abs(base))
+        threshold = 1e-6 * max_mag
+
+        # Only keep the channels that contribute to an axis for any rotation, so that axes without contributions
+        # are not polluted by round-off errors of the rotation matrices
+        has_grad = np.bincount(channels, minlength=3) > 0
+        contributes = (np.max(np.abs(matrices), axis=0) > 1e-6) & has_grad[np.newaxis, :]
+        effective = matrices * contributes[np.newaxis]
+
+        self.waveforms = effective @ channel_waveforms
+
+        if system is not None:
+            self._check_limits(system)
+
+        for j in range(3):
+            in_axis = contributes[j, channels]
+            if not np.any(in_axis):
+                continue
+            rows = self.waveforms[:, j, :]
+            nonzero = np.max(np.abs(rows), axis=1, initial=0) >= threshold
+            if not np.any(nonzero):
+                continue
+
+            axis_grads = [g for g, keep in zip(grads, in_axis) if keep]
+            axis_channels = channels[in_axis]
+            coefficients = effective[:, j, axis_channels][nonzero]
+            timing = {(g.rise_time, g.flat_time, g.fall_time, g.delay) for g in axis_grads if g.type == 'trap'}
+
+            if np.all(is_trap[in_axis]) and len(timing) == 1:
+                rise_time, flat_time, fall_time, delay = timing.pop()
+                amplitude = effective[:, j, axis_channels] @ np.array([g.amplitude for g in axis_grads])
+                self._axes[j] = TrapezoidSet(_CHANNELS[j], amplitude, rise_time, flat_time, fall_time, delay)
+                data = [(a, rise_time, flat_time, fall_time, delay) for a in amplitude[nonzero].tolist()]
+                self.ids[nonzero, j] = self._register(seq, data, 't')
+                continue
+
+            # Restrict the waveforms to the time points of the contributing gradients
+            if self._is_raster:
+                first_sample = round(np.min(starts[in_axis]) / grad_raster_time)
+                last_sample = round(np.max(ends[in_axis]) / grad_raster_time)
+                keep = slice(first_sample, last_sample)
+                delay = first_sample * grad_raster_time
+                tt = times[keep] - delay
+
+                # First and last points of the sum are defined by the gradients starting first and ending last
+                start_first = np.abs(starts[in_axis] - delay) < eps
+                end_last = np.abs(ends[in_axis] - last_sample * grad_raster_time) < eps
+                firsts = np.array([0 if g.type == 'trap' else g.first for g in axis_grads])
+                lasts = np.array([0 if g.type == 'trap' else g.last for g in axis_grads])
+                first = coefficients @ (firsts * start_first)
+                last = coefficients @ (lasts * end_last)
+            else:
+                axis_times = _unique_times(np.concatenate([points[i][0] for i in np.flatnonzero(in_axis)]))
+                keep = np.searchsorted(times, axis_times - eps)
+                delay = round(times[keep[0]] / grad_raster_time) * grad_raster_time
+                tt = times[keep] - delay
+                first = rows[nonzero][:, keep[0]]
+                last = rows[nonzero][:, keep[-1]]
+
+            axis_rows = rows[nonzero][:, keep]
+            self._axes[j] = SimpleNamespace(
+                rows=axis_rows, tt=tt, delay=delay, first=first, last=last, index=np.cumsum(nonzero) - 1
+            )
+            self.ids[nonzero, j] = self._register_arbitrary(seq, axis_rows, tt, delay, first, last)
+
+        self._nonzero = self.ids > 0
+
+    @staticmethod
+    def _register(seq: 'Sequence', data: list, data_type: str) -> np.ndarray:
+        ids, any_found = seq.grad_library.find_or_insert_many(data, data_type)
+
+        # Clear block cache because grad events were overwritten (see `register_grad_event()`)
+        if seq.use_block_cache and any_found:
+            seq.block_cache.clear()
+        return ids
+
+    @classmethod
+    def _register_arbitrary(
+        cls,
+        seq: 'Sequence',
+        rows: np.ndarray,
+        tt: np.ndarray,
+        delay: float,
+        first: np.ndarray,
+        last: np.ndarray,
+    ) -> np.ndarray:
+        # Same amplitude definition as `register_grad_event()`: maximum magnitude with the sign of the first non-zero
+        # sample, so that scaled copies of a waveform share the normalized shape
+        amplitude = np.max(np.abs(rows), axis=1)
+        first_nonzero = rows[np.arange(len(rows)), np.argmax(rows != 0, axis=1)]
+        amplitude *= np.where(first_nonzero < 0, -1, 1)
+        # Shapes are compared well below the precision of the shape compression
+        normalized = np.round(rows / amplitude[:, np.newaxis], 12)
+        shapes, inverse = np.unique(normalized, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # Signed zeros would be stored as different shapes
+        shapes = shapes + 0.0
+        shape_ids = []
+        any_found = False
+        for shape in shapes:
+            ids, found = register_grad_shapes(seq, shape, tt)
+            shape_ids.append(ids)
+            any_found = any_found or found
+        if seq.use_block_cache and any_found:
+            seq.block_cache.clear()
+
+        data = [
+            (a, f, last_, *shape_ids[u], delay)
+            for a, f, last_, u in zip(amplitude.tolist(), first.tolist(), last.tolist(), inverse.tolist())
+        ]
+        return cls._register(seq, data, 'g')
+
+    def _check_limits(self, system: Opts) -> None:
+        max_amplitude = np.max(np.abs(self.waveforms), initial=0)
+        if max_amplitude > system.max_grad + eps:
+            raise ValueError(
+                f'RotatedGradientTable: maximum amplitude exceeded {100 * max_amplitude / system.max_grad} %'
+            )
+
+        if len(self.times) > 1:
+            slew = np.diff(self.waveforms, axis=-1) / np.diff(self.times)
+            max_slew = np.max(np.abs(slew))
+            if max_slew > system.max_slew * (1 + eps):
+                raise ValueError(
+                    f'RotatedGradientTable: maximum slew rate exceeded {100 * max_slew / system.max_slew} %'
+                )
+
+    def __len__(self) -> int:
+        return len(self.matrices)
+
+    def __getitem__(self, index: int) -> List[SimpleNamespace]:
+        # Events are created on first access and reused afterwards
+        events = self._events.get(index)
+        if events is not None:
+            return events
+
+        if not isinstance(index, (int, np.integer)):
+            raise IndexError('RotatedGradientTable index must be an integer.')
+        index = range(len(self))[index]
+
+        events = list(self._bypass)
+        for j in range(3):
+            if not self._nonzero[index, j]:
+                continue
+            axis = self._axes[j]
+            if isinstance(axis, TrapezoidSet):
+                grad = axis[index]
+            else:
+                i = axis.index[index]
+                grad = SimpleNamespace()
+                grad.type = 'grad'
+                grad.channel = _CHANNELS[j]
+                grad.waveform = axis.rows[i]
+                grad.delay = axis.delay
+                grad.tt = axis.tt
+                if self._is_raster:
+                    grad.shape_dur = len(axis.tt) * self._grad_raster_time
+                    grad.area = np.sum(grad.waveform) * self._grad_raster_time
+                else:
+                    grad.shape_dur = axis.tt[-1]
+                    grad.area = 0.5 * np.sum(np.diff(axis.tt) * (grad.waveform[1:] + grad.waveform[:-1]))
+                grad.first = float(axis.first[i])
+                grad.last = float(axis.last[i])
+            grad.id = int(self.ids[index, j])
+            events.append(grad)
+
+        self._events[index] = events
+        return events
+
+    def __repr__(self) -> str:
+        return f'RotatedGradientTable(n_rotations={len(self)})'
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from pypulseq.make_extended_trapezoid import make_extended_trapezoid
+from pypulseq.make_extended_trapezoids import make_extended_trapezoids
 from pypulseq.opts import Opts
 from pypulseq.utils.tracing import trace, trace_enabled
 
@@ -133,21 +133,14 @@ def split_gradient_at(
     amplitudes2 = np.concatenate(([amp_tp], amplitudes[times > time_point + t_eps]))
 
     # Recreate gradients
-    grad1 = make_extended_trapezoid(
+    grad1, grad2 = make_extended_trapezoids(
         channel=channel,
         system=system,
-        times=times1,
-        amplitudes=amplitudes1,
+        times=[times1, times2],
+        amplitudes=[amplitudes1, amplitudes2],
         skip_check=True,
     )
     grad1.delay = grad.delay
-    grad2 = make_extended_trapezoid(
-        channel=channel,
-        system=system,
-        times=times2,
-        amplitudes=amplitudes2,
-        skip_check=True,
-    )
     grad2.delay = time_point
 
     if trace_enabled():
@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import Union
+
+
+def evict_cache_files(cache_dir: Path, max_size: int, pattern: str, keep: Union[Path, None] = None) -> None:
+    """
+    Remove the least recently used files matching `pattern` from an on-disk cache until its total size is at most
+    `max_size`. Used by the RF pulse design cache and the sequence read cache.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Cache directory.
+    max_size : int
+        Maximum total size of the cached files in bytes.
+    pattern : str
+        Glob pattern of the cached files, e.g. `'*.npz'`.
+    keep : Path, optional
+        File that is never removed, usually the one just written, even if it exceeds `max_size` on its own.
+    """
+    files = []
+    for file in cache_dir.glob(pattern):
+        try:
+            stat = file.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, file))
+
+    total_size = sum(size for _, size, _ in files)
+    for _, size, file in sorted(files, key=lambda f: f[0]):
+        if total_size <= max_size:
+            break
+        if file == keep:
+            continue
+        file.unlink(missing_ok=True)
+        total_size -= size
@@ -0,0 +1,129 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+
+import numpy as np
+
+from pypulseq.utils.cache_files import evict_cache_files
+
+# Global variables holding the cache directory (None if caching is disabled) and the maximum total size of the
+# cached files in bytes.
+_cache_dir: Union[Path, None] = None
+_max_size: int = 256 * 2**20
+
+
+def default_pulse_cache_dir() -> Path:
+    """
+    Returns the default directory of the RF pulse design cache, `$XDG_CACHE_HOME/pypulseq/pulses` (or
+    `~/.cache/pypulseq/pulses`).
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'pypulseq' / 'pulses'
+
+
+def pulse_cache_enabled() -> bool:
+    """
+    Returns whether the on-disk cache for RF pulse designs is enabled.
+    """
+    return _cache_dir is not None
+
+
+def enable_pulse_cache(path: Union[str, Path, None] = None, max_size: int = 256 * 2**20) -> None:
+    """
+    Enable the on-disk cache for expensive RF pulse designs (SigPy SLR/SMS and adiabatic pulses).
+
+    Designed waveforms are stored in files named by a hash of all design parameters and the library versions, so
+    repeated runs of protocol scripts load identical pulses instead of designing them again. When the total size of
+    the cache exceeds `max_size`, the least recently used files are removed.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Cache directory. The default is `default_pulse_cache_dir()`.
+    max_size : int, optional
+        Maximum total size of the cached files in bytes.
+        The default is 256 MiB.
+    """
+    global _cache_dir, _max_size
+    _cache_dir = Path(path) if path is not None else default_pulse_cache_dir()
+    _max_size = max_size
+
+
+def disable_pulse_cache() -> None:
+    """
+    Disable the on-disk cache for RF pulse designs. Cached files are kept.
+    """
+    global _cache_dir
+    _cache_dir = None
+
+
+def clear_pulse_cache() -> None:
+    """
+    Remove all files from the RF pulse design cache (the enabled cache directory or the default directory).
+    """
+    cache_dir = _cache_dir if _cache_dir is not None else default_pulse_cache_dir()
+    for file in cache_dir.glob('*.npz'):
+        file.unlink(missing_ok=True)
+
+
+def cached_pulse(
+    kind: str, params: Dict[str, Any], design: Callable[[], Dict[str, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """
+    Internal function to look up a pulse design in the cache, or run and store it.
+
+    Parameters
+    ----------
+    kind : str
+        Name of the design function.
+    params : dict
+        All parameters that determine the result of `design`. Must be JSON serializable or numpy scalars/arrays.
+    design : callable
+        Function returning the designed waveforms as a dict of arrays.
+
+    Returns
+    -------
+    dict
+        Designed waveforms.
+    """
+    if _cache_dir is None:
+        return design()
+
+    from pypulseq import __version__
+
+    key = json.dumps({'kind': kind, 'pypulseq': __version__, **params}, sort_keys=True, default=lambda x: x.tolist())
+    file = _cache_dir / (hashlib.sha256(key.encode()).hexdigest() + '.npz')
+
+    try:
+        with np.load(file, allow_pickle=False) as data:
+            result = {name: data[name] for name in data.files}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        pass
+    else:
+        # Mark as recently used. Entries of read-only caches are still used.
+        with contextlib.suppress(OSError):
+            os.utime(file)
+        return result
+
+    result = design()
+
+    try:
+        _cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see partial files
+        fd, tmp = tempfile.mkstemp(dir=_cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **result)
+            Path(tmp).replace(file)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+        evict_cache_files(_cache_dir, _max_size, pattern='*.npz', keep=file)
+    except OSError:
+        pass
+
+    return result
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+from pypulseq.Sequence.binary_seq import BINARY_FORMAT_VERSION
+from pypulseq.Sequence.parallel_read import read_parallel
+from pypulseq.Sequence.read_seq import read
+from pypulseq.utils.cache_files import evict_cache_files
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+# Global variables holding the cache directory (None if caching is disabled) and the maximum total size of the
+# cached files in bytes.
+_cache_dir: Union[Path, None] = None
+_max_size: int = 1024 * 2**20
+
+# Bump to invalidate all cached sequences when the parsing in `read()` changes
+READ_CACHE_VERSION = 1
+
+
+def default_read_cache_dir() -> Path:
+    """
+    Returns the default directory of the parsed sequence file cache, `$XDG_CACHE_HOME/pypulseq/sequences` (or
+    `~/.cache/pypulseq/sequences`).
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'pypulseq' / 'sequences'
+
+
+def read_cache_enabled() -> bool:
+    """
+    Returns whether the on-disk cache for parsed sequence files is enabled.
+    """
+    return _cache_dir is not None
+
+
+def enable_read_cache(path: Union[str, Path, None] = None, max_size: int = 1024 * 2**20) -> None:
+    """
+    Enable the on-disk cache for `Sequence.read()`.
+
+    Parsed (and deduplicated) sequences are stored in the binary `.seqb` format, in files named by a hash of the size,
+    modification time and `[SIGNATURE]` hash (or content hash, for unsigned files) of the sequence file, the read
+    options, the system limits and the library version. Reading the same file again loads the binary file instead of
+    parsing the text. When the total size of the cache exceeds `max_size`, the least recently used files are removed.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Cache directory. The default is `default_read_cache_dir()`.
+    max_size : int, optional
+        Maximum total size of the cached files in bytes.
+        The default is 1 GiB.
+    """
+    global _cache_dir, _max_size
+    _cache_dir = Path(path) if path is not None else default_read_cache_dir()
+    _max_size = max_size
+
+
+def disable_read_cache() -> None:
+    """
+    Disable the on-disk cache for parsed sequence files. Cached files are kept.
+    """
+    global _cache_dir
+    _cache_dir = None
+
+
+def clear_read_cache() -> None:
+    """
+    Remove all files from the parsed sequence file cache (the enabled cache directory or the default directory).
+    """
+    cache_dir = _cache_dir if _cache_dir is not None else default_read_cache_dir()
+    for file in cache_dir.glob('*.seqb'):
+        file.unlink(missing_ok=True)
+
+
+def cached_read(
+    seq: 'Sequence',
+    path: Union[str, Path],
+    detect_rf_use: Union[bool, None],
+    remove_duplicates: bool,
+    num_processes: Union[int, None] = None,
+) -> None:
+    """
+    Internal function to load a sequence file from the cache, or read it with `read()` and store it.
+
+    Parameters
+    ----------
+    seq : Sequence
+        Sequence to load the file into.
+    path : str or Path
+        Path of sequence file to be read.
+    detect_rf_use : bool
+        See `pypulseq.Sequence.read_seq.read()`.
+    remove_duplicates : bool
+        See `pypulseq.Sequence.read_seq.read()`.
+    num_processes : int, optional
+        If given, parse the file with `pypulseq.Sequence.parallel_read.read_parallel()` using this number of
+        processes.
+    """
+    if _cache_dir is None:
+        _read(seq, path, detect_rf_use, remove_duplicates, num_processes)
+        return
+
+    from pypulseq import __version__
+
+    path = Path(path)
+    stat = path.stat()
+    key = json.dumps(
+        {
+            'version': READ_CACHE_VERSION,
+            'binary_format': BINARY_FORMAT_VERSION,
+            'pypulseq': __version__,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': _file_hash(path),
+            'detect_rf_use': detect_rf_use,
+            'remove_duplicates': remove_duplicates,
+            # Defaults for missing definitions and the ADC dead time are taken from the system limits
+            'system': vars(seq.system),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    file = _cache_dir / (hashlib.sha256(key.encode()).hexdigest() + '.seqb')
+
+    try:
+        seq.read_binary(file)
+        os.utime(file)  # Mark as recently used
+        return
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass
+
+    _read(seq, path, detect_rf_use, remove_duplicates, num_processes)
+
+    try:
+        _cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary directory first so concurrent readers and the eviction never see partial files
+        # (`write_binary` always adds the .seqb suffix, so a temporary file would match the cache glob)
+        with tempfile.TemporaryDirectory(dir=_cache_dir, suffix='.tmp') as tmp_dir:
+            tmp = Path(tmp_dir) / file.name
+            seq.write_binary(tmp)
+            tmp.replace(file)
+        evict_cache_files(_cache_dir, _max_size, pattern='*.seqb', keep=file)
+    except OSError:
+        pass
+
+
+def _read(
+    seq: 'Sequence',
+    path: Union[str, Path],
+    detect_rf_use: Union[bool, None],
+    remove_duplicates: bool,
+    num_processes: Union[int, None],
+) -> None:
+    if num_processes is not None:
+        read_parallel(
+            seq,
+            path=path,
+            detect_rf_use=detect_rf_use,
+            remove_duplicates=remove_duplicates,
+            num_processes=num_processes,
+        )
+    else:
+        read(seq, path=path, detect_rf_use=detect_rf_use, remove_duplicates=remove_duplicates)
+
+
+def _file_hash(path: Path) -> str:
+    """Returns the `[SIGNATURE]` hash of a sequence file, or the SHA-256 of its contents if it is not signed."""
+    with open(path, 'rb') as f:
+        # The signature is the last section of the file
+        f.seek(max(0, path.stat().st_size - 4096))
+        tail = f.read()
+        signature = re.search(rb'^Hash\s+([0-9a-fA-F]+)', tail[tail.rfind(b'[SIGNATURE]') :], re.MULTILINE)
+        if b'[SIGNATURE]' in tail and signature is not None:
+            return signature[1].decode()
+
+        f.seek(0)
+        content_hash = hashlib.sha256()
+        for chunk in iter(lambda: f.read(2**20), b''):
+            content_hash.update(chunk)
+        return content_hash.hexdigest()
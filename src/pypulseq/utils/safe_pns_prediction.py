@@ -37,7 +37,6 @@
 
 from types import SimpleNamespace
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 
@@ -222,12 +221,13 @@ def safe_longest_time_const(hw):
     return max([hw.x.tau1, hw.x.tau2, hw.x.tau3, hw.y.tau1, hw.y.tau2, hw.y.tau3, hw.z.tau1, hw.z.tau2, hw.z.tau3])
 
 
-def safe_pns_model(dgdt, dt, hw):
+def safe_pns_model(dgdt, dt, hw, n_max=None):
     # function stim = safe_pns_model(dgdt, dt, hw)
     #
     # dgdt (nx3) is in T/m/s
     # dt   (1x1) is in s
     # All time coefficients (a1 and tau1 etc.) are in ms.
+    # n_max limits the length of the lowpass filters, see safe_tau_lowpass().
     #
     # This PNS model is based on the SAFE-abstract
     # SAFE-Model - A New Method for Predicting Peripheral Nerve Stimulations in MRI
@@ -241,9 +241,9 @@ def safe_pns_model(dgdt, dt, hw):
     # The code was adapted/expanded/corrected by Filip Szczepankiewicz @ LMI
     # BWH, HMS, Boston, MA, USA, and Lund University, Sweden.
 
-    stim1 = hw.a1 * abs(safe_tau_lowpass(dgdt, hw.tau1, dt * 1000))
-    stim2 = hw.a2 * safe_tau_lowpass(abs(dgdt), hw.tau2, dt * 1000)
-    stim3 = hw.a3 * abs(safe_tau_lowpass(dgdt, hw.tau3, dt * 1000))
+    stim1 = hw.a1 * abs(safe_tau_lowpass(dgdt, hw.tau1, dt * 1000, n_max=n_max))
+    stim2 = hw.a2 * safe_tau_lowpass(abs(dgdt), hw.tau2, dt * 1000, n_max=n_max)
+    stim3 = hw.a3 * abs(safe_tau_lowpass(dgdt, hw.tau3, dt * 1000, n_max=n_max))
 
     stim = (stim1 + stim2 + stim3) / hw.stim_limit * hw.g_scale * 100
 
@@ -261,11 +261,12 @@ def safe_pns_model(dgdt, dt, hw):
     # validating that the updated code is accurate. - FSz
 
 
-def safe_tau_lowpass(dgdt, tau, dt, eps=1e-16):
+def safe_tau_lowpass(dgdt, tau, dt, eps=1e-16, n_max=None):
     # function fw = safe_tau_lowpass(dgdt, tau, dt)
     #
     # Apply a RC lowpass filter with time constant tau = RC to data with sampling
     # interval dt. NOTE tau and dt need to be in the same unit (i.e. s or ms)
+    # The filter is truncated to n_max samples (default: the length of dgdt).
     # The SAFE model abstract by Hebrank et.al. just says "Lowpass with time-constant tau",
     # so I decided to make the most simple filter possible here.
     # The RC lowpass is also appealing because its something Siemens could have
@@ -279,13 +280,23 @@ def safe_tau_lowpass(dgdt, tau, dt, eps=1e-16):
     alpha = dt / (tau + dt)
 
     # Calculate number of elements in filter to reach desired accuracy (eps)
-    n = min(round(np.log(eps) / np.log(1 - alpha)), dgdt.shape[0])
+    n = safe_tau_lowpass_length(tau, dt, dgdt.shape[0] if n_max is None else n_max, eps)
     filt = (1 - alpha) ** np.arange(n)
 
     # Implements lowpass filter using convolution to get rid of for loop in original code
     return alpha * np.convolve(dgdt, filt)[: dgdt.shape[0]]
 
 
+def safe_tau_lowpass_length(tau, dt, n_max, eps=1e-16):
+    # function n = safe_tau_lowpass_length(tau, dt, n_max)
+    #
+    # Number of samples of the lowpass filter in safe_tau_lowpass(), at most n_max.
+    # Each output sample of the filter only depends on this number of input samples.
+
+    alpha = dt / (tau + dt)
+    return min(round(np.log(eps) / np.log(1 - alpha)), n_max)
+
+
 def safe_gwf_to_pns(gwf, rf, dt, hw, do_padding=True):
     # function [pns, res] = safe_gwf_to_pns(gwf, rf, dt, hw, doPadding)
     #
@@ -307,17 +318,7 @@ def safe_gwf_to_pns(gwf, rf, dt, hw, do_padding=True):
     # The code was adapted/expanded by Filip Szczepankiewicz @ LMI
     # BWH, HMS, Boston, MA, USA.
 
-    if do_padding:
-        zpt = safe_longest_time_const(hw) * 4 / 1000  # s
-        pad1 = round(zpt / 4 / dt)
-        pad2 = round(zpt / 1 / dt)
-
-        gwf = np.pad(gwf, ((pad1, pad2), (0, 0)))
-        rf = np.pad(rf, (pad1, pad2))
-
-    safe_hw_check(hw)
-
-    dgdt = np.diff(gwf, axis=0) / dt
+    gwf, rf, dgdt = safe_gwf_to_dgdt(gwf, rf, dt, hw, do_padding)
     pns = np.zeros(dgdt.shape)
 
     pns[:, 0] = safe_pns_model(dgdt[:, 0], dt, hw.x)
@@ -336,10 +337,32 @@ def safe_gwf_to_pns(gwf, rf, dt, hw, do_padding=True):
     return pns, res
 
 
+def safe_gwf_to_dgdt(gwf, rf, dt, hw, do_padding=True):
+    # function [gwf, rf, dgdt] = safe_gwf_to_dgdt(gwf, rf, dt, hw, doPadding)
+    #
+    # Zeropads the gradient waveform and rf vector as in safe_gwf_to_pns() and
+    # returns them together with the slew rate dgdt (nx3) in T/m/s.
+
+    if do_padding:
+        zpt = safe_longest_time_const(hw) * 4 / 1000  # s
+        pad1 = round(zpt / 4 / dt)
+        pad2 = round(zpt / 1 / dt)
+
+        gwf = np.pad(gwf, ((pad1, pad2), (0, 0)))
+        rf = np.pad(rf, (pad1, pad2))
+
+    safe_hw_check(hw)
+
+    dgdt = np.diff(gwf, axis=0) / dt
+
+    return gwf, rf, dgdt
+
+
 def safe_plot(pns, dt=None, envelope=True, envelope_points=500):
     # function h = safe_plot(pns, dt)
     # pns is relative PNS waveform (nx3)
     # dt is time step size in seconds.
+    import matplotlib.pyplot as plt
 
     pnsnorm = np.sqrt((pns**2).sum(axis=1))
 
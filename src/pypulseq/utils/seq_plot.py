@@ -11,6 +11,7 @@
 
 from pypulseq.calc_rf_center import calc_rf_center
 from pypulseq.Sequence import parula
+from pypulseq.Sequence.timeline import block_grad_points, select_blocks
 from pypulseq.supported_labels_rf_use import get_supported_labels
 from pypulseq.utils.cumsum import cumsum
 
@@ -435,7 +436,6 @@ def _seq_plot(
     g_factor_list = [1e-3, 1e3 / seq.system.gamma]
     g_factor = g_factor_list[valid_grad_units.index(grad_disp)]
 
-    t0 = 0
     label_defined = False
     label_idx_to_plot = []
     label_legend_to_plot = []
@@ -453,14 +453,16 @@ def _seq_plot(
         sp11.set_prop_cycle(cycler)
 
     # Block timings
-    block_edges = np.cumsum([0] + [x[1] for x in sorted(seq.block_durations.items())])
+    block_edges = np.concatenate(([0], np.cumsum(list(seq.block_durations.values()))))
     block_edges_in_range = block_edges[(block_edges >= time_range[0]) * (block_edges <= time_range[1])]
     if show_blocks:
         for sp in [sp11, sp12, sp13, sp21, sp22, sp23]:
             sp.set_xticks(t_factor * block_edges_in_range)
             sp.set_xticklabels(sp.get_xticklabels(), rotation=90)
 
-    for block_counter in seq.block_events:
+    # Only blocks overlapping with the time range are decompressed
+    blocks, t0 = select_blocks(seq, time_range)
+    for block_counter in blocks:
         block = seq.get_block(block_counter)
         is_valid = time_range[0] <= t0 + seq.block_durations[block_counter] and t0 <= time_range[1]
         if is_valid:
@@ -610,26 +612,32 @@ def _seq_plot(
                     )
 
             grad_channels = ['gx', 'gy', 'gz']
-            for x in range(len(grad_channels)):  # Gradients
-                if getattr(block, grad_channels[x], None) is not None:
-                    grad = getattr(block, grad_channels[x])
-                    if grad.type == 'grad':
-                        # We extend the shape by adding the first and the last points in an effort of making the
-                        # display a bit less confusing...
-                        time = grad.delay + np.array([0, *grad.tt, grad.shape_dur])
-                        waveform = g_factor * np.array((grad.first, *grad.waveform, grad.last))
-                    else:
-                        time = np.array(
-                            cumsum(
-                                0,
-                                grad.delay,
-                                grad.rise_time,
-                                grad.flat_time,
-                                grad.fall_time,
+            if getattr(block, 'rotation', None) is not None:
+                # Plot the rotated gradients as played out on the physical axes
+                for x, piece in enumerate(block_grad_points(block, seq.grad_raster_time)):
+                    if piece is not None:
+                        [sp21, sp22, sp23][x].plot(t_factor * (t0 + piece[0]), g_factor * piece[1])
+            else:
+                for x in range(len(grad_channels)):  # Gradients
+                    if getattr(block, grad_channels[x], None) is not None:
+                        grad = getattr(block, grad_channels[x])
+                        if grad.type == 'grad':
+                            # We extend the shape by adding the first and the last points in an effort of making the
+                            # display a bit less confusing...
+                            time = grad.delay + np.array([0, *grad.tt, grad.shape_dur])
+                            waveform = g_factor * np.array((grad.first, *grad.waveform, grad.last))
+                        else:
+                            time = np.array(
+                                cumsum(
+                                    0,
+                                    grad.delay,
+                                    grad.rise_time,
+                                    grad.flat_time,
+                                    grad.fall_time,
+                                )
                             )
-                        )
-                        waveform = g_factor * grad.amplitude * np.array([0, 0, 1, 1, 0])
-                    [sp21, sp22, sp23][x].plot(t_factor * (t0 + time), waveform)
+                            waveform = g_factor * grad.amplitude * np.array([0, 0, 1, 1, 0])
+                        [sp21, sp22, sp23][x].plot(t_factor * (t0 + time), waveform)
 
             # Soft delays - plot as shaded regions with annotations
             if getattr(block, 'soft_delay', None) is not None:
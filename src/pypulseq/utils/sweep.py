@@ -0,0 +1,233 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+
+from pypulseq.Sequence.compression import seq_file_name
+
+if TYPE_CHECKING:
+    from pypulseq.Sequence.sequence import Sequence
+
+SWEEP_CACHE_FILE = 'sweep_cache.json'
+SWEEP_SUMMARY_FILE = 'sweep_summary.csv'
+
+
+def run_sweep(
+    builder: Callable[..., 'Sequence'],
+    grid: Union[Dict[str, List[Any]], List[Dict[str, Any]]],
+    output_dir: Union[str, Path],
+    file_name: Union[str, None] = None,
+    num_processes: Union[int, None] = None,
+    chunk_size: Union[int, None] = None,
+    check_timing: bool = True,
+    use_cache: bool = True,
+    write_kwargs: Union[Dict[str, Any], None] = None,
+) -> List[SimpleNamespace]:
+    """
+    Build, check and write a family of sequences for all points of a parameter grid in a process pool.
+
+    Each parameter point is passed to `builder` as keyword arguments. The returned sequence is checked with
+    `Sequence.check_timing()` and written to `output_dir`. Points are distributed over the worker processes in chunks
+    and a failing point does not stop the sweep.
+
+    The signatures returned by `Sequence.write()` are stored with the size and modification time of the written files
+    in `output_dir/sweep_cache.json`, keyed by the builder and the parameters. Points whose output file is unchanged
+    since it was written are skipped. Points written without a signature (`create_signature=False`) are not cached.
+    Delete the cache file (or pass `use_cache=False`) after changing the builder. A summary of all points is written
+    to `output_dir/sweep_summary.csv`.
+
+    Parameters
+    ----------
+    builder : callable
+        Function that returns a `Sequence` for the keyword arguments of a parameter point, e.g. the `main()` function
+        of `examples/scripts/write_gre.py`. It has to be importable by the worker processes, i.e. a module-level
+        function.
+    grid : dict or list of dict
+        Parameter grid as a dict of parameter names and lists of values, for which all combinations are generated,
+        or an explicit list of parameter points.
+    output_dir : str or Path
+        Directory of the written sequence files.
+    file_name : str, optional
+        Format string for the file names, formatted with the parameters of each point, e.g. `'gre_te{te}.seq'`. The
+        default is `'<hash of the parameters>.seq'`.
+    num_processes : int, optional
+        Number of worker processes. The default is the number of CPUs. With 1, the sweep runs in the calling process.
+    chunk_size : int, optional
+        Number of points sent to a worker at once. The default distributes the points in four chunks per process.
+    check_timing : bool, default=True
+        Check the timing of each sequence. Files are also written if timing errors are found.
+    use_cache : bool, default=True
+        Skip points whose output file is unchanged since it was written by a previous sweep.
+    write_kwargs : dict, optional
+        Additional keyword arguments for `Sequence.write()`, e.g. `{'compression': 'gzip'}`.
+
+    Returns
+    -------
+    summary : list of SimpleNamespace
+        One entry per parameter point, in grid order, with the fields `params`, `file_name`, `status` ('written',
+        'cached' or 'failed'), `signature`, `timing_ok`, `timing_errors` (list of `check_timing()` error reports),
+        `duration` (sequence duration in seconds), `elapsed` (build time in seconds) and `error` (traceback of failed
+        points).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_kwargs = write_kwargs or {}
+
+    if isinstance(grid, dict):
+        points = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    else:
+        points = [dict(point) for point in grid]
+
+    builder_name = f'{builder.__module__}.{builder.__qualname__}'
+    keys = [_point_key(builder_name, point, write_kwargs) for point in points]
+    file_names = [
+        seq_file_name(
+            output_dir / (file_name.format(**point) if file_name is not None else key[:16]),
+            write_kwargs.get('compression'),
+        )
+        for point, key in zip(points, keys)
+    ]
+
+    cache_path = output_dir / SWEEP_CACHE_FILE
+    cache = _load_cache(cache_path) if use_cache else {}
+
+    summary = [None] * len(points)
+    todo = []
+    for i, (point, key, path) in enumerate(zip(points, keys, file_names)):
+        entry = cache.get(key)
+        file_stat = _file_stat(path)
+        if entry is not None and entry['file_name'] == path.name and file_stat and file_stat == entry.get('file_stat'):
+            summary[i] = SimpleNamespace(
+                params=point,
+                file_name=path,
+                status='cached',
+                signature=entry['signature'],
+                timing_ok=entry['timing_ok'],
+                timing_errors=[],
+                duration=entry['duration'],
+                elapsed=0.0,
+                error=None,
+            )
+        else:
+            todo.append(i)
+
+    tasks = [(builder, points[i], file_names[i], check_timing, write_kwargs) for i in todo]
+    if num_processes is None:
+        num_processes = os.cpu_count() or 1
+    if num_processes > 1 and len(tasks) > 1:
+        if chunk_size is None:
+            chunk_size = max(1, len(tasks) // (4 * num_processes))
+        with ProcessPoolExecutor(max_workers=num_processes) as pool:
+            results = list(pool.map(_run_point, tasks, chunksize=chunk_size))
+    else:
+        results = [_run_point(task) for task in tasks]
+
+    for i, result in zip(todo, results):
+        summary[i] = result
+        if result.status == 'written' and result.signature is not None:
+            cache[keys[i]] = {
+                'file_name': result.file_name.name,
+                'signature': result.signature,
+                'file_stat': _file_stat(result.file_name),
+                'timing_ok': result.timing_ok,
+                'duration': result.duration,
+            }
+
+    if use_cache:
+        _save_cache(cache_path, cache)
+    _write_summary(output_dir / SWEEP_SUMMARY_FILE, summary)
+    return summary
+
+
+def _run_point(task: tuple) -> SimpleNamespace:
+    """Builds, checks and writes the sequence of a single parameter point. Runs in the worker processes."""
+    builder, params, file_name, check_timing, write_kwargs = task
+    result = SimpleNamespace(
+        params=params,
+        file_name=file_name,
+        status='failed',
+        signature=None,
+        timing_ok=None,
+        timing_errors=[],
+        duration=None,
+        elapsed=None,
+        error=None,
+    )
+    start = time.perf_counter()
+    try:
+        seq = builder(**params)
+        if check_timing:
+            result.timing_ok, result.timing_errors = seq.check_timing()
+        result.duration = float(seq.duration()[0])
+        result.signature = seq.write(file_name, check_timing=False, **write_kwargs)
+        result.status = 'written'
+    except Exception:
+        result.error = traceback.format_exc()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _point_key(builder_name: str, params: Dict[str, Any], write_kwargs: Dict[str, Any]) -> str:
+    from pypulseq import __version__
+
+    key = json.dumps(
+        {'builder': builder_name, 'params': params, 'write_kwargs': write_kwargs, 'pypulseq': __version__},
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _file_stat(path: Path) -> Union[List[int], None]:
+    """Returns the size and modification time of a written file, which identify it in the cache."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_cache(cache_path: Path) -> Dict[str, dict]:
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path: Path, cache: Dict[str, dict]) -> None:
+    # Write to a temporary file first, so an interrupted sweep never leaves a partial cache
+    fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cache, f, indent=1)
+    Path(tmp).replace(cache_path)
+
+
+def _write_summary(summary_path: Path, summary: List[SimpleNamespace]) -> None:
+    with open(summary_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ['params', 'file_name', 'status', 'signature', 'timing_ok', 'timing_errors', 'duration', 'error']
+        )
+        for row in summary:
+            error = row.error.strip().splitlines()[-1] if row.error else ''
+            writer.writerow(
+                [
+                    json.dumps(row.params, default=repr),
+                    row.file_name.name,
+                    row.status,
+                    row.signature or '',
+                    '' if row.timing_ok is None else row.timing_ok,
+                    len(row.timing_errors),
+                    '' if row.duration is None else row.duration,
+                    error,
+                ]
+            )
@@ -1,3 +1,4 @@
+import importlib.util
 from pathlib import Path
 
 import numpy as np
@@ -38,3 +39,19 @@ def compare(file1, file2):
             assert line1 == line2
 
     return compare
+
+
+@pytest.fixture(scope='session')
+def load_example():
+    examples_dir = Path(__file__).resolve().parents[1] / 'examples' / 'scripts'
+
+    def load(example):
+        """
+        Run the `main()` function of an example script in examples/scripts and return the sequence
+        """
+        spec = importlib.util.spec_from_file_location(f'examples.{example}', examples_dir / f'{example}.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.main()
+
+    return load
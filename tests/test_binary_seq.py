@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.Sequence.binary_seq import LIBRARY_NAMES
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+def assert_sequences_equal(seq, seq2):
+    for name in LIBRARY_NAMES:
+        library = getattr(seq, name + '_library')
+        library2 = getattr(seq2, name + '_library')
+        assert list(library.data) == list(library2.data)
+        for key, data in library.data.items():
+            if library.numpy_data:
+                np.testing.assert_array_equal(data, library2.data[key])
+            else:
+                assert type(data) is type(library2.data[key])
+                assert data == library2.data[key]
+                assert [type(x) for x in data] == [type(x) for x in library2.data[key]]
+        assert library.type == library2.type
+        assert library.keymap == library2.keymap
+        assert library.next_free_ID == library2.next_free_ID
+
+    assert list(seq.block_events) == list(seq2.block_events)
+    for block_id, events in seq.block_events.items():
+        np.testing.assert_array_equal(events, seq2.block_events[block_id])
+    assert seq.block_durations == seq2.block_durations
+    assert seq.definitions.keys() == seq2.definitions.keys()
+    for key, value in seq.definitions.items():
+        np.testing.assert_array_equal(value, seq2.definitions[key])
+    assert seq.soft_delay_hints == seq2.soft_delay_hints
+    assert seq.extension_string_idx == seq2.extension_string_idx
+    assert seq.extension_numeric_idx == seq2.extension_numeric_idx
+    assert seq.signature_value == seq2.signature_value
+
+
+def make_sequence():
+    system = pp.Opts()
+    seq = pp.Sequence(system)
+    rf, gz, _ = pp.make_sinc_pulse(flip_angle=np.pi / 6, duration=1e-3, slice_thickness=3e-3, return_gz=True)
+    gx = pp.make_trapezoid(channel='x', flat_area=64 / 0.25, flat_time=3.2e-3)
+    adc = pp.make_adc(num_samples=64, duration=gx.flat_time, delay=gx.rise_time)
+    for i in range(4):
+        # Values that are not representable in the text format exactly
+        rf.phase_offset = i * np.pi / 3
+        seq.add_block(rf, gz)
+        seq.add_block(pp.scale_grad(gx, 1 / 3**i), adc, pp.make_label(type='SET', label='LIN', value=i))
+        seq.add_block(pp.make_soft_delay(hint='TE', numID=0, offset=1e-4), pp.make_delay(1e-3))
+    seq.set_definition('FOV', [0.25, 0.25, 3e-3])
+    seq.set_definition('Name', 'binary')
+    return seq
+
+
+def test_binary_round_trip(tmp_path):
+    seq = make_sequence()
+    seq.write_binary(tmp_path / 'seq')
+    assert (tmp_path / 'seq.seqb').exists()
+
+    for mmap in (False, True):
+        seq2 = pp.Sequence()
+        seq2.read_binary(tmp_path / 'seq.seqb', mmap=mmap)
+        assert_sequences_equal(seq, seq2)
+        np.testing.assert_array_equal(seq.waveforms()[0], seq2.waveforms()[0])
+
+    # The loaded sequence can be extended like any other
+    seq2.add_block(pp.make_delay(1e-3))
+    assert seq2.shape_library.find(seq.shape_library.data[1])[1]
+
+
+def test_binary_mmap_lazy(tmp_path):
+    seq = make_sequence()
+    seq.write_binary(tmp_path / 'seq.seqb')
+    seq2 = pp.Sequence()
+    seq2.read_binary(tmp_path / 'seq.seqb', mmap=True)
+
+    # Shapes are views into the file, which are not read until the keymap is needed
+    library = seq2.shape_library
+    assert all(isinstance(data, np.memmap) for data in library.data.values())
+    assert library._deferred_keys == list(library.data)
+    assert not library._keymap
+
+    assert library.find(seq.shape_library.data[1]) == (1, True)
+    assert not library._deferred_keys
+    assert library.keymap == seq.shape_library.keymap
+
+
+@pytest.mark.parametrize(
+    'seq_name', ['write_gre_label_softdelay', 'write_epi_se_rs', 'write_mprage', 'seq_make_gauss_pulses']
+)
+def test_binary_seq_conversion(tmp_path, seq_name):
+    seq = pp.Sequence()
+    seq.read(expected_output_path / (seq_name + '.seq'))
+
+    pp.convert_sequence_file(expected_output_path / (seq_name + '.seq'), tmp_path / 'seq.seqb')
+    seq2 = pp.Sequence()
+    seq2.read_binary(tmp_path / 'seq.seqb', mmap=True)
+    assert_sequences_equal(seq, seq2)
+
+    # Converting back to text gives the same file as writing the original sequence
+    pp.convert_sequence_file(tmp_path / 'seq.seqb', tmp_path / 'converted.seq', check_timing=False)
+    seq.write(tmp_path / 'original.seq', check_timing=False)
+    assert (tmp_path / 'converted.seq').read_text() == (tmp_path / 'original.seq').read_text()
+
+
+def test_convert_sequence_file_invalid_suffix(tmp_path):
+    with pytest.raises(ValueError, match='expected a'):
+        pp.convert_sequence_file(tmp_path / 'seq.txt', tmp_path / 'seq.seqb')
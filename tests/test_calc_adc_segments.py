@@ -65,6 +65,26 @@ def test_calc_adc_segments():
             print(round(i / data.shape[0] * 100, 2), '%')
 
 
+def test_calc_adc_segments_memoized():
+    from pypulseq.make_adc import _calc_adc_segments, _divisors
+
+    assert _divisors(36) == (1, 2, 3, 4, 6, 9, 12, 18, 36)
+    assert _divisors(1) == (1,)
+
+    system = Opts(adc_samples_limit=8192, adc_samples_divisor=4, adc_raster_time=1e-7)
+    _calc_adc_segments.cache_clear()
+    result = calc_adc_segments(num_samples=20000, dwell=2e-6, system=system)
+    assert calc_adc_segments(num_samples=20000, dwell=2e-6, system=system) == result
+    assert _calc_adc_segments.cache_info().hits == 1
+
+    # Changed system limits are not served from the cache
+    system.adc_samples_limit = 4096
+    num_seg, num_samples_seg = calc_adc_segments(num_samples=20000, dwell=2e-6, system=system)
+    assert num_samples_seg <= 4096
+    assert num_seg * num_samples_seg == 20000
+    assert _calc_adc_segments.cache_info().misses == 2
+
+
 # Can be run with "pytest <file>" or "python <file>"
 if __name__ == '__main__':
     test_calc_adc_segments()
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope='module')
+def seq(load_example):
+    return load_example('write_gre')
+
+
+@pytest.mark.parametrize('combine_mode', ['max', 'mean', 'rss'])
+@pytest.mark.parametrize('use_derivative', [False, True])
+@pytest.mark.parametrize('time_range', [None, [0.1, 1.3]])
+def test_streaming_spectrum(seq, combine_mode, use_derivative, time_range):
+    kwargs = {'plot': False, 'combine_mode': combine_mode, 'use_derivative': use_derivative, 'time_range': time_range}
+    spectrograms, spectrogram_rss, frequencies, times = seq.calculate_gradient_spectrum(**kwargs)
+    spectrograms_s, spectrogram_rss_s, frequencies_s, times_s = seq.calculate_gradient_spectrum(
+        **kwargs, streaming=True, num_threads=3, chunk_windows=4
+    )
+
+    np.testing.assert_allclose(frequencies_s, frequencies)
+    np.testing.assert_allclose(times_s, times)
+    for s, s_streaming in zip(spectrograms, spectrograms_s):
+        np.testing.assert_allclose(s_streaming, s, rtol=1e-12, atol=1e-12 * np.max(s))
+    np.testing.assert_allclose(spectrogram_rss_s, spectrogram_rss, rtol=1e-12)
+
+
+def test_streaming_spectrum_invalid_mode(seq):
+    with pytest.raises(ValueError, match='Streaming mode'):
+        seq.calculate_gradient_spectrum(plot=False, combine_mode='none', streaming=True)
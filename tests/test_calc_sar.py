@@ -0,0 +1,51 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+
+def block_pulse_seq(n_blocks, tr):
+    system = pp.Opts()
+    seq = pp.Sequence(system)
+    rf = pp.make_block_pulse(flip_angle=np.pi / 2, duration=1e-3, system=system)
+    for _ in range(n_blocks):
+        seq.add_block(rf, pp.make_delay(tr))
+    return seq, rf
+
+
+def test_calc_sar_block_pulse():
+    tr = 0.1
+    seq, rf = block_pulse_seq(200, tr)
+
+    sar = pp.calc_SAR(seq, coil_efficiency=1e-6, absorbed_fraction=1.0, exposed_mass=10.0)
+
+    # Energy of a single block pulse: integral of B1^2 divided by the squared coil efficiency
+    b1 = np.max(np.abs(rf.signal)) / seq.system.gamma
+    energy = b1**2 * 1e-3 / 1e-12
+    np.testing.assert_allclose(sar.energy, energy, rtol=1e-6)
+    assert sar.b1rms == pytest.approx(b1 * np.sqrt(1e-3 / tr), rel=1e-6)
+
+    # Steady state 10 s average, and 6 min average limited by the 20 s sequence duration
+    assert sar.max_sar_10s == pytest.approx(energy / tr / 10.0, rel=1e-6)
+    assert sar.max_sar_6min == pytest.approx(200 * energy / 360.0 / 10.0, rel=1e-6)
+    assert sar.sar_10s.shape == (200,)
+    assert sar.t[-1] == pytest.approx(200 * tr)
+
+
+def test_calc_sar_models():
+    seq, _ = block_pulse_seq(10, 0.01)
+
+    body = pp.calc_SAR(seq, model='body')
+    head = pp.calc_SAR(seq, model='head')
+    assert body.ok and head.ok
+    assert head.limit > body.limit
+
+    with pytest.raises(ValueError, match='Invalid SAR model'):
+        pp.calc_SAR(seq, model='knee')
+
+
+def test_calc_sar_file(tmp_path):
+    seq, _ = block_pulse_seq(10, 0.01)
+    seq.write(tmp_path / 'block.seq')
+
+    sar = pp.calc_SAR(tmp_path / 'block.seq')
+    np.testing.assert_allclose(sar.energy, pp.calc_SAR(seq).energy, rtol=1e-6)
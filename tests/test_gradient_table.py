@@ -0,0 +1,60 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+system = pp.Opts(max_grad=32, grad_unit='mT/m', max_slew=130, slew_unit='T/m/s')
+scales = (np.arange(32) - 16) / 16
+
+
+def add_blocks(seq, grads):
+    for grad in grads:
+        seq.add_block(grad, pp.make_delay(2e-3))
+
+
+@pytest.mark.parametrize('grad_type', ['trap', 'grad'])
+def test_gradient_table_matches_scale_grad(grad_type):
+    if grad_type == 'trap':
+        grad = pp.make_trapezoid('y', area=1000, duration=1e-3, system=system)
+    else:
+        grad = pp.make_arbitrary_grad('y', np.sin(np.linspace(0, np.pi, 100)) * 5e5, system=system)
+
+    seq_ref = pp.Sequence(system)
+    add_blocks(seq_ref, [pp.scale_grad(grad, s) for s in scales])
+
+    seq = pp.Sequence(system)
+    table = pp.GradientTable(seq, grad, scales, system=system)
+    num_grads = len(seq.grad_library.data)
+    add_blocks(seq, [table[i] for i in range(len(scales))])
+
+    # No new library entries are created when adding the blocks
+    assert len(seq.grad_library.data) == num_grads
+    assert table.shape == scales.shape
+
+    for block_id in seq.block_events:
+        g = seq.get_block(block_id).gy
+        g_ref = seq_ref.get_block(block_id).gy
+        if grad_type == 'trap':
+            assert g.amplitude == g_ref.amplitude
+        else:
+            np.testing.assert_allclose(g.waveform, g_ref.waveform, rtol=1e-12, atol=1e-6)
+
+
+def test_gradient_table_trapezoid_set():
+    grads = pp.make_trapezoids('z', np.linspace(-500, 500, 8)[:, None] * np.ones((1, 4)), duration=1e-3)
+    seq = pp.Sequence(system)
+    table = pp.GradientTable(seq, grads)
+    assert table.shape == (8, 4)
+    assert len(np.unique(table.ids)) == 8
+
+    seq.add_block(table[2, 3])
+    assert seq.block_events[1][4] == table.ids[2, 3]
+    assert seq.get_block(1).gz.area == pytest.approx(grads[2, 3].area)
+
+
+def test_gradient_table_errors():
+    grad = pp.make_trapezoid('y', area=1000, duration=1e-3, system=system)
+    seq = pp.Sequence(system)
+    with pytest.raises(ValueError, match='maximum amplitude exceeded'):
+        pp.GradientTable(seq, grad, [1, 100], system=system)
+    with pytest.raises(ValueError, match='`scales` must be provided'):
+        pp.GradientTable(seq, grad)
@@ -0,0 +1,47 @@
+"""Import-time regression tests: headless sequence generation must not load the plotting and analysis dependencies."""
+
+import subprocess
+import sys
+
+HEADLESS_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+import pypulseq as pp
+import_time = time.perf_counter() - start
+
+seq = pp.Sequence()
+rf = pp.make_block_pulse(flip_angle=0.1, duration=1e-3, delay=1e-4)
+gx = pp.make_trapezoid(channel='x', area=1000, duration=1e-3)
+adc = pp.make_adc(num_samples=64, duration=1e-3)
+seq.add_block(rf)
+seq.add_block(gx, adc)
+seq.write(sys.argv[1])
+
+print(import_time)
+print(','.join(sorted({m.split('.')[0] for m in sys.modules if m.split('.')[0] in ('matplotlib', 'scipy')})))
+"""
+
+
+def test_headless_import_does_not_load_matplotlib_or_scipy(tmp_path):
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-c', HEADLESS_SCRIPT, str(tmp_path / 'headless.seq')],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_time, loaded = result.stdout.splitlines()[-2:]
+
+    assert loaded == ''
+    # Generous bound to catch heavy imports sneaking back in without being flaky on slow machines
+    assert float(import_time) < 5
+
+
+def test_lazy_dependencies_loaded_on_use():
+    import pypulseq as pp
+
+    seq = pp.Sequence()
+    seq.add_block(pp.make_trapezoid(channel='x', area=1000, duration=1e-3))
+    gw_pp = seq.get_gradients()
+    assert type(gw_pp[0]).__module__.startswith('scipy.interpolate')
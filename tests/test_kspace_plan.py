@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('example', ['write_gre', 'write_epi_se', 'write_tse'])
+@pytest.mark.parametrize(
+    ('trajectory_delay', 'gradient_offset'),
+    [(0.0, 0.0), (5e-6, 0.0), ([2e-6, -3e-6, 1e-6], [10.0, 0.0, -5.0])],
+)
+def test_kspace_plan_matches_calculate_kspace(load_example, example, trajectory_delay, gradient_offset):
+    seq = load_example(example)
+    plan = seq.calculate_kspace_plan()
+
+    k_traj_adc, _, t_excitation, t_refocusing, t_adc = seq.calculate_kspace(trajectory_delay, gradient_offset)
+
+    np.testing.assert_allclose(plan.t_adc, t_adc, atol=1e-12)
+    np.testing.assert_allclose(plan.t_excitation, t_excitation, atol=1e-12)
+    np.testing.assert_allclose(plan.t_refocusing, t_refocusing, atol=1e-12)
+    np.testing.assert_allclose(plan.evaluate(trajectory_delay, gradient_offset), k_traj_adc, atol=1e-6)
+
+
+def test_kspace_plan_grid(load_example):
+    seq = load_example('write_epi')
+    plan = seq.calculate_kspace_plan()
+
+    delays = np.linspace(-5e-6, 5e-6, 5)
+    k_grid = plan.evaluate_grid(delays)
+    assert k_grid.shape == (len(delays), 3, len(plan.t_adc))
+
+    for delay, k_traj_adc in zip(delays, k_grid, strict=True):
+        np.testing.assert_allclose(k_traj_adc, seq.calculate_kspace(delay)[0], atol=1e-6)
+
+
+def test_kspace_plan_invalid_channels(load_example):
+    seq = load_example('write_gre')
+    plan = seq.calculate_kspace_plan()
+
+    with pytest.raises(ValueError, match='one value per gradient channel'):
+        plan.evaluate([1e-6, 1e-6])
@@ -0,0 +1,77 @@
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pypulseq as pp
+import pytest
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+@pytest.mark.parametrize('seq_name', ['write_gre_label_softdelay', 'write_epi_se_rs', 'seq_make_gauss_pulses'])
+def test_lazy_read(tmp_path, seq_name):
+    seq_file = tmp_path / (seq_name + '.seq')
+    shutil.copy(expected_output_path / seq_file.name, seq_file)
+
+    seq = pp.Sequence()
+    seq.read(seq_file, remove_duplicates=False)
+    seq_lazy = pp.Sequence()
+    seq_lazy.read(seq_file, lazy=True)
+
+    assert list(seq.block_events) == list(seq_lazy.block_events)
+    for block_id, events in seq.block_events.items():
+        np.testing.assert_array_equal(events, seq_lazy.block_events[block_id])
+        assert seq.block_durations[block_id] == seq_lazy.block_durations[block_id]
+    assert sorted(seq.shape_library.data) == sorted(seq_lazy.shape_library.data)
+    for shape_id, data in seq.shape_library.data.items():
+        np.testing.assert_array_equal(data, seq_lazy.shape_library.data[shape_id])
+    assert seq.rf_library.data == seq_lazy.rf_library.data
+    assert seq.duration()[0] == seq_lazy.duration()[0]
+
+    time_range = [0, seq.duration()[0] / 3]
+    for wave, wave_lazy in zip(seq.waveforms(time_range=time_range), seq_lazy.waveforms(time_range=time_range)):
+        np.testing.assert_array_equal(wave, wave_lazy)
+
+
+def test_lazy_read_index_cache(tmp_path, monkeypatch):
+    seq_file = tmp_path / 'write_gre.seq'
+    shutil.copy(expected_output_path / seq_file.name, seq_file)
+
+    seq = pp.Sequence()
+    seq.read(seq_file, lazy=True)
+    assert (tmp_path / 'write_gre.seq.idx').exists()
+
+    # An unchanged file is read without indexing it again
+    def fail(*args, **kwargs):
+        raise AssertionError('File was indexed again')
+
+    lazy_seq = sys.modules['pypulseq.Sequence.lazy_seq']
+    monkeypatch.setattr(lazy_seq, '_build_index', fail)
+    seq_cached = pp.Sequence()
+    seq_cached.read(seq_file, lazy=True)
+    assert list(seq.block_events) == list(seq_cached.block_events)
+
+    # A modified file invalidates the index
+    with open(seq_file, 'a') as f:
+        f.write('\n')
+    with pytest.raises(AssertionError, match='indexed again'):
+        pp.Sequence().read(seq_file, lazy=True)
+
+
+def test_lazy_read_is_read_only(tmp_path):
+    seq_file = tmp_path / 'write_gre.seq'
+    shutil.copy(expected_output_path / seq_file.name, seq_file)
+    seq = pp.Sequence()
+    seq.read(seq_file, lazy=True)
+
+    with pytest.raises(TypeError):
+        seq.add_block(pp.make_delay(1e-3))
+
+
+def test_lazy_read_old_version(tmp_path):
+    seq_file = tmp_path / 'simple_mprage142.seq'
+    shutil.copy(expected_output_path / seq_file.name, seq_file)
+
+    with pytest.raises(RuntimeError, match=r'1\.5\.0 or above'):
+        pp.Sequence().read(seq_file, lazy=True)
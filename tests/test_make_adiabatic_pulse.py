@@ -7,7 +7,8 @@
 
 import numpy as np
 import pytest
-from pypulseq import make_adiabatic_pulse
+from pypulseq import make_adiabatic_pulse, make_adiabatic_pulses
+from pypulseq.make_adiabatic_pulse import _bir4, _goia_wurst, _hypsec, _wurst
 from pypulseq.supported_labels_rf_use import get_supported_rf_uses
 
 
@@ -69,3 +70,52 @@ def test_wurst_options():
     pobj = make_adiabatic_pulse(pulse_type='wurst', n_fac=25, bandwidth=30000, duration=0.05)
 
     assert np.isclose(pobj.shape_dur, 0.05)
+
+
+@pytest.mark.parametrize(
+    ('pulse_type', 'params'),
+    [
+        ('hypsec', {'beta': [600.0, 700.0, 800.0], 'mu': [[4.0], [4.9]]}),
+        ('wurst', {'bandwidth': [20000, 30000], 'n_fac': [[20], [30], [40]], 'adiabaticity': 3}),
+    ],
+)
+def test_make_adiabatic_pulses(pulse_type, params):
+    rfs = make_adiabatic_pulses(pulse_type, duration=8.1e-3, **params)
+    grid = np.broadcast_arrays(*(np.asarray(v) for v in params.values()))
+    assert len(rfs) == grid[0].size
+
+    for i, rf in enumerate(rfs):
+        variant = {name: values.reshape(-1)[i].item() for name, values in zip(params, grid)}
+        expected = make_adiabatic_pulse(pulse_type, duration=8.1e-3, **variant)
+        np.testing.assert_allclose(rf.signal, expected.signal, rtol=1e-12, atol=1e-12)
+        np.testing.assert_array_equal(rf.t, expected.t)
+        assert rf.center == pytest.approx(expected.center)
+        assert rf.delay == expected.delay
+
+
+def test_make_adiabatic_pulses_writable():
+    # The bandwidth is ignored by hypsec pulses, the waveforms are still independent, writable arrays
+    rfs = make_adiabatic_pulses('hypsec', bandwidth=[2e4, 3e4])
+    expected = make_adiabatic_pulse('hypsec')
+    rfs[0].signal *= 2
+    np.testing.assert_array_equal(rfs[0].signal, 2 * expected.signal)
+    np.testing.assert_array_equal(rfs[1].signal, expected.signal)
+    assert rfs[0].center == expected.center
+
+
+def test_vectorized_helpers():
+    amp, freq = _hypsec(n=256, beta=np.array([600.0, 800.0]), mu=4.9, dur=np.array([[8e-3], [10e-3]]))
+    assert amp.shape == freq.shape == (2, 2, 256)
+    np.testing.assert_array_equal(amp[1, 0], _hypsec(n=256, beta=600.0, mu=4.9, dur=10e-3)[0])
+
+    amp, freq = _wurst(n=256, n_fac=[20, 40], bw=30000, dur=2e-3)
+    assert amp.shape == freq.shape == (2, 256)
+    np.testing.assert_array_equal(freq[1], _wurst(n=256, n_fac=40, bw=30000, dur=2e-3)[1])
+
+    amp, freq = _bir4(n=256, beta=10, kappa=np.arctan(20), theta=np.array([np.pi / 2, np.pi]), dw0=100 * 2 * np.pi)
+    assert amp.shape == freq.shape == (2, 256)
+    np.testing.assert_array_equal(amp[0], _bir4(256, 10, np.arctan(20), np.pi / 2, 100 * 2 * np.pi)[0])
+
+    amp, freq, grad = _goia_wurst(n=256, f=[0.8, 0.9])
+    assert amp.shape == freq.shape == grad.shape == (2, 256)
+    np.testing.assert_array_equal(freq[1], _goia_wurst(n=256, f=0.9)[1])
@@ -187,3 +187,19 @@ def _calc_ramp_time(grad_amp, slew_rate, grad_start):
     d2 = calc_duration(g_true)
 
     assert pytest.approx(d1) == d2 or d1 < d2
+
+
+def test_make_extended_trapezoid_area_memoized():
+    g1, _, _ = make_extended_trapezoid_area(channel='x', grad_start=0, grad_end=1000, area=100, system=system)
+    g2, _, _ = make_extended_trapezoid_area(channel='y', grad_start=0, grad_end=1000, area=100, system=system)
+
+    # Cached solutions are returned as new, independent events
+    assert g1 is not g2
+    assert g2.channel == 'y'
+    np.testing.assert_array_equal(g1.tt, g2.tt)
+    np.testing.assert_array_equal(g1.waveform, g2.waveform)
+
+    # Different system limits give a different solution
+    slow_system = Opts(max_slew=system.max_slew / 2, slew_unit='Hz/m/s')
+    g3, _, _ = make_extended_trapezoid_area(channel='x', grad_start=0, grad_end=1000, area=100, system=slow_system)
+    assert calc_duration(g3) > calc_duration(g1)
@@ -0,0 +1,67 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+system = pp.Opts(max_grad=32, grad_unit='mT/m', max_slew=130, slew_unit='T/m/s')
+raster = system.grad_raster_time
+
+rng = np.random.default_rng(0)
+times = [np.sort(rng.choice(np.arange(1, 100), n, replace=False)) * raster for n in [2, 3, 5, 8]]
+times = [np.concatenate(([0], t)) for t in times]
+amplitudes = [np.concatenate(([0], rng.uniform(-1, 1, len(t) - 2) * 1e5, [0])) for t in times]
+
+
+def test_points_to_waveforms_matches_points_to_waveform():
+    # Include points off the raster and an empty set
+    sets_t = [*times, times[2] + 0.3 * raster, np.zeros(0)]
+    sets_a = [*amplitudes, amplitudes[2], np.zeros(0)]
+    offsets = np.concatenate(([0], np.cumsum([len(t) for t in sets_t])))
+    waveforms, waveform_offsets = pp.points_to_waveforms(
+        np.concatenate(sets_a), raster, np.concatenate(sets_t), offsets
+    )
+
+    assert len(waveform_offsets) == len(sets_t) + 1
+    for i, (t, a) in enumerate(zip(sets_t, sets_a)):
+        expected = pp.points_to_waveform(a, raster, t)
+        np.testing.assert_allclose(waveforms[waveform_offsets[i] : waveform_offsets[i + 1]], expected, atol=1e-9)
+
+
+@pytest.mark.parametrize('convert_to_arbitrary', [False, True])
+def test_make_extended_trapezoids_matches_make_extended_trapezoid(convert_to_arbitrary):
+    grads = pp.make_extended_trapezoids(
+        'x', amplitudes, times, convert_to_arbitrary=convert_to_arbitrary, system=system
+    )
+    assert len(grads) == len(times)
+
+    for grad, t, a in zip(grads, times, amplitudes):
+        expected = pp.make_extended_trapezoid(
+            'x', amplitudes=a, times=t, convert_to_arbitrary=convert_to_arbitrary, system=system
+        )
+        assert vars(grad).keys() == vars(expected).keys()
+        for key, value in vars(expected).items():
+            if isinstance(value, str):
+                assert getattr(grad, key) == value
+                continue
+            np.testing.assert_allclose(getattr(grad, key), value, rtol=1e-12, atol=1e-9, err_msg=key)
+
+    # CSR input
+    offsets = np.concatenate(([0], np.cumsum([len(t) for t in times])))
+    grads_csr = pp.make_extended_trapezoids(
+        'x',
+        np.concatenate(amplitudes),
+        np.concatenate(times),
+        offsets,
+        convert_to_arbitrary=convert_to_arbitrary,
+        system=system,
+    )
+    for grad, grad_csr in zip(grads, grads_csr):
+        np.testing.assert_array_equal(grad.waveform, grad_csr.waveform)
+
+
+def test_make_extended_trapezoids_errors():
+    with pytest.raises(ValueError, match='ascending'):
+        pp.make_extended_trapezoids('x', [[0, 1, 0]], [[0, 2 * raster, raster]], system=system)
+    with pytest.raises(ValueError, match='connect'):
+        pp.make_extended_trapezoids('x', [[0, 0], [1, 0]], [[0, raster], [raster, 2 * raster]], system=system)
+    with pytest.raises(ValueError, match='Slew rate'):
+        pp.make_extended_trapezoids('x', [[0, 0], [0, 1e6, 0]], [[0, raster], [0, raster, 2 * raster]], system=system)
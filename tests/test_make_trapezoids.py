@@ -0,0 +1,50 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+system = pp.Opts(max_grad=32, grad_unit='mT/m', max_slew=130, slew_unit='T/m/s')
+areas = (np.arange(64) - 32) * 1 / 0.256 + np.concatenate(([-1500, 1500], np.zeros(62)))
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [{}, {'duration': 2e-3}, {'duration': 2e-3, 'rise_time': 2e-4}, {'delay': 1e-4}],
+)
+def test_make_trapezoids_matches_make_trapezoid(kwargs):
+    grads = pp.make_trapezoids('y', areas, system=system, **kwargs)
+    assert len(grads) == len(areas)
+
+    for area, grad in zip(areas, grads):
+        expected = pp.make_trapezoid('y', area=area, system=system, **kwargs)
+        assert vars(grad) == vars(expected)
+
+
+def test_make_trapezoids_shared_timing():
+    grads = pp.make_trapezoids('y', areas, shared_timing=True, system=system)
+    longest = pp.make_trapezoid('y', area=np.max(np.abs(areas)), system=system)
+
+    np.testing.assert_array_equal(grads.rise_time, longest.rise_time)
+    np.testing.assert_array_equal(grads.flat_time, longest.flat_time)
+    np.testing.assert_allclose(grads.area, areas)
+
+
+def test_make_trapezoids_table():
+    ky = (np.arange(16) - 8) * 10.0
+    kz = (np.arange(8) - 4) * 20.0
+    grads = pp.make_trapezoids('y', ky[:, None] + kz[None, :], duration=1e-3, system=system)
+    assert grads.shape == (16, 8)
+    assert grads[3].shape == (8,)
+    assert grads[3, 5].area == pytest.approx(ky[3] + kz[5])
+
+    seq = pp.Sequence(system)
+    seq.add_block(grads[3, 5])
+    assert seq.get_block(1).gy.amplitude == pytest.approx(grads[3, 5].amplitude)
+
+
+def test_make_trapezoids_errors():
+    with pytest.raises(ValueError, match='Invalid channel'):
+        pp.make_trapezoids('a', areas, system=system)
+    with pytest.raises(ValueError, match='too large'):
+        pp.make_trapezoids('y', areas, duration=1e-4, system=system)
+    with pytest.raises(ValueError, match='Must supply `duration`'):
+        pp.make_trapezoids('y', areas, rise_time=1e-4, system=system)
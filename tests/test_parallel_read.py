@@ -0,0 +1,49 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.Sequence import parallel_read
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+@pytest.mark.filterwarnings('ignore:Loading older Pulseq format file')
+@pytest.mark.parametrize(
+    'seq_name', ['write_gre_label_softdelay', 'write_epi_se_rs', 'seq_make_gauss_pulses', 'simple_mprage142']
+)
+@pytest.mark.parametrize('remove_duplicates', [False, True])
+@pytest.mark.parametrize('num_processes', [1, 3])
+def test_read_parallel(seq_name, remove_duplicates, num_processes):
+    seq = pp.Sequence()
+    seq.read(expected_output_path / (seq_name + '.seq'), remove_duplicates=remove_duplicates)
+    seq_parallel = pp.Sequence()
+    seq_parallel.read(
+        expected_output_path / (seq_name + '.seq'), remove_duplicates=remove_duplicates, num_processes=num_processes
+    )
+
+    assert list(seq.block_events) == list(seq_parallel.block_events)
+    for block_id, events in seq.block_events.items():
+        np.testing.assert_array_equal(events, seq_parallel.block_events[block_id])
+    assert seq.block_durations == seq_parallel.block_durations
+    assert list(seq.shape_library.data) == list(seq_parallel.shape_library.data)
+    for shape_id, data in seq.shape_library.data.items():
+        np.testing.assert_array_equal(data, seq_parallel.shape_library.data[shape_id])
+    assert seq.shape_library.keymap == seq_parallel.shape_library.keymap
+    assert seq.rf_library.data == seq_parallel.rf_library.data
+    assert seq.grad_library.data == seq_parallel.grad_library.data
+    assert seq.next_free_block_ID == seq_parallel.next_free_block_ID
+
+
+def test_read_parallel_single_process(monkeypatch):
+    # With one process, the sections are parsed with NumPy in the calling process
+    def fail(*args, **kwargs):
+        raise AssertionError('Process pool was started')
+
+    monkeypatch.setattr(parallel_read, 'ProcessPoolExecutor', fail)
+    parse_blocks = Mock(wraps=parallel_read._parse_blocks)
+    monkeypatch.setattr(parallel_read, '_parse_blocks', parse_blocks)
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_gre_label_softdelay.seq', num_processes=1)
+    assert parse_blocks.called
@@ -0,0 +1,100 @@
+import sys
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.utils import pulse_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    pp.enable_pulse_cache(tmp_path)
+    yield tmp_path
+    pp.disable_pulse_cache()
+
+
+def test_adiabatic_pulse_cached(cache_dir, monkeypatch):
+    expected = pp.make_adiabatic_pulse('hypsec', duration=8e-3)
+    assert len(list(cache_dir.glob('*.npz'))) == 1
+
+    # A cache hit does not design the pulse again
+    def fail(*args, **kwargs):
+        raise AssertionError('Pulse was designed again')
+
+    monkeypatch.setattr(sys.modules['pypulseq.make_adiabatic_pulse'], '_hypsec', fail)
+    rf = pp.make_adiabatic_pulse('hypsec', duration=8e-3)
+    np.testing.assert_array_equal(rf.signal, expected.signal)
+    np.testing.assert_array_equal(rf.t, expected.t)
+    assert rf.center == expected.center
+
+    # Different parameters are a cache miss
+    with pytest.raises(AssertionError, match='designed again'):
+        pp.make_adiabatic_pulse('hypsec', duration=8e-3, beta=700)
+
+    monkeypatch.undo()
+    pp.make_adiabatic_pulse('wurst', duration=8e-3)
+    assert len(list(cache_dir.glob('*.npz'))) == 2
+
+    pp.clear_pulse_cache()
+    assert len(list(cache_dir.glob('*.npz'))) == 0
+
+
+def test_pulse_cache_eviction(tmp_path):
+    pp.enable_pulse_cache(tmp_path, max_size=1)
+    try:
+        for i in range(3):
+            pulse_cache.cached_pulse('test', {'i': i}, lambda i=i: {'x': np.full(10, i)})
+        # Only the most recent entry is kept, even if it exceeds the size limit on its own
+        files = list(tmp_path.glob('*.npz'))
+        assert len(files) == 1
+        with np.load(files[0]) as data:
+            np.testing.assert_array_equal(data['x'], np.full(10, 2))
+    finally:
+        pp.disable_pulse_cache()
+
+
+def test_pulse_cache_write_errors(cache_dir, monkeypatch):
+    def design():
+        return {'x': np.arange(4.0)}
+
+    # Failed writes leave no temporary files behind
+    def fail(*args, **kwargs):
+        raise OSError('Disk full')
+
+    monkeypatch.setattr(pulse_cache.np, 'savez', fail)
+    pulse_cache.cached_pulse('test', {}, design)
+    assert list(cache_dir.iterdir()) == []
+    monkeypatch.undo()
+
+    # Entries of read-only caches are still used
+    pulse_cache.cached_pulse('test', {}, design)
+    monkeypatch.setattr(pulse_cache.os, 'utime', fail)
+    result = pulse_cache.cached_pulse('test', {}, lambda: pytest.fail('Pulse was designed again'))
+    np.testing.assert_array_equal(result['x'], np.arange(4.0))
+
+
+def test_pulse_cache_corrupt_file(cache_dir):
+    calls = []
+
+    def design():
+        calls.append(1)
+        return {'x': np.arange(4.0)}
+
+    pulse_cache.cached_pulse('test', {'a': np.float64(1.5)}, design)
+    file = next(cache_dir.glob('*.npz'))
+    file.write_bytes(b'not a npz file')
+
+    result = pulse_cache.cached_pulse('test', {'a': np.float64(1.5)}, design)
+    np.testing.assert_array_equal(result['x'], np.arange(4.0))
+    assert len(calls) == 2
+
+
+@pytest.mark.sigpy
+def test_sigpy_slr_cached(cache_dir):
+    from pypulseq.make_sigpy_pulse import make_slr
+
+    signal, _, pulse = make_slr(np.pi / 2, duration=3e-3)
+    signal_cached, _, pulse_cached = make_slr(np.pi / 2, duration=3e-3)
+    assert len(list(cache_dir.glob('*.npz'))) == 1
+    np.testing.assert_array_equal(signal, signal_cached)
+    np.testing.assert_array_equal(pulse, pulse_cached)
@@ -0,0 +1,97 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.utils import read_cache
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    pp.enable_read_cache(tmp_path / 'cache')
+    yield tmp_path / 'cache'
+    pp.disable_read_cache()
+
+
+def assert_same_sequence(seq, seq2):
+    assert list(seq.block_events) == list(seq2.block_events)
+    for block_id, events in seq.block_events.items():
+        np.testing.assert_array_equal(events, seq2.block_events[block_id])
+    assert seq.block_durations == seq2.block_durations
+    assert seq.rf_library.data == seq2.rf_library.data
+    assert seq.grad_library.data == seq2.grad_library.data
+    assert seq.adc_library.data == seq2.adc_library.data
+    assert seq.shape_library.data.keys() == seq2.shape_library.data.keys()
+    assert seq.signature_value == seq2.signature_value
+
+
+def test_read_cached(cache_dir, monkeypatch):
+    expected = pp.Sequence()
+    expected.read(expected_output_path / 'write_gre_label_softdelay.seq')
+    assert len(list(cache_dir.glob('*.seqb'))) == 1
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # A cache hit does not parse the file again
+    def fail(*args, **kwargs):
+        raise AssertionError('File was parsed again')
+
+    monkeypatch.setattr(read_cache, 'read', fail)
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_gre_label_softdelay.seq')
+    assert_same_sequence(expected, seq)
+    assert seq.next_free_block_ID == expected.next_free_block_ID
+
+    # Different read options are a cache miss
+    with pytest.raises(AssertionError, match='parsed again'):
+        pp.Sequence().read(expected_output_path / 'write_gre_label_softdelay.seq', remove_duplicates=False)
+
+    monkeypatch.undo()
+    pp.clear_read_cache()
+    assert len(list(cache_dir.glob('*.seqb'))) == 0
+
+
+def test_read_cache_modified_file(cache_dir, tmp_path):
+    seq_file = tmp_path / 'write_gre.seq'
+    shutil.copy(expected_output_path / 'write_gre.seq', seq_file)
+    pp.Sequence().read(seq_file)
+
+    # Modified files (here: removing the signature) are parsed again
+    text = seq_file.read_text()
+    seq_file.write_text(text[: text.index('[SIGNATURE]')])
+    seq = pp.Sequence()
+    seq.read(seq_file)
+    assert len(list(cache_dir.glob('*.seqb'))) == 2
+    assert seq.signature_value == ''
+
+
+def test_read_cache_eviction(tmp_path):
+    pp.enable_read_cache(tmp_path, max_size=1)
+    try:
+        for seq_name in ['write_gre', 'write_epi', 'write_tse']:
+            pp.Sequence().read(expected_output_path / (seq_name + '.seq'))
+        # Only the most recent entry is kept, even if it exceeds the size limit on its own
+        assert len(list(tmp_path.glob('*.seqb'))) == 1
+
+        # The kept entry is the one of the last read file
+        pp.disable_read_cache()
+        expected = pp.Sequence()
+        expected.read(expected_output_path / 'write_tse.seq')
+        seq = pp.Sequence()
+        seq.read_binary(next(tmp_path.glob('*.seqb')))
+        assert_same_sequence(expected, seq)
+    finally:
+        pp.disable_read_cache()
+
+
+def test_read_cache_corrupt_file(cache_dir):
+    expected = pp.Sequence()
+    expected.read(expected_output_path / 'write_gre.seq')
+    file = next(cache_dir.glob('*.seqb'))
+    file.write_bytes(b'not a seqb file')
+
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_gre.seq')
+    assert_same_sequence(expected, seq)
@@ -0,0 +1,86 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+system = pp.Opts(max_grad=32, grad_unit='mT/m', max_slew=130, slew_unit='T/m/s')
+slice_thickness = 3e-3
+slice_positions = (np.arange(8) - 3.5) * slice_thickness
+
+
+def test_make_sinc_pulses_matches_make_sinc_pulse():
+    phase_offset = np.linspace(0, np.pi, len(slice_positions))
+    rf_set, gz, gzr = pp.make_sinc_pulses(
+        np.pi / 2,
+        phase_offset=phase_offset,
+        slice_positions=slice_positions,
+        slice_thickness=slice_thickness,
+        return_gz=True,
+        system=system,
+    )
+    assert len(rf_set) == len(slice_positions)
+
+    for i, rf in enumerate(rf_set):
+        expected, expected_gz, expected_gzr = pp.make_sinc_pulse(
+            np.pi / 2,
+            freq_offset=gz.amplitude * slice_positions[i],
+            phase_offset=phase_offset[i],
+            slice_thickness=slice_thickness,
+            return_gz=True,
+            system=system,
+        )
+        assert rf.freq_offset == pytest.approx(expected.freq_offset)
+        assert rf.phase_offset == expected.phase_offset
+        np.testing.assert_array_equal(rf.signal, expected.signal)
+        assert rf.delay == expected.delay
+        assert vars(gz) == vars(expected_gz)
+        assert vars(gzr) == vars(expected_gzr)
+
+
+def test_make_gauss_and_block_pulses():
+    freq_offset = np.array([[-1000.0, 0.0], [500.0, 1000.0]])
+    rf_set = pp.make_gauss_pulses(np.pi / 2, freq_offset=freq_offset, system=system)
+    assert rf_set.shape == (2, 2)
+    assert rf_set[1].shape == (2,)
+    assert rf_set[1, 0].freq_offset == 500.0
+    np.testing.assert_array_equal(rf_set[1, 0].signal, pp.make_gauss_pulse(np.pi / 2, system=system).signal)
+
+    rf_set = pp.make_block_pulses(np.pi / 2, freq_offset=[0, 100], duration=1e-3, system=system)
+    assert rf_set[1].freq_offset == 100.0
+    assert rf_set[1].shape_dur == pytest.approx(1e-3)
+
+
+def test_rf_pulse_set_register():
+    rf_set = pp.make_sinc_pulses(np.pi / 2, freq_offset=(np.arange(4) - 2) * 1000, system=system)
+
+    seq = pp.Sequence(system)
+    ids = rf_set.register(seq)
+    assert ids.shape == (4,)
+    assert len(set(ids.tolist())) == 4
+    assert len(seq.shape_library.data) == 2  # Magnitude and phase shape shared by all variants
+
+    for i in range(4):
+        seq.add_block(rf_set[i])
+        assert seq.block_events[i + 1][1] == ids[i]
+
+    # Registered variants are identical to registering the events individually
+    seq2 = pp.Sequence(system)
+    for rf in pp.make_sinc_pulses(np.pi / 2, freq_offset=(np.arange(4) - 2) * 1000, system=system):
+        seq2.add_block(rf)
+    assert seq.rf_library.data == seq2.rf_library.data
+
+
+def test_rf_pulse_set_multiband():
+    rf_set = pp.make_sinc_pulses(np.pi / 2, freq_offset=[-2000, 2000], phase_offset=[0, 1], system=system)
+    rf_mb = rf_set.multiband(system=system)
+    assert rf_mb.freq_offset == 0
+    assert rf_mb.phase_offset == 0
+
+    expected = sum(rf.signal * np.exp(1j * (2 * np.pi * rf.freq_offset * rf.t + rf.phase_offset)) for rf in rf_set)
+    np.testing.assert_allclose(rf_mb.signal, expected)
+
+    # Block pulses are resampled to the RF raster
+    rf_mb = pp.make_block_pulses(np.pi / 2, freq_offset=[-1000, 1000], duration=1e-3, system=system).multiband()
+    assert len(rf_mb.signal) == round(1e-3 / system.rf_raster_time)
+
+    seq = pp.Sequence(system)
+    seq.add_block(rf_mb)
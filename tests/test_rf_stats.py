@@ -0,0 +1,64 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+
+def make_seq():
+    system = pp.Opts()
+    seq = pp.Sequence(system)
+    rf, gz, _ = pp.make_sinc_pulse(
+        flip_angle=np.pi / 6, duration=2e-3, slice_thickness=5e-3, return_gz=True, use='excitation', system=system
+    )
+    rf180 = pp.make_block_pulse(flip_angle=np.pi, duration=1e-3, use='refocusing', system=system)
+    for i in range(4):
+        rf.freq_offset = 1000 * i
+        seq.add_block(rf, gz)
+        seq.add_block(rf180)
+        seq.add_block(pp.make_delay(10e-3))
+    return seq
+
+
+def test_rf_stats_matches_decoded_events():
+    seq = make_seq()
+    table = seq.rf_stats()
+
+    assert len(table.id) == 5
+    assert table.count.sum() == 8
+    for use, count in zip(table.use, table.count):
+        assert count == (4 if use == 'r' else 1)
+
+    for i, rf_id in enumerate(table.id):
+        rf = seq.rf_from_lib_data(seq.rf_library.data[rf_id])
+        flip_angle = np.abs(np.sum(rf.signal[:-1] * np.diff(rf.t))) * 360
+        assert table.flip_angle[i] == pytest.approx(flip_angle)
+        if table.use[i] == 'r':  # Block pulse defined by a time shape
+            assert table.energy[i] == pytest.approx(500**2 * 1e-3)
+        else:
+            assert table.energy[i] == pytest.approx(np.sum(np.abs(rf.signal) ** 2) * seq.rf_raster_time)
+        assert table.peak[i] == pytest.approx(np.max(np.abs(rf.signal)))
+        assert table.center[i] == pytest.approx(pp.calc_rf_center(rf)[0])
+
+    np.testing.assert_allclose(np.unique(np.round(table.flip_angle, 2)), [30, 180])
+
+    total_duration = sum(seq.block_durations.values())
+    assert table.duty_cycle == pytest.approx((4 * 2e-3 + 4 * 1e-3) / total_duration)
+    assert table.b1rms == pytest.approx(np.sqrt(np.dot(table.count, table.energy) / total_duration))
+
+
+def test_rf_stats_cache_invalidation(tmp_path):
+    seq = make_seq()
+    table = seq.rf_stats()
+
+    # Changing the amplitude of a library entry updates its stats
+    rf_id = table.id[0]
+    data = seq.rf_library.data[rf_id]
+    seq.rf_library.update(rf_id, None, (2 * data[0], *data[1:]))
+    assert seq.get_rf_stats(rf_id).energy == pytest.approx(4 * table.energy[0])
+    assert seq.get_rf_stats(rf_id).integral == pytest.approx(2 * table.integral[0])
+
+    # Reading a file replaces the shape library
+    seq = make_seq()
+    seq.write(tmp_path / 'rf.seq')
+    seq2 = make_seq()
+    seq2.read(tmp_path / 'rf.seq')
+    np.testing.assert_allclose(seq2.rf_stats().energy, table.energy, rtol=1e-5)
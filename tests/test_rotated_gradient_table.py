@@ -0,0 +1,106 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+system = pp.Opts(max_grad=32, grad_unit='mT/m', max_slew=130, slew_unit='T/m/s')
+angles = np.linspace(0, 2 * np.pi, 25)
+
+gx = pp.make_trapezoid('x', area=1000, duration=2e-3, system=system)
+gy = pp.make_trapezoid('y', area=300, duration=1e-3, delay=2e-4, system=system)
+gz = pp.make_trapezoid('z', area=-500, duration=2e-3, system=system)
+g_ext = pp.make_extended_trapezoid('y', amplitudes=np.array([0, 1e5, 5e4, 0]), times=np.array([0, 2e-4, 6e-4, 8e-4]))
+g_arb = pp.make_arbitrary_grad('x', np.sin(np.linspace(0, np.pi, 100)) * 2e5, system=system)
+adc = pp.make_adc(num_samples=64, duration=1e-3)
+
+
+def sampled_blocks(seq):
+    # Gradient waveforms of each block sampled at the gradient raster centers, where both trapezoids and arbitrary
+    # gradients are represented exactly
+    samples = []
+    for block_id in seq.block_events:
+        block = seq.get_block(block_id)
+        t = (np.arange(round(seq.block_durations[block_id] / seq.grad_raster_time)) + 0.5) * seq.grad_raster_time
+        for channel in ['gx', 'gy', 'gz']:
+            g = getattr(block, channel)
+            if g is None:
+                samples.append(np.zeros_like(t))
+            elif g.type == 'trap':
+                tt = np.cumsum([g.delay, g.rise_time, g.flat_time, g.fall_time])
+                samples.append(np.interp(t, tt, [0, g.amplitude, g.amplitude, 0], left=0, right=0))
+            else:
+                samples.append(np.interp(t, g.delay + g.tt, g.waveform, left=0, right=0))
+    return np.concatenate(samples)
+
+
+@pytest.mark.parametrize(
+    'events',
+    [(gx, adc), (gx, gz), (gx, gy, gz), (gx, g_ext), (g_arb, gz)],
+    ids=['trap_adc', 'trap_parallel', 'trap_mixed', 'extended', 'arbitrary'],
+)
+@pytest.mark.parametrize('axis', ['x', 'y', 'z'])
+def test_rotated_gradient_table_matches_rotate(events, axis):
+    seq_ref = pp.Sequence(system)
+    for angle in angles:
+        seq_ref.add_block(*pp.rotate(*events, angle=angle, axis=axis, system=system))
+
+    seq = pp.Sequence(system)
+    table = pp.RotatedGradientTable(seq, *events, angles=angles, axis=axis, system=system)
+    num_grads = len(seq.grad_library.data)
+    for i in range(len(table)):
+        seq.add_block(*table[i])
+
+    # No new library entries are created when adding the blocks
+    assert len(seq.grad_library.data) == num_grads
+    assert table.waveforms.shape == (len(angles), 3, len(table.times))
+    assert seq.block_durations == seq_ref.block_durations
+    assert len(seq.adc_library.data) == len(seq_ref.adc_library.data)
+
+    w_ref = sampled_blocks(seq_ref)
+    np.testing.assert_allclose(sampled_blocks(seq), w_ref, atol=1e-6 * np.max(np.abs(w_ref)))
+
+
+def test_rotated_gradient_table_shares_shapes():
+    # A rotated arbitrary gradient is a scaled copy of the base gradient on every axis
+    seq = pp.Sequence(system)
+    table = pp.RotatedGradientTable(seq, g_arb, angles=np.arange(1, 100) * 0.1, axis='z')
+    assert len(seq.shape_library.data) == 1
+    assert np.all(table.ids[:, :2] > 0)
+    assert np.all(table.ids[:, 2] == 0)
+
+    # Trapezoids with identical timing remain trapezoids
+    seq = pp.Sequence(system)
+    table = pp.RotatedGradientTable(seq, gx, angles=np.arange(100) * 0.1, axis='z')
+    assert len(seq.shape_library.data) == 0
+    assert all(g.type == 'trap' for g in table[3])
+
+
+def test_rotated_gradient_table_matrices():
+    matrices = pp.rotated_gradient_table.rotation_matrices(angles, 'y')
+    seq = pp.Sequence(system)
+    table = pp.RotatedGradientTable(seq, gx, gz, matrices=matrices)
+    table_angles = pp.RotatedGradientTable(seq, gx, gz, angles=angles, axis='y')
+    np.testing.assert_array_equal(table.ids, table_angles.ids)
+
+    # Matrix convention: rotated gradient vector is matrix @ (gx, gy, gz)
+    matrix = np.array([[0, 0, 1], [1, 0, 0], [0, 1, 0]])
+    table = pp.RotatedGradientTable(pp.Sequence(system), gx, matrices=matrix)
+    events = table[0]
+    assert len(events) == 1
+    assert events[0].channel == 'y'
+    assert events[0].amplitude == gx.amplitude
+
+
+def test_rotated_gradient_table_errors():
+    seq = pp.Sequence(system)
+    with pytest.raises(ValueError):
+        pp.RotatedGradientTable(seq, gx)
+    with pytest.raises(ValueError):
+        pp.RotatedGradientTable(seq, gx, angles=angles)
+    with pytest.raises(ValueError):
+        pp.RotatedGradientTable(seq, gx, angles=angles, axis='a')
+
+    # Summing two full-amplitude gradients exceeds the limits for some rotations
+    g1 = pp.make_trapezoid('x', amplitude=0.9 * system.max_grad, duration=2e-3, system=system)
+    g2 = pp.make_trapezoid('y', amplitude=0.9 * system.max_grad, duration=2e-3, system=system)
+    with pytest.raises(ValueError, match='amplitude'):
+        pp.RotatedGradientTable(seq, g1, g2, angles=angles, axis='z', system=system)
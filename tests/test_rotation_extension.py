@@ -0,0 +1,88 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+system = pp.Opts(max_grad=32, grad_unit='mT/m', max_slew=130, slew_unit='T/m/s')
+angles = np.linspace(0, np.pi, 10)
+
+gx = pp.make_trapezoid('x', area=1000, duration=2e-3, system=system)
+gz = pp.make_trapezoid('z', area=-500, duration=2e-3, system=system)
+g_arb = pp.make_arbitrary_grad('x', np.sin(np.linspace(0, np.pi, 100)) * 2e5, first=0, last=0, system=system)
+adc = pp.make_adc(num_samples=50, duration=1e-3, delay=5e-4)
+
+
+def make_sequences(*events, axis='z'):
+    seq_ref = pp.Sequence(system)
+    seq = pp.Sequence(system)
+    for angle in angles:
+        seq_ref.add_block(*pp.rotate(*events, angle=angle, axis=axis, system=system))
+        seq.add_block(*events, pp.make_rotation(axis=axis, angle=angle))
+    return seq, seq_ref
+
+
+def test_make_rotation():
+    matrix = pp.rotated_gradient_table.rotation_matrices([0.3], 'y')[0]
+    rot = pp.make_rotation(axis='y', angle=0.3)
+    np.testing.assert_allclose(rot.rot_matrix, matrix, atol=1e-12)
+    np.testing.assert_allclose(pp.make_rotation(quaternion=rot.rot_quaternion).rot_matrix, matrix, atol=1e-12)
+    np.testing.assert_allclose(pp.make_rotation(rotation_matrix=matrix).rot_quaternion, rot.rot_quaternion)
+
+    with pytest.raises(ValueError):
+        pp.make_rotation()
+    with pytest.raises(ValueError):
+        pp.make_rotation(axis='x')
+    with pytest.raises(ValueError):
+        pp.make_rotation(rotation_matrix=np.diag([1, 1, -1]))
+
+
+@pytest.mark.parametrize('events', [(gx, gz, adc), (g_arb, gz)], ids=['trap', 'arbitrary'])
+def test_rotation_extension_matches_rotate(events):
+    seq, seq_ref = make_sequences(*events)
+
+    # Rotated blocks share the unrotated gradient events
+    assert len(seq.grad_library.data) == 2
+    assert len(seq.rotation_library.data) == len(angles)
+    assert seq.block_durations == seq_ref.block_durations
+
+    w = seq.waveforms()
+    w_ref = seq_ref.waveforms()
+    for i in range(3):
+        t = np.union1d(w[i][0], w_ref[i][0])
+        np.testing.assert_allclose(
+            np.interp(t, w[i][0], w[i][1]), np.interp(t, w_ref[i][0], w_ref[i][1]), atol=1e-6 * gx.amplitude
+        )
+
+    k = seq.calculate_kspace()[1]
+    k_ref = seq_ref.calculate_kspace()[1]
+    np.testing.assert_allclose(k, k_ref, atol=1e-6 * np.max(np.abs(k_ref)))
+
+
+def test_rotation_extension_write_read(tmp_path):
+    seq, seq_ref = make_sequences(gx, gz, adc)
+    seq.write(tmp_path / 'rot.seq')
+
+    seq_read = pp.Sequence(system)
+    seq_read.read(tmp_path / 'rot.seq')
+    for block_id in seq.block_events:
+        rot = seq.get_block(block_id).rotation
+        rot_read = seq_read.get_block(block_id).rotation
+        np.testing.assert_allclose(rot_read.rot_matrix, rot.rot_matrix, atol=1e-8)
+
+    # Version 1.4.1 files contain the rotated gradients instead
+    seq.write(tmp_path / 'v141.seq', v141_compat=True)
+    assert 'ROTATIONS' not in (tmp_path / 'v141.seq').read_text()
+    seq_v141 = pp.Sequence(system)
+    seq_v141.read(tmp_path / 'v141.seq')
+    assert len(seq_v141.rotation_library.data) == 0
+    k = seq_v141.calculate_kspace()[1]
+    k_ref = seq_ref.calculate_kspace()[1]
+    np.testing.assert_allclose(k, k_ref, atol=1e-6 * np.max(np.abs(k_ref)))
+
+
+def test_rotation_extension_errors():
+    seq = pp.Sequence(system)
+    g = pp.make_extended_trapezoid('x', amplitudes=np.array([0, 1e5]), times=np.array([0, 2e-4]))
+    with pytest.raises(RuntimeError, match='rotation'):
+        seq.add_block(g, pp.make_rotation(axis='z', angle=0.1))
+    with pytest.raises(ValueError):
+        seq.add_block(gx, pp.make_rotation(axis='z', angle=0.1), pp.make_rotation(axis='x', angle=0.1))
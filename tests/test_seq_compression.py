@@ -0,0 +1,71 @@
+import gzip
+from pathlib import Path
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.Sequence.compression import _open, seq_file_name
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd'])
+def test_compressed_round_trip(tmp_path, compression):
+    if compression == 'zstd':
+        # Either `compression.zstd` (Python 3.14+) or `zstandard` is needed
+        try:
+            _open(tmp_path / 'probe.seq.zst', 'w', 'zstd').close()
+        except ModuleNotFoundError:
+            pytest.skip('No zstd module available')
+
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_gre_label_softdelay.seq')
+    signature = seq.write(tmp_path / 'plain.seq', check_timing=False)
+    compressed_signature = seq.write(tmp_path / 'compressed', check_timing=False, compression=compression)
+    file_name = seq_file_name(tmp_path / 'compressed', compression)
+
+    # The signature is computed over the uncompressed text
+    assert compressed_signature == signature
+    assert file_name.stat().st_size < (tmp_path / 'plain.seq').stat().st_size / 3
+
+    seq2 = pp.Sequence()
+    seq2.read(file_name)
+    assert seq2.signature_value == signature
+    assert list(seq.block_events) == list(seq2.block_events)
+    for block_id, events in seq.block_events.items():
+        np.testing.assert_array_equal(events, seq2.block_events[block_id])
+    assert seq.rf_library.data == seq2.rf_library.data
+
+    # Compressed files are read sequentially by the parallel reader
+    seq3 = pp.Sequence()
+    seq3.read(file_name, num_processes=2)
+    assert list(seq.block_events) == list(seq3.block_events)
+
+    with pytest.raises(ValueError, match='uncompressed'):
+        pp.Sequence().read(file_name, lazy=True)
+
+
+def test_compressed_text(tmp_path):
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_gre.seq')
+    seq.write(tmp_path / 'plain.seq', check_timing=False)
+    seq.write(tmp_path / 'compressed.seq.gz', check_timing=False, compression='gzip')
+    assert (tmp_path / 'compressed.seq.gz').read_bytes()[:2] == b'\x1f\x8b'
+    with gzip.open(tmp_path / 'compressed.seq.gz', 'rt') as f:
+        assert f.read() == (tmp_path / 'plain.seq').read_text()
+
+
+def test_seq_file_name():
+    assert seq_file_name('a') == Path('a.seq')
+    assert seq_file_name('a.seq') == Path('a.seq')
+    assert seq_file_name('a', 'gzip') == Path('a.seq.gz')
+    assert seq_file_name('a.seq', 'gzip') == Path('a.seq.gz')
+    assert seq_file_name('a.seq.gz', 'gzip') == Path('a.seq.gz')
+    assert seq_file_name('a.seq', 'zstd') == Path('a.seq.zst')
+
+
+def test_unsupported_compression(tmp_path):
+    seq = pp.Sequence()
+    seq.add_block(pp.make_delay(1e-3))
+    with pytest.raises(ValueError, match='Unsupported compression'):
+        seq.write(tmp_path / 'seq', compression='bzip2')
@@ -0,0 +1,53 @@
+import numpy as np
+import pypulseq as pp
+import pytest
+
+
+def add_blocks(seq, num_lines=50):
+    system = seq.system
+    rf, gz, _ = pp.make_sinc_pulse(
+        flip_angle=np.pi / 6, duration=1e-3, slice_thickness=3e-3, return_gz=True, system=system
+    )
+    gx = pp.make_trapezoid(channel='x', flat_area=64 / 0.25, flat_time=3.2e-3, system=system)
+    adc = pp.make_adc(num_samples=64, duration=gx.flat_time, delay=gx.rise_time, system=system)
+    # Gradient that continues across a block boundary, checked against the previous block by add_block()
+    g_up = pp.make_extended_trapezoid(channel='y', times=[0, 1e-4], amplitudes=[0, 1e5], system=system)
+    g_down = pp.make_extended_trapezoid(channel='y', times=[0, 1e-4], amplitudes=[1e5, 0], system=system)
+    for i in range(num_lines):
+        rf.phase_offset = (i % 4) * np.pi / 2
+        seq.add_block(rf, gz)
+        seq.add_block(pp.scale_grad(gx, (-1) ** i), adc, pp.make_label(type='SET', label='LIN', value=i))
+        seq.add_block(g_up)
+        seq.add_block(g_down)
+        seq.add_block(pp.make_delay(1e-3 * (1 + i % 3)))
+    seq.set_definition('FOV', [0.25, 0.25, 3e-3])
+
+
+@pytest.mark.parametrize('remove_duplicates', [False, True])
+def test_sequence_writer(tmp_path, monkeypatch, remove_duplicates):
+    seq = pp.Sequence()
+    seq.add_block(pp.make_delay(1e-3))
+    add_blocks(seq)
+    signature = seq.write(tmp_path / 'expected.seq', remove_duplicates=remove_duplicates)
+
+    monkeypatch.setattr(pp.SequenceWriter, 'chunk_size', 16)
+    seq = pp.Sequence()
+    seq.add_block(pp.make_delay(1e-3))  # Blocks added before opening the writer are also written
+    with pp.SequenceWriter(seq, tmp_path / 'streamed', remove_duplicates=remove_duplicates) as writer:
+        add_blocks(seq)
+        # Only the last block is kept in memory
+        assert len(seq.block_events) == 1
+    assert len(seq.block_events) == 0
+    assert writer.num_blocks == 251
+    assert writer.signature == signature
+    assert seq.signature_value == signature
+    assert (tmp_path / 'streamed.seq').read_text() == (tmp_path / 'expected.seq').read_text()
+
+
+def test_sequence_writer_exception(tmp_path):
+    seq = pp.Sequence()
+    with pytest.raises(ValueError), pp.SequenceWriter(seq, tmp_path / 'failed.seq'):
+        add_blocks(seq, num_lines=2)
+        raise ValueError
+    assert not (tmp_path / 'failed.seq').exists()
+    assert seq.block_writer is None
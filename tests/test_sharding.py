@@ -0,0 +1,112 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.Sequence import calc_pns
+from pypulseq.Sequence.sharding import shard_blocks, split_range
+from pypulseq.Sequence.timeline import iter_blocks
+from pypulseq.utils.safe_pns_prediction import safe_example_hw
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+@pytest.fixture(scope='module')
+def seq():
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_epi.seq')
+    return seq
+
+
+def timing_error_seq():
+    system = pp.Opts(rf_dead_time=100e-6)
+    seq = pp.Sequence(system)
+    for i in range(40):
+        rf = pp.make_block_pulse(flip_angle=0.1, duration=1e-3, delay=100e-6, system=system)
+        if i % 7 == 3:
+            rf.delay = 0
+        seq.add_block(rf)
+        # Soft delays whose default durations are inconsistent within and between the shards
+        seq.add_block(pp.make_soft_delay('TE', default_duration=5e-3 if i % 5 else 6e-3))
+        seq.add_block(pp.make_soft_delay('TR', default_duration=1e-2 if i < 25 else 2e-2))
+    return seq
+
+
+def test_split_range():
+    assert split_range(10, 3) == [(0, 3), (3, 7), (7, 10)]
+    assert split_range(2, 4) == [(0, 1), (1, 2)]
+    assert split_range(0, 4) == []
+
+
+def test_shard_blocks(seq):
+    start_times = {block_counter: block_start for block_counter, block_start, _ in iter_blocks(seq)}
+    shards = shard_blocks(seq, 3)
+
+    assert len(shards) == 3
+    assert [block for blocks, _ in shards for block in blocks] == list(seq.block_events)
+    # Shard start times are bitwise identical to the block start times of a single pass
+    for blocks, start_time in shards:
+        assert start_time == start_times[blocks[0]]
+
+
+@pytest.mark.parametrize('append_RF', [False, True])
+@pytest.mark.parametrize('time_range', [None, [0.01, 0.05]])
+def test_waveforms_sharded(seq, append_RF, time_range):
+    expected = seq.waveforms(append_RF=append_RF, time_range=time_range)
+    waveforms = seq.waveforms(append_RF=append_RF, time_range=time_range, num_processes=3)
+
+    assert len(waveforms) == len(expected)
+    for wave, expected_wave in zip(waveforms, expected):
+        assert wave.dtype == expected_wave.dtype
+        np.testing.assert_array_equal(wave, expected_wave)
+
+
+def test_check_timing_sharded():
+    seq = timing_error_seq()
+    is_ok, error_report = seq.check_timing()
+    assert not is_ok
+    assert {e.error_type for e in error_report} == {'RF_DEAD_TIME', 'SOFT_DELAY_DUR_INCONSISTENCY'}
+
+    for num_processes in [2, 3, 5]:
+        is_ok_sharded, error_report_sharded = seq.check_timing(num_processes=num_processes)
+        assert is_ok_sharded == is_ok
+        assert [vars(e) for e in error_report_sharded] == [vars(e) for e in error_report]
+
+
+@pytest.mark.parametrize('time_range', [None, [0.005, 0.04]])
+def test_calculate_pns_sharded(seq, time_range):
+    hw = safe_example_hw()
+    expected = seq.calculate_pns(hw, time_range=time_range, do_plots=False)
+    result = seq.calculate_pns(hw, time_range=time_range, do_plots=False, num_processes=2)
+
+    assert result[0] == expected[0]
+    for value, expected_value in zip(result[1:], expected[1:]):
+        np.testing.assert_array_equal(value, expected_value)
+
+
+def test_calculate_pns_multiple_shards():
+    # The TSE is longer than twice the filter preroll of the example hardware, so it is split into several shards
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_tse.seq')
+    hw = safe_example_hw()
+    expected = seq.calculate_pns(hw, do_plots=False)
+    with patch.object(calc_pns, 'map_shards', wraps=calc_pns.map_shards) as map_shards:
+        result = seq.calculate_pns(hw, do_plots=False, num_processes=3)
+    assert len(map_shards.call_args.args[2]) == 3
+
+    assert result[0] == expected[0]
+    for value, expected_value in zip(result[1:], expected[1:]):
+        np.testing.assert_array_equal(value, expected_value)
+
+
+@pytest.mark.parametrize('combine_mode', ['max', 'mean', 'rss', 'none'])
+def test_calculate_gradient_spectrum_sharded(seq, combine_mode):
+    kwargs = {'window_width': 0.01, 'combine_mode': combine_mode, 'use_derivative': True, 'plot': False}
+    expected = seq.calculate_gradient_spectrum(**kwargs)
+    result = seq.calculate_gradient_spectrum(**kwargs, num_processes=3)
+
+    for spectrum, expected_spectrum in zip(result[0], expected[0]):
+        np.testing.assert_array_equal(spectrum, expected_spectrum)
+    for value, expected_value in zip(result[1:], expected[1:]):
+        np.testing.assert_array_equal(value, expected_value)
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pypulseq as pp
+import pytest
+
+expected_output_path = Path(__file__).parent / 'expected_output'
+
+
+@pytest.mark.parametrize('seq_name', ['write_gre_label_softdelay', 'write_epi_se_rs', 'seq_make_gauss_pulses'])
+@pytest.mark.parametrize('remove_duplicates', [False, True])
+def test_signature_matches_write(tmp_path, seq_name, remove_duplicates):
+    seq = pp.Sequence()
+    seq.read(expected_output_path / (seq_name + '.seq'))
+
+    signature = seq.signature(remove_duplicates=remove_duplicates)
+    assert not list(tmp_path.iterdir())
+    assert signature == seq.write(tmp_path / 'seq', remove_duplicates=remove_duplicates, check_timing=False)
+
+
+def test_structural_hash(tmp_path):
+    seq = pp.Sequence()
+    seq.read(expected_output_path / 'write_gre.seq')
+    structural_hash = seq.signature(mode='structural')
+    assert structural_hash != seq.signature()
+
+    # Restoring the same sequence gives the same hash
+    seq.write_binary(tmp_path / 'seq')
+    seq2 = pp.Sequence()
+    seq2.read_binary(tmp_path / 'seq.seqb')
+    assert seq2.signature(mode='structural') == structural_hash
+
+    # Any change, also below the precision of the text format, changes the hash
+    seq2.rf_library.update(1, None, (seq2.rf_library.data[1][0] * (1 + 1e-12), *seq2.rf_library.data[1][1:]))
+    assert seq2.signature(mode='structural') != structural_hash
+    assert seq2.signature() == seq.signature()
+
+    seq.add_block(pp.make_delay(1e-3))
+    assert seq.signature(mode='structural') != structural_hash
+
+    with pytest.raises(ValueError, match='Unsupported signature mode'):
+        seq.signature(mode='sha1')
+
+
+def test_structural_hash_empty_sequence():
+    assert pp.Sequence().signature(mode='structural') == pp.Sequence().signature(mode='structural')
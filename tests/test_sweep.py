@@ -0,0 +1,119 @@
+import csv
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.utils import sweep
+
+
+def build_fid(flip_angle: float, tr: float, rf_delay: float = 100e-6) -> pp.Sequence:
+    if tr <= 0:
+        raise ValueError('TR must be positive')
+    system = pp.Opts(rf_dead_time=100e-6)
+    seq = pp.Sequence(system)
+    rf = pp.make_block_pulse(flip_angle=np.deg2rad(flip_angle), duration=1e-3, delay=100e-6, system=system)
+    rf.delay = rf_delay
+    adc = pp.make_adc(num_samples=64, duration=3.2e-3, delay=system.adc_dead_time, system=system)
+    seq.add_block(rf)
+    seq.add_block(adc)
+    seq.add_block(pp.make_delay(tr))
+    return seq
+
+
+def test_sweep_grid(tmp_path):
+    summary = pp.run_sweep(
+        build_fid, {'flip_angle': [5, 10], 'tr': [10e-3, 20e-3]}, tmp_path, file_name='fid_{flip_angle}_{tr}'
+    )
+
+    assert [row.params for row in summary] == [
+        {'flip_angle': 5, 'tr': 10e-3},
+        {'flip_angle': 5, 'tr': 20e-3},
+        {'flip_angle': 10, 'tr': 10e-3},
+        {'flip_angle': 10, 'tr': 20e-3},
+    ]
+    assert all(row.status == 'written' for row in summary)
+    assert all(row.timing_ok for row in summary)
+    assert summary[0].file_name == tmp_path / 'fid_5_0.01.seq'
+
+    # The written files are identical to those written directly
+    seq = build_fid(flip_angle=10, tr=20e-3)
+    seq.write(tmp_path / 'expected.seq')
+    assert (tmp_path / 'expected.seq').read_text() == summary[3].file_name.read_text()
+    assert summary[3].signature == seq.signature_value
+    assert summary[3].duration == pytest.approx(seq.duration()[0])
+
+
+def test_sweep_process_pool(tmp_path):
+    points = [{'flip_angle': flip_angle, 'tr': 10e-3} for flip_angle in range(1, 6)]
+    summary = pp.run_sweep(build_fid, points, tmp_path, num_processes=2, chunk_size=2)
+    expected = pp.run_sweep(build_fid, points, tmp_path / 'serial', num_processes=1)
+
+    assert [row.params for row in summary] == points
+    assert all(row.status == 'written' for row in summary)
+    assert [row.signature for row in summary] == [row.signature for row in expected]
+    assert len({row.signature for row in summary}) == len(points)
+
+
+def test_sweep_failures(tmp_path):
+    summary = pp.run_sweep(
+        build_fid,
+        [{'flip_angle': 10, 'tr': -1}, {'flip_angle': 10, 'tr': 10e-3, 'rf_delay': 0}],
+        tmp_path,
+        num_processes=1,
+    )
+
+    # A failing builder does not stop the sweep
+    assert summary[0].status == 'failed'
+    assert 'TR must be positive' in summary[0].error
+    assert not summary[0].file_name.exists()
+
+    # Sequences with timing errors are written and reported
+    assert summary[1].status == 'written'
+    assert summary[1].timing_ok is False
+    assert summary[1].timing_errors
+
+    with open(tmp_path / sweep.SWEEP_SUMMARY_FILE) as f:
+        rows = list(csv.DictReader(f))
+    assert [row['status'] for row in rows] == ['failed', 'written']
+    assert rows[0]['error'] == 'ValueError: TR must be positive'
+
+
+def test_sweep_cache(tmp_path, monkeypatch):
+    grid = {'flip_angle': [5, 10], 'tr': [10e-3]}
+    first = pp.run_sweep(build_fid, grid, tmp_path, num_processes=1)
+
+    # Unchanged points are not built again
+    def fail(task):
+        raise AssertionError('Point was built again')
+
+    monkeypatch.setattr(sweep, '_run_point', fail)
+    second = pp.run_sweep(build_fid, grid, tmp_path, num_processes=1)
+    assert [row.status for row in second] == ['cached', 'cached']
+    assert [row.signature for row in second] == [row.signature for row in first]
+    monkeypatch.undo()
+
+    # Modified or removed files and new points are rebuilt
+    first[0].file_name.write_text('modified')
+    first[1].file_name.unlink()
+    third = pp.run_sweep(build_fid, {'flip_angle': [5, 10, 15], 'tr': [10e-3]}, tmp_path, num_processes=1)
+    assert [row.status for row in third] == ['written', 'written', 'written']
+    assert [row.signature for row in third[:2]] == [row.signature for row in first]
+
+    fourth = pp.run_sweep(build_fid, grid, tmp_path, num_processes=1, use_cache=False)
+    assert [row.status for row in fourth] == ['written', 'written']
+
+
+def test_sweep_compressed(tmp_path):
+    summary = pp.run_sweep(
+        build_fid, {'flip_angle': [10], 'tr': [10e-3]}, tmp_path, num_processes=1, write_kwargs={'compression': 'gzip'}
+    )
+    assert summary[0].file_name.name.endswith('.seq.gz')
+
+    second = pp.run_sweep(
+        build_fid, {'flip_angle': [10], 'tr': [10e-3]}, tmp_path, num_processes=1, write_kwargs={'compression': 'gzip'}
+    )
+    assert second[0].status == 'cached'
+
+    # The signature is the one returned by `Sequence.write()`, computed over the uncompressed text
+    signature = build_fid(flip_angle=10, tr=10e-3).write(tmp_path / 'plain.seq')
+    assert summary[0].signature == second[0].signature == signature
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import numpy as np
+import pypulseq as pp
+import pytest
+from pypulseq.Sequence.ext_test_report import _scan_timeline
+
+
+@pytest.mark.parametrize('example', ['write_gre', 'write_epi_se', 'write_tse'])
+def test_scan_timeline(load_example, example):
+    seq = load_example(example)
+    timeline = _scan_timeline(seq)
+
+    # K-space trajectory matches calculate_kspace()
+    k_traj_adc, _, t_excitation, _, t_adc = seq.calculate_kspace()
+    np.testing.assert_allclose(timeline.t_adc, t_adc, atol=1e-12)
+    np.testing.assert_allclose(timeline.t_excitation, t_excitation, atol=1e-12)
+    np.testing.assert_allclose(timeline.k_traj_adc, k_traj_adc, atol=1e-6)
+
+    # Maximum gradient amplitude per channel matches the waveforms
+    wave_data = seq.waveforms()
+    for j in range(3):
+        ga = np.max(np.abs(wave_data[j][1])) if wave_data[j].shape[1] > 0 else 0
+        assert timeline.ga[j] == pytest.approx(ga)
+
+    # Results do not depend on the chunk size
+    chunked = _scan_timeline(seq, chunk_size=7)
+    np.testing.assert_allclose(chunked.k_traj_adc, timeline.k_traj_adc, atol=1e-9)
+    np.testing.assert_allclose(chunked.ga, timeline.ga)
+    np.testing.assert_allclose(chunked.gs, timeline.gs, rtol=1e-9)
+    assert chunked.ga_abs == pytest.approx(timeline.ga_abs)
+    assert chunked.gs_abs == pytest.approx(timeline.gs_abs, rel=1e-9)
+
+
+def test_test_report_echo_time():
+    # Samples of many EPI repetitions are at the k-space center within numerical noise, the first one is the echo
+    seq = pp.Sequence()
+    seq.read(Path(__file__).parent / 'expected_output' / 'write_epi_label.seq')
+    assert 'TE: 0.002730 s' in seq.test_report().splitlines()
+
+
+def test_test_report_unique_k_positions():
+    # Keys of neighbouring positions are merged in order of appearance, as in the reference implementation
+    seq = pp.Sequence()
+    seq.read(Path(__file__).parent / 'expected_output' / 'write_radial_gre.seq')
+    assert 'Unique k-space positions (aka cols, rows, etc.): 3579 1894 1 ' in seq.test_report().splitlines()